@@ -1,24 +1,34 @@
 """
 This is the main application file for the Flask portfolio application.
 
-It initializes the Flask application, configures the database and other extensions,
-registers the blueprints for different routes, and starts the development server.
-
-This module serves as the entry point for the application, orchestrating the
-initialization of various components and starting the Flask development server.
+It provides the application factory, `create_app()`, which loads the
+environment, configures the database and other extensions, and registers the
+request hooks, error handlers, blueprints and CLI commands.
+
+Nothing is built at import time. Gunicorn calls the factory in each worker
+(`gunicorn "app:create_app()"`, see the Procfile), the `flask` CLI discovers it
+automatically, and running this file directly starts the development server.
+The database schema is created or upgraded explicitly, with `flask init-db`.
 """
 
-from dotenv import load_dotenv
+import time  # Used to measure how long the application takes to start
 
-# Load environment variables from .env file
-load_dotenv()
+_IMPORT_STARTED = time.perf_counter()  # Start of this module's (and its imports') loading
 
 import os  # Import the os module for interacting with the operating system
+from dotenv import load_dotenv  # Loads environment variables from the .env file
 from flask import Flask, request, render_template  # Import necessary Flask modules
 from config import get_config  # Import the function to retrieve the configuration
+from backend.commands import (
+    build_assets_command,
+    build_images_command,
+    init_db_command,
+    reindex_search_command,
+)  # Import the CLI commands that set up the database schema, build the static assets and images, and rebuild the search index
 from backend.extensions import (
     init_extensions,
-)  # Import the function to initialize Flask extensions
+    log_database_pool,
+)  # Import the functions to initialize Flask extensions and report the database pool
 from backend.models import (
     db,
 )  # Import the db instance from models/__init__.py for database access.
@@ -37,79 +47,141 @@ from backend.routes.projects import (
 from backend.routes.contact.contact import (
     contact_bp,
 )  # Import blueprints for different routes: contact_bp for the contact route
-from logger import logger
+from backend.metrics import (
+    APP_STARTUP,
+    NOT_FOUND,
+)  # Import the startup time gauge and the counter of 404 responses
+from logger import logger, request_logger, configure_logging
+
+_IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
 
 
-def create_app(config_name: str = "default") -> Flask:
+def create_app(config_name: str = None) -> Flask:
     """
     Creates and configures the Flask application instance.
 
-    This function initializes the Flask application, loads the configuration
-    settings based on the environment, initializes Flask extensions,
-    creates database tables, and registers blueprints for different routes.
+    This function loads the .env file, initializes the Flask application, loads
+    the configuration settings based on the environment, initializes Flask
+    extensions and registers the request hooks, blueprints and CLI commands.
+    It does not touch the database schema; run `flask init-db` for that.
 
     Args:
-        config_name (str): The name of the configuration to use (default: 'default').
+        config_name (str): The name of the configuration to use. Defaults to the
+            FLASK_ENV environment variable, or 'default' when it is not set.
 
     Returns:
         Flask: The configured Flask application instance.
     """
+    started = time.perf_counter()
+
+    # Load environment variables from .env file
+    load_dotenv()
+    # Done here rather than at import time, so importing this module has no side effects.
+    configure_logging()
+    # Starts the background logging pipeline, now that the LOG_* variables are available.
+
     app = Flask(
         __name__, static_folder="static"
     )  # Initialize Flask app and serve static files from the 'static' folder.
     # Creates a new Flask application instance, specifying the static folder for serving static files (CSS, JavaScript, images).
 
     # Load the configuration
-    app.config.from_object(get_config(config_name))
+    app.config.from_object(get_config(config_name or os.getenv("FLASK_ENV") or "default"))
     # Loads the configuration settings from the appropriate configuration class based on the provided `config_name`.
+    # The settings are read from the environment at this point (see `config.EnvVar`).
 
     # Initialize extensions
     init_extensions(app)  # Initialize Flask extensions such as Mail and SQLAlchemy.
     # Initializes Flask extensions, such as Flask-Mail and SQLAlchemy, and attaches them to the application.
     db.init_app(app)
     # Initializes the database connection with the Flask application.
-
-    # Initialize database
-    with app.app_context():  # Need an application context to create the database.
-        # Creates an application context, which is required for performing database operations outside of a request context.
-        db.create_all()  # Create database tables if they don't exist.
-        # Creates the database tables based on the defined models, if they don't already exist.
+    with app.app_context():
+        for engine in db.engines.values():
+            log_database_pool(engine)
+        # Reports the effective pool settings of the primary and any replicas, so a misconfigured pool is visible at startup.
+
+    # ***** LOGGING CONFIGURATION *****
+    # Flask's internal logger propagates to the root logger, whose queue handler
+    # (see logger.py) hands every record to the background logging thread.
+    app.logger.setLevel(
+        logger.getEffectiveLevel()
+    )  # Use the logger's existing level instead of re-importing logging.INFO
+
+    # ***** "HELPER" DECORATORS *****
+    app.before_request(log_request)  # Log every request before it is processed
+    app.register_error_handler(404, page_not_found)  # Render the custom 404 page
+
+    # ***** ESTABLISHING ALL ROUTES *****
+    register_blueprints(app)
+
+    # ***** CLI COMMANDS *****
+    app.cli.add_command(init_db_command)  # flask init-db
+    app.cli.add_command(build_assets_command)  # flask build-assets
+    app.cli.add_command(build_images_command)  # flask build-images
+    app.cli.add_command(reindex_search_command)  # flask reindex-search
+
+    startup_seconds = time.perf_counter() - started
+    APP_STARTUP.set(_IMPORT_SECONDS + startup_seconds)
+    logger.info(
+        "Flask application created in %.1f ms (imports took %.1f ms) in process %d",
+        startup_seconds * 1000,
+        _IMPORT_SECONDS * 1000,
+        os.getpid(),
+        extra={
+            "startup_ms": round(startup_seconds * 1000, 1),
+            "import_ms": round(_IMPORT_SECONDS * 1000, 1),
+        },
+    )
 
     return app
     # Returns the configured Flask application instance.
 
 
-app = create_app(os.getenv("FLASK_ENV") or "default")
-# Creates the Flask application instance, using the environment variable
-# FLASK_ENV to determine the configuration to use (defaults to "default").
+def register_blueprints(app: Flask):
+    """
+    Register blueprints for different parts of the application.
+
+    Args:
+        app: The Flask application instance.
+    """
+    # home routes inception (/index + API routes)
+    app.register_blueprint(home_bp)  # Register the home blueprint
+    # Register the home blueprint with the application.
 
-# **************************************************************
+    # about routes inception (/about + API routes)
+    app.register_blueprint(about_bp)  # Register the about blueprint
+    # Register the about blueprint with the application.
 
-# ***** LOGGING CONFIGURATION *****
-"""
-Configure logging. Replace print statements for better control over log levels and formatting.
-"""
-# Attach logger to Flask's internal logging system
-app.logger.handlers = logger.handlers
-app.logger.setLevel(
-    logger.level
-)  # Use the logger's existing level instead of re-importing logging.INFO
+    # career routes inception (API routes + /career)
+    app.register_blueprint(career_bp)  # Register the career blueprint
+    # Register the career blueprint with the application.
+
+    # projects routes inception (API routes + /projects & /projects/<int:page_number>)
+    app.register_blueprint(projects_bp)  # Register the projects blueprint
+    # Register the projects blueprint with the application.
+
+    # contact routes inception (/contact + API routes)
+    app.register_blueprint(contact_bp)  # Register the contact blueprint
+    # Register the contact blueprint with the application.
 
-logger.info("Flask application server started successfully!")
 
 # **************************************************************
 
 
 # ***** "HELPER" DECORATORS *****
-@app.before_request
 def log_request():
     """
     Logs each request before it is processed.
     """
-    logger.info(f"Request: {request.method} {request.url}")
+    # Lazy %-style arguments: nothing is formatted if the record is sampled out.
+    request_logger.info(
+        "Request: %s %s",
+        request.method,
+        request.url,
+        extra={"method": request.method, "path": request.path},
+    )
 
 
-@app.errorhandler(404)
 def page_not_found(
     error,
 ):  # Changed 'e' to 'error' for clarity, as it represents the exception
@@ -132,6 +204,8 @@ def page_not_found(
             - The HTTP status code 404, indicating that the page was not found.  This
               status code is crucial for SEO and proper client-side handling of the error.
     """
+    NOT_FOUND.inc()  # Count the miss so broken links and scanners show up in /metrics.
+
     # Render the '404.html' template using Flask's render_template function.
     # This function locates the template file within the 'templates' directory
     # (or a configured template directory) and generates the HTML output.
@@ -141,34 +215,9 @@ def page_not_found(
 
 # **************************************************************
 
-# ***** ESTABLISHING ALL ROUTES *****
-"""
-Register blueprints for different parts of the application.
-"""
-# home routes inception (/index + API routes)
-app.register_blueprint(home_bp)  # Register the home blueprint
-# Register the home blueprint with the application.
-
-# about routes inception (/about + API routes)
-app.register_blueprint(about_bp)  # Register the about blueprint
-# Register the about blueprint with the application.
-
-# career routes inception (API routes + /career)
-app.register_blueprint(career_bp)  # Register the career blueprint
-# Register the career blueprint with the application.
-
-# projects routes inception (API routes + /projects & /projects/<int:page_number>)
-app.register_blueprint(projects_bp)  # Register the projects blueprint
-# Register the projects blueprint with the application.
-
-# contact routes inception (/contact + API routes)
-app.register_blueprint(contact_bp)  # Register the contact blueprint
-# Register the contact blueprint with the application.
-
-# ***********************************
-
 # ***** APP EXECUTION *****
 if __name__ == "__main__":
+    app = create_app()
     app.run(debug=app.config["DEBUG"])
 
 
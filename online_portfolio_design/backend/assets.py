@@ -0,0 +1,222 @@
+"""
+This module builds and serves fingerprinted, precompressed static assets.
+
+`flask build-assets` minifies every stylesheet and script under `static/`, and
+writes each one to `static/dist/` under a name that contains a hash of its
+content (css/index.css -> dist/css/index.3f9c0a1b2d4e.css), next to a Brotli
+(`.br`) and a zopfli-gzip (`.gz`) copy. A `manifest.json` maps every source
+file to its built name.
+
+At runtime, `url_for('static', filename='css/index.css')` is rewritten to the
+built file when it is in the manifest, and built files are served with the
+best encoding the client accepts and `Cache-Control: immutable`: since a
+changed file gets a new name, a browser never needs to ask for the same URL
+twice. Without a manifest (e.g. in development before a build), URLs and
+responses are left exactly as they were.
+"""
+
+import hashlib
+import json
+import mimetypes
+import os
+from typing import Dict, Optional
+
+import brotli  # Brotli compression (pinned in requirements.txt)
+import zopfli.gzip  # Slow but tight, gzip-compatible compression
+from flask import Flask, request, send_from_directory
+
+from logger import logger
+
+# Source files that are minified and fingerprinted.
+ASSET_EXTENSIONS = (".css", ".js")
+
+# Precompressed variants, in order of preference: (Content-Encoding, file suffix).
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+# Built files never change, so they may be cached for a year.
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+MANIFEST_NAME = "manifest.json"
+
+
+def minify(source: str, extension: str) -> str:
+    """
+    Minifies a stylesheet or script. /*! ... */ licence comments are kept.
+
+    Args:
+        source (str): The file's content.
+        extension (str): ".css" or ".js".
+
+    Returns:
+        str: The minified content.
+    """
+    # Only needed by the build, so the runtime does not depend on the minifiers.
+    import rcssmin
+    import rjsmin
+
+    if extension == ".css":
+        return rcssmin.cssmin(source, keep_bang_comments=True)
+    return rjsmin.jsmin(source, keep_bang_comments=True)
+
+
+def fingerprint(path: str, content: bytes) -> str:
+    """Inserts a hash of `content` before the extension of `path`."""
+    stem, extension = os.path.splitext(path)
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    return f"{stem}.{digest}{extension}"
+
+
+def compress(content: bytes) -> Dict[str, bytes]:
+    """Returns the Brotli and gzip encodings of `content`, keyed by file suffix."""
+    return {
+        ".br": brotli.compress(content, mode=brotli.MODE_TEXT, quality=11),
+        ".gz": zopfli.gzip.compress(content),
+    }
+
+
+class AssetPipeline:
+    """Builds the fingerprinted assets and serves them with far-future caching."""
+
+    def __init__(self):
+        self.enabled = True
+        self.static_folder: Optional[str] = None
+        self.output_dir = "dist"
+        self.manifest: Dict[str, str] = {}  # source path -> built path (both relative)
+        self._encodings: Dict[str, tuple] = {}  # built path -> precompressed suffixes
+        self.version = ""  # Changes whenever the manifest does
+
+    def init_app(self, app: Flask):
+        """
+        Loads the asset manifest and hooks the pipeline into `url_for` and the
+        static file view.
+
+        Args:
+            app: The Flask application instance.
+        """
+        self.enabled = app.config.get("ASSETS_ENABLED", True)
+        self.static_folder = app.static_folder
+        self.output_dir = app.config.get("ASSETS_OUTPUT_DIR", "dist")
+        app.extensions["assets"] = self
+        if not self.enabled or self.static_folder is None:
+            return
+
+        self.load_manifest()
+        app.url_defaults(self._rewrite_static_url)
+        # Keep Flask's own view for everything that is not a built asset.
+        app.view_functions["static"] = self._static_view(app.view_functions["static"])
+
+    @property
+    def output_path(self) -> str:
+        return os.path.join(self.static_folder, self.output_dir)
+
+    def load_manifest(self):
+        """Reads the manifest written by the last build (if any)."""
+        manifest_path = os.path.join(self.output_path, MANIFEST_NAME)
+        try:
+            with open(manifest_path, "rb") as manifest_file:
+                raw = manifest_file.read()
+        except FileNotFoundError:
+            self._set_manifest({}, b"")
+            return
+        self._set_manifest(json.loads(raw), raw)
+        logger.info(f"Loaded {len(self.manifest)} fingerprinted assets from {manifest_path}")
+
+    def _set_manifest(self, manifest: Dict[str, str], raw: bytes):
+        self._encodings = {
+            built: tuple(
+                suffix
+                for _, suffix in ENCODINGS
+                if os.path.exists(os.path.join(self.output_path, built + suffix))
+            )
+            for built in manifest.values()
+        }
+        self.manifest = manifest
+        self.version = hashlib.sha1(raw).hexdigest()[:12] if raw else ""
+
+    def build(self) -> Dict[str, str]:
+        """
+        Minifies, fingerprints and precompresses every CSS and JS file under the
+        static folder, then writes the manifest.
+
+        Files from earlier builds are left in place, so pages rendered before a
+        deploy can still load the assets they reference.
+
+        Returns:
+            dict: The new manifest.
+        """
+        manifest = {}
+        for directory, subdirectories, files in os.walk(self.static_folder):
+            if os.path.abspath(directory) == os.path.abspath(self.static_folder):
+                # Never feed the build its own output.
+                subdirectories[:] = [d for d in subdirectories if d != self.output_dir]
+            for name in sorted(files):
+                extension = os.path.splitext(name)[1]
+                if extension not in ASSET_EXTENSIONS:
+                    continue
+                source_path = os.path.join(directory, name)
+                relative = os.path.relpath(source_path, self.static_folder).replace(
+                    os.sep, "/"
+                )
+                with open(source_path, encoding="utf-8") as source_file:
+                    content = minify(source_file.read(), extension).encode("utf-8")
+                built = fingerprint(relative, content)
+                self._write(built, content)
+                for suffix, encoded in compress(content).items():
+                    if len(encoded) < len(content):  # Tiny files may not shrink
+                        self._write(built + suffix, encoded)
+                manifest[relative] = built
+
+        raw = json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8")
+        self._write(MANIFEST_NAME, raw)
+        self._set_manifest(manifest, raw)
+        return manifest
+
+    def _write(self, relative: str, content: bytes):
+        path = os.path.join(self.output_path, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as output_file:
+            output_file.write(content)
+
+    def _rewrite_static_url(self, endpoint: str, values: dict):
+        """`url_defaults` callback: points static URLs at the built file."""
+        if endpoint != "static":
+            return
+        built = self.manifest.get(values.get("filename"))
+        if built is not None:
+            values["filename"] = f"{self.output_dir}/{built}"
+
+    def _static_view(self, default_view):
+        prefix = self.output_dir + "/"
+
+        def static(filename: str):
+            built = filename[len(prefix) :] if filename.startswith(prefix) else None
+            if built not in self._encodings:
+                return default_view(filename=filename)
+
+            suffix, encoding = "", None
+            for candidate, candidate_suffix in ENCODINGS:
+                if (
+                    candidate_suffix in self._encodings[built]
+                    and request.accept_encodings[candidate]
+                ):
+                    suffix, encoding = candidate_suffix, candidate
+                    break
+
+            response = send_from_directory(
+                self.output_path,
+                built + suffix,
+                mimetype=mimetypes.guess_type(built)[0],
+                max_age=IMMUTABLE_MAX_AGE,
+            )
+            if encoding is not None:
+                response.content_encoding = encoding
+            response.vary.add("Accept-Encoding")
+            response.cache_control.public = True
+            response.cache_control.immutable = True
+            return response
+
+        return static
+
+
+# Shared asset pipeline instance, bound to the app in `init_extensions`.
+assets = AssetPipeline()
@@ -0,0 +1,203 @@
+"""
+This module provides an in-process, read-through cache for rendered pages.
+
+Pages such as /about, /career and /projects only change when one of the write
+APIs commits, so their final HTML is kept in memory and served again without
+querying the database or rendering Jinja templates. Each cached page is tagged
+with the tables it was built from and is dropped as soon as a commit touches
+one of those tables (see `backend.models.events`).
+
+The cache lives inside each worker process. Writes handled by one gunicorn
+worker cannot reach the memory of another, so every entry also records the
+shared `content_version` of its tables when it was rendered, and is treated as
+a miss once those versions move on. The body served therefore always matches
+the ETag `conditional_get` derives from the same versions. Entries also expire
+after `PAGE_CACHE_TIMEOUT` seconds.
+"""
+
+import threading
+from collections import namedtuple
+from functools import wraps
+from typing import Iterable
+
+from cachetools import TTLCache  # Time-aware LRU cache used as the backing store
+from flask import Flask, current_app, make_response, request
+
+from backend.conditional import content_versions  # Shared, per-table content versions
+from backend.metrics import PAGE_CACHE_LOOKUPS
+from backend.models.events import content_changed
+
+# A rendered page: the response body plus enough metadata to rebuild it.
+# `variants` collects the body's compressed encodings (see `backend.compression`),
+# and `versions` the content versions of `tables` the page was rendered from.
+CachedPage = namedtuple(
+    "CachedPage", ["body", "status", "mimetype", "tables", "variants", "versions"]
+)
+
+
+class PageCache:
+    """
+    Stores rendered page bodies keyed by endpoint and view arguments.
+
+    Besides the cached pages themselves, the cache keeps a per-table generation
+    counter that is bumped on every invalidation. A page rendered while one of
+    its tables changed underneath it is therefore never stored.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 300):
+        self._lock = threading.Lock()
+        self._store = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generations = {}  # table name -> number of invalidations seen
+        self.hits = 0
+        self.misses = 0
+        self.enabled = True
+
+    def init_app(self, app: Flask):
+        """
+        Configures the cache from the application settings and subscribes it
+        to commit notifications.
+
+        Args:
+            app: The Flask application instance.
+        """
+        self.enabled = app.config.get("PAGE_CACHE_ENABLED", True)
+        with self._lock:
+            self._store = TTLCache(
+                maxsize=app.config.get("PAGE_CACHE_MAX_ENTRIES", 256),
+                ttl=app.config.get("PAGE_CACHE_TIMEOUT", 300),
+            )
+        content_changed.connect(self._on_content_changed, weak=False)
+        app.extensions["page_cache"] = self
+
+    @staticmethod
+    def make_key(endpoint: str, view_args: dict) -> tuple:
+        """Builds a hashable cache key from an endpoint and its view arguments."""
+        return (endpoint, tuple(sorted((view_args or {}).items())))
+
+    def generation(self, tables: Iterable[str]) -> tuple:
+        """Returns a snapshot of the generation counters for `tables`."""
+        with self._lock:
+            return tuple(self._generations.get(table, 0) for table in tables)
+
+    def get(self, key: tuple, versions: tuple = None):
+        """
+        Returns the cached page for `key` (or None) and updates the counters.
+
+        Args:
+            key: The cache key (see `make_key`).
+            versions: The current content versions of the page's tables. An
+                entry rendered from other versions (e.g. written by another
+                worker process) is dropped and reported as a miss.
+        """
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is not None and versions is not None and entry.versions != versions:
+                self._store.pop(key, None)
+                entry = None
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        PAGE_CACHE_LOOKUPS.labels("miss" if entry is None else "hit").inc()
+        return entry
+
+    def set(self, key: tuple, entry: CachedPage, generation: tuple):
+        """
+        Stores `entry` unless one of its tables changed since `generation`
+        was taken, in which case the freshly rendered page is already stale.
+        """
+        with self._lock:
+            current = tuple(self._generations.get(table, 0) for table in entry.tables)
+            if current == generation:
+                self._store[key] = entry
+
+    def invalidate(self, *tables: str):
+        """Drops every cached page that was built from any of `tables`."""
+        with self._lock:
+            for table in tables:
+                self._generations[table] = self._generations.get(table, 0) + 1
+            stale = [
+                key
+                for key, entry in self._store.items()
+                if not entry.tables.isdisjoint(tables)
+            ]
+            for key in stale:
+                self._store.pop(key, None)
+
+    def clear(self):
+        """Empties the cache and resets the hit and miss counters."""
+        with self._lock:
+            self._store.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Returns the hit and miss counters along with the current hit rate."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._store),
+            }
+
+    def _on_content_changed(self, sender, tables: frozenset):
+        self.invalidate(*tables)
+
+
+# Shared page cache instance, bound to the app in `init_extensions`.
+page_cache = PageCache()
+
+
+def cached_page(*tables: str):
+    """
+    Decorator that serves a GET view from the page cache.
+
+    Args:
+        *tables: The names of the tables the page is rendered from. A commit
+            touching any of them evicts the cached page.
+
+    The `X-Cache` response header reports whether the body was a HIT or a MISS.
+    Only successful (200) responses are stored.
+    """
+    tables = frozenset(tables)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != "GET" or not page_cache.enabled:
+                return view(*args, **kwargs)
+
+            key = page_cache.make_key(request.endpoint, request.view_args)
+            # Taken before rendering: a write committed meanwhile makes the entry stale.
+            current = content_versions.get(sorted(tables))
+            versions = tuple(current[table][0] for table in sorted(tables))
+            entry = page_cache.get(key, versions)
+            if entry is not None:
+                response = current_app.response_class(
+                    entry.body, status=entry.status, mimetype=entry.mimetype
+                )
+                response.compressed_variants = entry.variants  # Compressed once, reused
+                response.headers["X-Cache"] = "HIT"
+                return response
+
+            generation = page_cache.generation(tables)
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200 and not response.is_streamed:
+                entry = CachedPage(
+                    response.get_data(),
+                    response.status_code,
+                    response.mimetype,
+                    tables,
+                    {},
+                    versions,
+                )
+                page_cache.set(key, entry, generation)
+                response.compressed_variants = entry.variants
+            response.headers["X-Cache"] = "MISS"
+            return response
+
+        return wrapper
+
+    return decorator
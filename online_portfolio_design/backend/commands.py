@@ -0,0 +1,62 @@
+"""
+This module defines the application's `flask` CLI commands.
+
+Commands are registered in `create_app()` and run with the application context
+set up, e.g.
+
+    flask --app app init-db
+    flask --app app build-assets
+    flask --app app build-images
+    flask --app app reindex-search
+"""
+
+import click  # Flask's CLI is built on click
+from flask.cli import with_appcontext
+
+from backend.assets import assets  # Import the static asset pipeline
+from backend.images import images  # Import the responsive image derivatives
+from backend.models import db  # Import the shared db instance
+from backend.search import search_index  # Import the full-text search index
+from backend.models.migrations import (
+    upgrade_schema,
+)  # Import the function that adds missing columns to existing tables
+from logger import logger
+
+
+@click.command("init-db")
+@with_appcontext
+def init_db_command():
+    """Create missing tables and bring existing ones up to date."""
+    db.create_all()  # Create database tables if they don't exist.
+    upgrade_schema()  # Add missing columns and seed content versions.
+    # Brings tables created by older releases up to date, since create_all() never alters them.
+    logger.info("Database schema is up to date")
+    click.echo("Database schema is up to date.")
+
+
+@click.command("build-assets")
+@with_appcontext
+def build_assets_command():
+    """Minify, fingerprint and precompress the CSS and JS under static/."""
+    manifest = assets.build()
+    logger.info(f"Built {len(manifest)} static assets into {assets.output_path}")
+    click.echo(f"Built {len(manifest)} static assets into {assets.output_path}.")
+
+
+@click.command("build-images")
+@with_appcontext
+def build_images_command():
+    """Create the resized WebP/AVIF copies of every image under static/images."""
+    count = images.build()
+    logger.info(f"{count} image derivatives are ready in {images.cache_dir}")
+    click.echo(f"{count} image derivatives are ready in {images.cache_dir}.")
+
+
+@click.command("reindex-search")
+@with_appcontext
+def reindex_search_command():
+    """Rebuild the full-text search index from the projects and experiences."""
+    search_index.create_tables()
+    count = search_index.rebuild()
+    logger.info(f"Indexed {count} documents for search")
+    click.echo(f"Indexed {count} documents for search.")
@@ -0,0 +1,146 @@
+"""
+This module compresses dynamic responses (HTML, JSON, ...) with Brotli or gzip.
+
+Every response with a compressible content type and a body of at least
+`COMPRESSION_MIN_SIZE` bytes is encoded with the best coding the client
+accepts (Brotli first, then gzip). Streamed responses are compressed chunk by
+chunk, each chunk flushed as it is produced, so nothing is held back.
+
+Pages served from the page cache carry a per-entry store of their compressed
+bodies (`CachedPage.variants`): each page is compressed once per encoding and
+the bytes are reused on every later hit.
+
+Responses that are already encoded (the prebuilt static assets) or sent
+straight from a file are left alone.
+"""
+
+import zlib
+from typing import Iterable, Optional
+
+import brotli  # Brotli compression (pinned in requirements.txt)
+from flask import Flask, request
+
+# Content types worth compressing; images and fonts are already compressed.
+COMPRESSIBLE_MIMETYPES = frozenset(
+    {
+        "text/html",
+        "text/plain",
+        "text/css",
+        "text/javascript",
+        "application/javascript",
+        "application/json",
+        "application/xml",
+        "image/svg+xml",
+    }
+)
+
+# Supported codings, in order of preference.
+ENCODINGS = ("br", "gzip")
+
+
+class Compressor:
+    """Negotiates and applies response compression in an `after_request` hook."""
+
+    def __init__(self):
+        self.enabled = True
+        self.min_size = 500
+        self.gzip_level = 6
+        self.brotli_quality = 5
+
+    def init_app(self, app: Flask):
+        """
+        Configures the compression settings and registers the response hook.
+
+        Args:
+            app: The Flask application instance.
+        """
+        self.enabled = app.config.get("COMPRESSION_ENABLED", True)
+        self.min_size = app.config.get("COMPRESSION_MIN_SIZE", 500)
+        self.gzip_level = app.config.get("COMPRESSION_GZIP_LEVEL", 6)
+        self.brotli_quality = app.config.get("COMPRESSION_BROTLI_QUALITY", 5)
+        app.extensions["compression"] = self
+        if self.enabled:
+            app.after_request(self._compress_response)
+
+    @staticmethod
+    def negotiate() -> Optional[str]:
+        """Returns the preferred coding the current request accepts, or None."""
+        for encoding in ENCODINGS:
+            if request.accept_encodings[encoding]:
+                return encoding
+        return None
+
+    def compress(self, data: bytes, encoding: str) -> bytes:
+        """Compresses a whole body."""
+        if encoding == "br":
+            return brotli.compress(data, mode=brotli.MODE_TEXT, quality=self.brotli_quality)
+        # wbits=31 writes the gzip container; unlike gzip.compress() it embeds no timestamp.
+        compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)
+        return compressor.compress(data) + compressor.flush()
+
+    def compress_stream(self, chunks: Iterable[bytes], encoding: str):
+        """Compresses a streamed body, flushing after every chunk."""
+        if encoding == "br":
+            compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=self.brotli_quality)
+            for chunk in chunks:
+                yield compressor.process(chunk) + compressor.flush()
+            yield compressor.finish()
+        else:
+            compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)
+            for chunk in chunks:
+                yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            yield compressor.flush()
+
+    def _compress_response(self, response):
+        if (
+            response.status_code < 200
+            or response.status_code == 204
+            or response.direct_passthrough  # Sent from a file (send_file)
+            or "Content-Encoding" in response.headers
+            or response.cache_control.no_transform
+        ):
+            return response
+        # A 304 is empty and carries no content type of its own: it stands for the
+        # (compressible) 200 of a `conditional_get` view, and must carry the same
+        # Vary and validators as that 200 would (RFC 9110, section 15.4.5).
+        not_modified = response.status_code == 304
+        if not not_modified and response.mimetype not in COMPRESSIBLE_MIMETYPES:
+            return response
+
+        response.vary.add("Accept-Encoding")
+        encoding = self.negotiate()
+        if encoding is None:
+            return response
+
+        # The encoded bytes differ from the original ones, so a strong ETag would be
+        # wrong for them; a weak one still matches (conditional_get compares weakly).
+        # It is weakened whenever a coding is negotiated, even for a body too small
+        # to compress, so a 304 (whose body size is unknown) gets the same one.
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        if not_modified:
+            return response
+
+        if response.is_streamed:
+            response.response = self.compress_stream(response.iter_encoded(), encoding)
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            # Set by `cached_page`: the compressed bodies stored with the page cache entry.
+            variants = getattr(response, "compressed_variants", None)
+            compressed = variants.get(encoding) if variants is not None else None
+            if compressed is None:
+                compressed = self.compress(data, encoding)
+                if variants is not None:
+                    variants[encoding] = compressed
+            response.set_data(compressed)
+
+        response.content_encoding = encoding
+        return response
+
+
+# Shared compressor instance, bound to the app in `init_extensions`.
+compression = Compressor()
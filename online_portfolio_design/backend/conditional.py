@@ -0,0 +1,164 @@
+"""
+This module adds conditional GET support (ETag / Last-Modified / 304) to views.
+
+Validators are derived from the per-table rows of `content_version`, never from
+the response body, so a request carrying a matching `If-None-Match` or
+`If-Modified-Since` header gets an empty 304 before the view renders a template
+or serializes any JSON.
+"""
+
+import hashlib
+import threading
+from datetime import datetime, timezone
+from functools import wraps
+from typing import Iterable, Optional
+
+from cachetools import TTLCache  # Time-aware cache for the version lookups
+from flask import Flask, current_app, make_response, request
+from sqlalchemy import select
+
+from backend.assets import assets
+from backend.models import db
+from backend.models.content_version import ContentVersion
+from backend.models.events import content_changed
+
+
+class ContentVersions:
+    """
+    Memoizes `content_version` rows so that repeat validations skip the database.
+
+    Entries are dropped as soon as this process commits a write to the table,
+    and otherwise expire after `CONTENT_VERSION_TIMEOUT` seconds so writes made
+    by other worker processes are picked up quickly.
+    """
+
+    def __init__(self, ttl: float = 5):
+        self._lock = threading.Lock()
+        self._versions = TTLCache(maxsize=128, ttl=ttl)
+
+    def init_app(self, app: Flask):
+        """
+        Configures the memo from the application settings and subscribes it to
+        commit notifications.
+
+        Args:
+            app: The Flask application instance.
+        """
+        with self._lock:
+            self._versions = TTLCache(
+                maxsize=128, ttl=app.config.get("CONTENT_VERSION_TIMEOUT", 5)
+            )
+        content_changed.connect(self._on_content_changed, weak=False)
+
+    def get(self, tables: Iterable[str]) -> dict:
+        """
+        Returns a mapping of table name to a `(version, updated_at)` tuple.
+
+        Tables without a `content_version` row are reported as `(0, None)`.
+        """
+        tables = tuple(tables)
+        with self._lock:
+            found = {table: self._versions.get(table) for table in tables}
+        missing = [table for table, value in found.items() if value is None]
+
+        if missing:
+            rows = db.session.execute(
+                select(
+                    ContentVersion.table_name,
+                    ContentVersion.version,
+                    ContentVersion.updated_at,
+                ).where(ContentVersion.table_name.in_(missing))
+            ).all()
+            loaded = {row.table_name: (row.version, row.updated_at) for row in rows}
+            with self._lock:
+                for table in missing:
+                    found[table] = loaded.get(table, (0, None))
+                    self._versions[table] = found[table]
+        return found
+
+    def _on_content_changed(self, sender, tables: frozenset):
+        with self._lock:
+            for table in tables:
+                self._versions.pop(table, None)
+
+
+# Shared version memo, bound to the app in `init_extensions`.
+content_versions = ContentVersions()
+
+
+def make_etag(versions: dict) -> str:
+    """
+    Builds a strong ETag for the current request from table versions.
+
+    The request path and query string are part of the hash, so every page and
+    every parameter combination gets its own validator. So is the asset build,
+    since a page links to the fingerprinted files of the build it was rendered
+    with.
+    """
+    parts = [request.path, request.query_string.decode("latin-1")]
+    if assets.version:
+        parts.append(f"assets:{assets.version}")
+    parts.extend(f"{table}:{versions[table][0]}" for table in sorted(versions))
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def last_modified(versions: dict) -> Optional[datetime]:
+    """Returns the newest write time across the tables, as an aware UTC datetime."""
+    times = [updated_at for _, updated_at in versions.values() if updated_at]
+    if not times:
+        return None
+    # HTTP dates have one-second resolution.
+    return max(times).replace(tzinfo=timezone.utc, microsecond=0)
+
+
+def is_not_modified(etag: str, modified: Optional[datetime]) -> bool:
+    """
+    Evaluates the request's conditional headers against the current validators.
+
+    `If-None-Match` takes precedence; `If-Modified-Since` is only consulted
+    when the client sent no entity tags (RFC 9110, section 13.2.2).
+    """
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and modified:
+        return modified <= request.if_modified_since
+    return False
+
+
+def conditional_get(*tables: str):
+    """
+    Decorator that answers GET requests with 304 Not Modified when possible.
+
+    Args:
+        *tables: The names of the tables the response is built from.
+
+    Responses carry `ETag`, `Last-Modified` and `Cache-Control: no-cache`, so
+    browsers and the CDN keep their copy but revalidate it on every use.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view(*args, **kwargs)
+
+            versions = content_versions.get(tables)
+            etag = make_etag(versions)
+            modified = last_modified(versions)
+
+            if is_not_modified(etag, modified):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            if modified:
+                response.last_modified = modified
+            response.cache_control.no_cache = True
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,99 @@
+"""
+This module parses the free-form certificate dates used across the site
+("Sep 17th, 2021", "June 2 2021", ...).
+
+Parsing happens once, when a certificate is written (see `Certificate.issued_on`);
+the memoized `parse_date` remains as a fast fallback for legacy values. A single
+precompiled pattern plus a month-name lookup replaces trying one `strptime`
+format after another, each failure of which raised and caught an exception.
+"""
+
+import re  # Import the re module for regular expressions
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Optional
+
+# Ordinal suffixes such as "1st", "2nd", "3rd" and "17th".
+_ORDINAL_SUFFIX = re.compile(r"(\d+)(st|nd|rd|th)")
+
+# "<month> <day>[,] <year>" with an optional ordinal suffix on the day. This is
+# exactly what the previously supported strptime formats accepted:
+# "%b %d, %Y", "%B %d, %Y", "%b %d %Y" and "%B %d %Y".
+_DATE_PATTERN = re.compile(
+    r"^\s*([A-Za-z]+)\s+(\d{1,2})(?:st|nd|rd|th)?,?\s+(\d{4})\s*$"
+)
+
+# Full and abbreviated English month names, lower-cased.
+_MONTHS = {
+    name: number
+    for number, (full, short) in enumerate(
+        [
+            ("january", "jan"),
+            ("february", "feb"),
+            ("march", "mar"),
+            ("april", "apr"),
+            ("may", "may"),
+            ("june", "jun"),
+            ("july", "jul"),
+            ("august", "aug"),
+            ("september", "sep"),
+            ("october", "oct"),
+            ("november", "nov"),
+            ("december", "dec"),
+        ],
+        start=1,
+    )
+    for name in (full, short)
+}
+
+
+def remove_ordinal_suffix(date_string: str) -> str:
+    """
+    Removes ordinal suffixes like 'st', 'nd', 'rd', 'th' from a date string.
+
+    Args:
+        date_string (str): A date string that may contain ordinal suffixes.
+
+    Returns:
+        str: The cleaned date string without ordinal suffixes.
+    """
+    return _ORDINAL_SUFFIX.sub(r"\1", date_string)
+
+
+@lru_cache(maxsize=1024)
+def parse_issued_on(date_string: str) -> Optional[date]:
+    """
+    Parses a certificate date such as "Sep 17th, 2021" or "June 2 2021".
+
+    Args:
+        date_string (str): The date as entered, possibly with an ordinal suffix.
+
+    Returns:
+        date: The parsed date, or None if the string is not a recognised date.
+    """
+    match = _DATE_PATTERN.match(date_string or "")
+    if not match:
+        return None
+    month = _MONTHS.get(match.group(1).lower())
+    if month is None:
+        return None
+    try:
+        return date(int(match.group(3)), month, int(match.group(2)))
+    except ValueError:  # e.g. "Feb 30, 2021"
+        return None
+
+
+def parse_date(date_string: str) -> datetime:
+    """
+    Parses a date string after removing ordinal suffixes.
+
+    Args:
+        date_string (str): A date string that may include ordinal suffixes.
+
+    Returns:
+        datetime: A datetime object representing the parsed date, or datetime.min if parsing fails.
+    """
+    parsed = parse_issued_on(date_string)
+    if parsed is None:
+        return datetime.min  # Return a default old date if parsing fails
+    return datetime(parsed.year, parsed.month, parsed.day)
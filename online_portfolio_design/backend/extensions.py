@@ -1,5 +1,6 @@
 """
-This module initializes and configures Flask extensions such as Flask-Mail.
+This module initializes and configures Flask extensions such as Flask-Mail
+and the rendered-page cache.
 It also provides functions to configure application-level settings.
 
 Flask extensions provide reusable functionality to Flask applications, such as
@@ -8,13 +9,61 @@ the configuration and initialization of these extensions.
 """
 
 from flask import Flask
+from sqlalchemy.engine import make_url
 from flask_mail import Mail  # Import the Mail class from Flask-Mail
+from backend.mail_queue import MailQueue  # Import the background mail delivery queue
+from backend.recaptcha import (
+    RecaptchaVerifier,
+)  # Import the pooled reCAPTCHA verification service
+from backend.cache import page_cache  # Import the shared rendered-page cache
+from backend.conditional import (
+    content_versions,
+)  # Import the shared content version memo used for ETags
+from backend.project_index import (
+    project_index,
+)  # Import the shared in-memory index of project IDs
+from backend.overview_cache import (
+    overview_cache,
+)  # Import the shared cache of the decoded and truncated projects overview
+from backend.search import search_index  # Import the full-text search index
+from backend.facets import project_facets  # Import the project facet count cache
+from backend.instrumentation import (
+    instrumentation,
+)  # Import the shared request timing and SQL instrumentation
+from backend.metrics import metrics  # Import the Prometheus metrics exporter
+from backend.assets import (
+    assets,
+)  # Import the fingerprinted, precompressed static asset pipeline
+from backend.images import (
+    images,
+)  # Import the responsive image derivatives (resized WebP/AVIF copies)
+from backend.compression import (
+    compression,
+)  # Import the Brotli/gzip response compressor
+from backend.json_provider import (
+    FastJSONProvider,
+)  # Import the orjson-backed JSON provider
+from backend.models.routing import (
+    REPLICA_BIND_PREFIX,
+    replica_router,
+)  # Import the router that sends read-only queries to replicas
+from logger import logger
 
 # Initialize Flask-Mail extension
 mail = (
     Mail()
 )  # Create an instance of the Mail class, but don't associate it with an app yet.
 
+# Initialize the background delivery queue that sends through `mail`
+mail_queue = MailQueue(
+    mail
+)  # Spools messages durably and sends them from worker threads, off the request path.
+
+# Initialize the reCAPTCHA verification service
+recaptcha = (
+    RecaptchaVerifier()
+)  # Verifies tokens over a pooled HTTP session with timeouts and a circuit breaker.
+
 
 def configure_database(app: Flask):
     """
@@ -40,6 +89,88 @@ def configure_database(app: Flask):
     # Disables SQLAlchemy's modification tracking, which can improve performance, especially in production environments.
     # It is recommended to set this explicitly to avoid potential warnings.
 
+    # Engine and connection pool options
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = build_engine_options(
+        app, app.config.get("SQLALCHEMY_DATABASE_URI")
+    )
+    # Builds the pool settings from the DB_* configuration; explicit SQLALCHEMY_ENGINE_OPTIONS entries win.
+
+    # Read replicas
+    replica_uris = [
+        uri.strip()
+        for uri in (app.config.get("DATABASE_REPLICA_URIS") or "").split(",")
+        if uri.strip()
+    ]
+    binds = dict(app.config.get("SQLALCHEMY_BINDS") or {})
+    for number, uri in enumerate(replica_uris, start=1):
+        binds[f"{REPLICA_BIND_PREFIX}{number}"] = {
+            "url": uri,
+            **build_engine_options(app, uri),
+        }
+    app.config["SQLALCHEMY_BINDS"] = binds
+    # Adds one engine per replica; `replica_router` sends GET-request reads to them.
+
+
+def build_engine_options(app: Flask, uri: str) -> dict:
+    """
+    Builds the SQLAlchemy engine options for `uri` from the DB_* pool settings.
+
+    SQLite gets no pool options (Flask-SQLAlchemy picks a suitable pool for it).
+    On Postgres, `DB_STATEMENT_TIMEOUT` is applied to every connection through
+    the libpq `options` connect argument. Any entries already present in
+    `SQLALCHEMY_ENGINE_OPTIONS` take precedence over the generated ones.
+
+    Args:
+        app: The Flask application instance.
+        uri (str): The database URI the engine connects to.
+
+    Returns:
+        dict: The keyword arguments passed to `create_engine()`.
+    """
+    options = {}
+    if uri and make_url(uri).get_backend_name() != "sqlite":
+        options = {
+            "pool_size": app.config.get("DB_POOL_SIZE", 5),
+            "max_overflow": app.config.get("DB_MAX_OVERFLOW", 10),
+            "pool_timeout": app.config.get("DB_POOL_TIMEOUT", 30),
+            "pool_recycle": app.config.get("DB_POOL_RECYCLE", 1800),
+            "pool_pre_ping": app.config.get("DB_POOL_PRE_PING", True),
+        }
+        statement_timeout = app.config.get("DB_STATEMENT_TIMEOUT", 0)
+        if statement_timeout and make_url(uri).get_backend_name() == "postgresql":
+            options["connect_args"] = {
+                "options": f"-c statement_timeout={statement_timeout}"
+            }
+    options.update(app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})
+    return options
+
+
+def log_database_pool(engine):
+    """
+    Logs the connection pool an engine actually ended up with.
+
+    Args:
+        engine: The SQLAlchemy engine (e.g. `db.engine`).
+    """
+    pool = engine.pool
+    details = [f"class={type(pool).__name__}"]
+    if hasattr(pool, "size"):
+        details.append(f"size={pool.size()}")
+    for label, attribute in (
+        ("max_overflow", "_max_overflow"),
+        ("recycle", "_recycle"),
+        ("pre_ping", "_pre_ping"),
+    ):
+        if hasattr(pool, attribute):
+            details.append(f"{label}={getattr(pool, attribute)}")
+    if hasattr(pool, "timeout"):
+        details.append(f"timeout={pool.timeout()}")
+    logger.info(
+        "Database pool for %s: %s",
+        engine.url.render_as_string(hide_password=True),
+        " ".join(details),
+    )
+
 
 def configure_mail(app: Flask):
     """
@@ -106,6 +237,19 @@ def configure_recaptcha(app: Flask):
     # **WARNING: Never expose the private key in client-side code or commit it to version control!**
 
 
+def configure_json(app: Flask):
+    """
+    Replaces Flask's JSON provider with the orjson-backed one.
+
+    `jsonify()` and `request.get_json()` then encode and decode with orjson,
+    while keeping Flask's settings (e.g. `app.json.sort_keys`) and output.
+
+    Args:
+        app: The Flask application instance.
+    """
+    app.json = FastJSONProvider(app)  # Falls back to the json module where orjson cannot help
+
+
 def init_extensions(app: Flask):
     """
     Initializes Flask extensions and attaches them to the application.
@@ -117,11 +261,41 @@ def init_extensions(app: Flask):
     Args:
         app: The Flask application instance.
     """
+    configure_json(app)  # Configure JSON
+    # Serializes API responses with orjson.
     configure_database(app)  # Configure Database
     # Configures the SQLAlchemy database settings.
+    replica_router.init_app(app)  # Initialize the read replica router.
+    # Picks up the replica binds added by configure_database.
     mail.init_app(app)  # Initialize the Flask-Mail extension with the application.
     # Initializes the Flask-Mail extension and associates it with the Flask application instance.
     configure_mail(app)  # Configure Mail
     # Configures the Flask-Mail settings.
+    mail_queue.init_app(app)  # Initialize the background mail queue
+    # Opens the mail spool and arranges for the delivery threads to start with the first request.
     configure_recaptcha(app)  # Configure ReCaptcha
     # Configures the reCAPTCHA settings.
+    recaptcha.init_app(app)  # Initialize the reCAPTCHA verification service.
+    # Applies the endpoint, timeout, circuit breaker and verdict cache settings.
+    page_cache.init_app(app)  # Initialize the page cache with the application.
+    # Applies the page cache settings and subscribes it to database commits so cached pages are invalidated.
+    content_versions.init_app(app)  # Initialize the content version memo.
+    # Lets conditional GET requests reuse table versions until a commit changes them.
+    project_index.init_app(app)  # Initialize the project ID index.
+    # Serves project counts and route validation from memory, reloading when the project table's version changes.
+    overview_cache.init_app(app)  # Initialize the projects overview cache.
+    # Decodes and truncates the overview once per revision instead of on every projects page view.
+    search_index.init_app(app)  # Initialize the full-text search index.
+    # Re-indexes the projects and experiences written by each commit.
+    project_facets.init_app(app)  # Initialize the project facet count cache.
+    # Keeps status and technology counts per content version, dropping them when projects change.
+    instrumentation.init_app(app)  # Initialize the request instrumentation.
+    # Times each request, its SQL and template rendering, and reports them in a Server-Timing header.
+    metrics.init_app(app)  # Initialize the Prometheus metrics.
+    # Records request latency, pool usage and mail outcomes, and serves them at /metrics.
+    assets.init_app(app)  # Initialize the static asset pipeline.
+    # Points static URLs at the fingerprinted build and serves it precompressed with immutable caching.
+    images.init_app(app)  # Initialize the responsive image derivatives.
+    # Serves resized WebP/AVIF copies of static images and provides the responsive_image() template helper.
+    compression.init_app(app)  # Initialize the response compression.
+    # Compresses HTML and JSON responses for clients that accept it, once per cached page.
@@ -0,0 +1,139 @@
+"""
+This module filters projects by status and technology, and counts the facets.
+
+Filters and counts are answered by indexed SQL queries: statuses through the
+index on `project.status`, technologies through the `project_technology` rows
+derived from each project's technical details (see `ProjectTechnology`), so no
+project's JSON is decoded to filter the catalogue.
+
+Facet counts are cached per content version of the tables they are computed
+from: a cached entry is only reused while neither table has changed, and the
+cache is cleared as soon as this process commits a write to either of them.
+"""
+
+import threading
+from typing import Sequence
+
+from cachetools import LRUCache
+from flask import Flask
+from sqlalchemy import distinct, func, select
+
+from backend.conditional import content_versions
+from backend.models import db
+from backend.models.events import content_changed
+from backend.models.projects import Project, ProjectTechnology
+
+# The tables the filters and counts are computed from.
+FACET_TABLES = (Project.__tablename__, ProjectTechnology.__tablename__)
+
+
+def filter_projects(statement, statuses: Sequence[str], technologies: Sequence[str]):
+    """
+    Restricts a project query or SELECT to the given statuses and technologies.
+
+    Args:
+        statement: A query or SELECT over `Project`.
+        statuses: Keep projects with any of these statuses (all when empty).
+        technologies: Keep projects that use every one of these technologies.
+
+    Returns:
+        The filtered query or SELECT.
+    """
+    if statuses:
+        statement = statement.where(Project.status.in_(statuses))
+    for technology in technologies:
+        statement = statement.where(
+            Project.id.in_(
+                select(ProjectTechnology.project_id).where(ProjectTechnology.name == technology)
+            )
+        )
+    return statement
+
+
+def _counts(rows) -> list:
+    """Turns (value, count) rows into dicts, most common first."""
+    return [
+        {"value": value, "count": count}
+        for value, count in sorted(rows, key=lambda row: (-row[1], row[0]))
+    ]
+
+
+class ProjectFacets:
+    """Computes and caches the status and technology counts of the projects."""
+
+    def __init__(self, maxsize: int = 256):
+        self._lock = threading.Lock()
+        self._cache = LRUCache(maxsize=maxsize)
+
+    def init_app(self, app: Flask):
+        """
+        Configures the cache from the application settings and subscribes it
+        to commit notifications.
+
+        Args:
+            app: The Flask application instance.
+        """
+        with self._lock:
+            self._cache = LRUCache(maxsize=app.config.get("FACET_CACHE_MAX_ENTRIES", 256))
+        content_changed.connect(self._on_content_changed, weak=False)
+        app.extensions["project_facets"] = self
+
+    def get(self, statuses: Sequence[str] = (), technologies: Sequence[str] = ()) -> dict:
+        """
+        Returns the facet counts for the given filters. Requires an application context.
+
+        The status counts ignore the status filter, so every alternative status
+        keeps its count; the technology counts and the total apply both filters.
+
+        Returns:
+            dict: `total` (the number of matching projects), and `status` and
+            `technology` lists of `{"value", "count"}` dicts, most common first.
+        """
+        versions = content_versions.get(FACET_TABLES)
+        key = (
+            tuple(versions[table][0] for table in FACET_TABLES),
+            tuple(sorted(set(statuses))),
+            tuple(sorted(set(technologies))),
+        )
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        filtered_ids = filter_projects(select(Project.id), statuses, technologies)
+        status_counts = db.session.execute(
+            filter_projects(
+                select(Project.status, func.count()).group_by(Project.status),
+                (),
+                technologies,
+            )
+        ).all()
+        technology_query = select(
+            ProjectTechnology.name, func.count(distinct(ProjectTechnology.project_id))
+        ).group_by(ProjectTechnology.name)
+        if statuses or technologies:
+            technology_query = technology_query.where(
+                ProjectTechnology.project_id.in_(filtered_ids)
+            )
+        technology_counts = db.session.execute(technology_query).all()
+        total = db.session.execute(
+            select(func.count()).select_from(filtered_ids.subquery())
+        ).scalar_one()
+
+        facets = {
+            "total": total,
+            "status": _counts(status_counts),
+            "technology": _counts(technology_counts),
+        }
+        with self._lock:
+            self._cache[key] = facets
+        return facets
+
+    def _on_content_changed(self, sender, tables: frozenset):
+        if tables & set(FACET_TABLES):
+            with self._lock:
+                self._cache.clear()
+
+
+# Shared facet cache instance, bound to the app in `init_extensions`.
+project_facets = ProjectFacets()
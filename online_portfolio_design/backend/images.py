@@ -0,0 +1,262 @@
+"""
+This module generates and serves responsive derivatives of `static/images`.
+
+Photos and logos are stored once, at full size, and often shown at a fraction
+of it. For every JPEG or PNG image the module can produce smaller, re-encoded
+copies (WebP and, when Pillow supports it, AVIF) at the widths listed in
+`IMAGE_WIDTHS`, and the `responsive_image()` template helper emits `<picture>`
+markup that lets the browser pick the smallest suitable one:
+
+    {{ responsive_image('images/me.jpeg', alt='Me', sizes='200px', class_='img-fluid') }}
+
+A derivative is created the first time it is requested (or up front, with
+`flask build-images`) and kept on disk, so each one is encoded only once. Its
+URL contains a hash of the source image, which makes it safe to cache forever.
+Browsers without WebP or AVIF support fall back to the original `<img>`.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from flask import Flask, abort, redirect, send_file, url_for
+from markupsafe import Markup, escape
+from PIL import Image, ImageOps, features
+from werkzeug.security import safe_join
+
+from logger import logger
+
+# Source formats that get derivatives. GIFs are left alone: they may be animated.
+SOURCE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+# Derivatives never change under a given URL, so they may be cached for a year.
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+
+class ImageDerivatives:
+    """Creates, caches and serves resized WebP/AVIF copies of static images."""
+
+    def __init__(self):
+        self.enabled = True
+        self.static_folder: Optional[str] = None
+        self.cache_dir: Optional[str] = None
+        self.widths: List[int] = [160, 320, 640, 960, 1280, 1920]
+        self.formats: List[str] = ["avif", "webp"]
+        self.quality: Dict[str, int] = {"webp": 70, "avif": 45}
+        self._sources: Dict[str, tuple] = {}  # filename -> (stat key, version, width)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def init_app(self, app: Flask):
+        """
+        Configures the derivatives, registers their route and the
+        `responsive_image` template helper.
+
+        Args:
+            app: The Flask application instance.
+        """
+        self.enabled = app.config.get("IMAGES_ENABLED", True)
+        self.static_folder = app.static_folder
+        self.cache_dir = app.config.get("IMAGE_CACHE_DIR") or os.path.join(
+            app.static_folder, app.config.get("ASSETS_OUTPUT_DIR", "dist"), "images"
+        )
+        self.widths = sorted(
+            int(width) for width in app.config.get("IMAGE_WIDTHS", "").split(",") if width
+        ) or self.widths
+        self.quality = {
+            "webp": app.config.get("IMAGE_QUALITY", 70),
+            "avif": app.config.get("IMAGE_AVIF_QUALITY", 45),
+        }
+        requested = [
+            name.strip().lower()
+            for name in app.config.get("IMAGE_FORMATS", "avif,webp").split(",")
+            if name.strip()
+        ]
+        self.formats = [name for name in requested if features.check(name)]
+        for name in set(requested) - set(self.formats):
+            logger.warning(f"Pillow cannot encode {name}; no {name} images will be made")
+
+        app.add_template_global(self.picture, "responsive_image")
+        app.add_url_rule(
+            "/img/<version>/<fmt>/<int:width>/<path:filename>",
+            "image_derivative",
+            self.serve,
+        )
+        app.extensions["images"] = self
+
+    # ----- Sources -----
+    def _source_info(self, filename: str) -> Optional[Tuple[str, int]]:
+        """
+        Returns the version (a hash of the content) and the width of a static
+        image, or None if it does not exist or gets no derivatives.
+        """
+        if not filename.lower().endswith(SOURCE_EXTENSIONS):
+            return None
+        path = safe_join(self.static_folder, filename)
+        try:
+            stat = os.stat(path)
+        except (TypeError, OSError):  # safe_join returns None for unsafe paths
+            return None
+        stat_key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._sources.get(filename)
+        if cached is not None and cached[0] == stat_key:
+            return cached[1:]
+
+        with open(path, "rb") as source_file:
+            version = hashlib.sha256(source_file.read()).hexdigest()[:12]
+        with Image.open(path) as image:
+            width = ImageOps.exif_transpose(image).width  # As displayed, not as stored
+        self._sources[filename] = (stat_key, version, width)
+        return version, width
+
+    def widths_for(self, source_width: int) -> List[int]:
+        """Returns the derivative widths offered for an image; never larger than the image."""
+        widths = {width for width in self.widths if width < source_width}
+        if source_width <= self.widths[-1]:
+            widths.add(source_width)  # Re-encoded at its own size
+        return sorted(widths)
+
+    # ----- Derivatives -----
+    def _derivative_path(self, version: str, fmt: str, width: int, filename: str) -> str:
+        return os.path.join(self.cache_dir, version, str(width), f"{filename}.{fmt}")
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def ensure(self, filename: str, fmt: str, width: int) -> Optional[str]:
+        """
+        Returns the path of a derivative, creating it if needed.
+
+        Returns:
+            str: The path, or None if the source, format or width is not offered.
+        """
+        info = self._source_info(filename)
+        if info is None or fmt not in self.formats:
+            return None
+        version, source_width = info
+        if width not in self.widths_for(source_width):
+            return None
+
+        path = self._derivative_path(version, fmt, width, filename)
+        if os.path.exists(path):
+            return path
+        with self._lock_for(path):
+            if not os.path.exists(path):  # Another thread may have just made it
+                self._encode(safe_join(self.static_folder, filename), path, fmt, width)
+        return path
+
+    def _encode(self, source_path: str, path: str, fmt: str, width: int):
+        with Image.open(source_path) as image:
+            image = ImageOps.exif_transpose(image)
+            if image.width > width:
+                height = max(1, round(image.height * width / image.width))
+                image = image.resize((width, height), Image.Resampling.LANCZOS)
+            image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temporary file first, so other workers never serve a partial image.
+            handle, temporary_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            try:
+                with os.fdopen(handle, "wb") as output_file:
+                    image.save(
+                        output_file, format=fmt.upper(), quality=self.quality.get(fmt, 70)
+                    )
+                os.replace(temporary_path, path)
+            except BaseException:
+                os.unlink(temporary_path)
+                raise
+        logger.info(f"Created image derivative {path}")
+
+    def build(self) -> int:
+        """
+        Creates every derivative of every image under `static/images`.
+
+        Returns:
+            int: The number of derivatives that exist afterwards.
+        """
+        count = 0
+        images_folder = os.path.join(self.static_folder, "images")
+        for directory, _, files in os.walk(images_folder):
+            for name in sorted(files):
+                filename = os.path.relpath(
+                    os.path.join(directory, name), self.static_folder
+                ).replace(os.sep, "/")
+                info = self._source_info(filename)
+                if info is None:
+                    continue
+                for fmt in self.formats:
+                    for width in self.widths_for(info[1]):
+                        self.ensure(filename, fmt, width)
+                        count += 1
+        return count
+
+    def serve(self, version: str, fmt: str, width: int, filename: str):
+        """Serves a derivative, creating it on first request."""
+        if not self.enabled:
+            abort(404)
+        info = self._source_info(filename)
+        if info is not None and info[0] != version:
+            # The image changed since the page was rendered: send the current one.
+            return redirect(self.url(filename, info[0], fmt, width))
+        path = self.ensure(filename, fmt, width)
+        if path is None:
+            abort(404)
+        response = send_file(path, mimetype=f"image/{fmt}", max_age=IMMUTABLE_MAX_AGE)
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
+
+    @staticmethod
+    def url(filename: str, version: str, fmt: str, width: int) -> str:
+        return url_for(
+            "image_derivative", version=version, fmt=fmt, width=width, filename=filename
+        )
+
+    # ----- Template helper -----
+    def picture(self, filename: str, alt: str = "", sizes: str = "100vw", **attributes) -> Markup:
+        """
+        Renders a `<picture>` element for a static image, offering its WebP and
+        AVIF derivatives at every width, with the original as the fallback.
+
+        Images that get no derivatives (GIFs, missing files, or everything when
+        the feature is disabled) are rendered as a plain `<img>`.
+
+        Args:
+            filename (str): The image path, relative to the static folder.
+            alt (str): The image's alternative text.
+            sizes (str): The `sizes` attribute: how wide the image is displayed.
+            **attributes: Extra `<img>` attributes (use `class_` for `class`).
+
+        Returns:
+            Markup: The HTML markup.
+        """
+        attributes = {
+            "src": url_for("static", filename=filename),
+            "alt": alt,
+            **{name.rstrip("_").replace("_", "-"): value for name, value in attributes.items()},
+        }
+        img = "<img %s />" % " ".join(
+            f'{name}="{escape(value)}"' for name, value in attributes.items()
+        )
+        info = self._source_info(filename) if self.enabled and self.formats else None
+        if info is None:
+            return Markup(img)
+
+        version, source_width = info
+        sources = []
+        for fmt in self.formats:
+            srcset = ", ".join(
+                f"{self.url(filename, version, fmt, width)} {width}w"
+                for width in self.widths_for(source_width)
+            )
+            sources.append(
+                f'<source type="image/{fmt}" srcset="{escape(srcset)}" sizes="{escape(sizes)}" />'
+            )
+        return Markup(f"<picture>{''.join(sources)}{img}</picture>")
+
+
+# Shared image derivative instance, bound to the app in `init_extensions`.
+images = ImageDerivatives()
@@ -0,0 +1,242 @@
+"""
+This module provides lightweight, always-on request instrumentation.
+
+For every request it records:
+
+    - the wall time spent handling the request,
+    - the time spent in SQL and the number of statements executed (via
+      SQLAlchemy engine events),
+    - the time spent rendering Jinja templates (via Flask's template signals),
+    - the size of the response body.
+
+The figures are aggregated per endpoint into in-memory histograms. With
+`SERVER_TIMING_ENABLED` (on in development only, since any visitor could read
+it) they are also returned in a `Server-Timing` header, so they show up in the
+browser's network panel, e.g.
+
+    Server-Timing: app;dur=41.2, db;dur=12.7;desc="3 queries", tpl;dur=18.9
+
+The aggregates are per worker process; set `INSTRUMENTATION_STATS_URL` to expose them as JSON.
+"""
+
+import bisect
+import threading
+import time
+from typing import Dict, Optional
+
+from flask import Flask, g, has_request_context, jsonify, request
+from flask.signals import before_render_template, template_rendered
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Upper bounds (in milliseconds) of the latency histogram buckets; a final
+# overflow bucket catches everything slower.
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class Histogram:
+    """A fixed-bucket histogram that also tracks the count, sum and maximum."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def to_dict(self) -> dict:
+        labels = [f"le_{bound}" for bound in self.buckets] + ["inf"]
+        return {
+            "count": self.count,
+            "sum": round(self.total, 3),
+            "avg": round(self.total / self.count, 3) if self.count else 0.0,
+            "max": round(self.max, 3),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class EndpointStats:
+    """The aggregated measurements of a single endpoint."""
+
+    def __init__(self):
+        self.wall_ms = Histogram()
+        self.sql_ms = Histogram()
+        self.template_ms = Histogram()
+        self.queries = Histogram(buckets=(0, 1, 2, 5, 10, 20, 50, 100))
+        self.response_bytes = Histogram(
+            buckets=(1024, 4096, 16384, 65536, 262144, 1048576)
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "wall_ms": self.wall_ms.to_dict(),
+            "sql_ms": self.sql_ms.to_dict(),
+            "template_ms": self.template_ms.to_dict(),
+            "queries": self.queries.to_dict(),
+            "response_bytes": self.response_bytes.to_dict(),
+        }
+
+
+class RequestTimings:
+    """The measurements of the request being handled, kept on `flask.g`."""
+
+    __slots__ = ("started", "sql_ms", "queries", "template_ms", "_template_starts")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_ms = 0.0
+        self.queries = 0
+        self.template_ms = 0.0
+        self._template_starts = []
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """Returns the timings of the current request, or None outside a request."""
+    if not has_request_context():
+        return None
+    return g.get("_request_timings")
+
+
+class Instrumentation:
+    """Collects per-request timings and aggregates them by endpoint."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, EndpointStats] = {}
+        self.enabled = True
+        self.server_timing = False
+
+    def init_app(self, app: Flask):
+        """
+        Registers the request hooks, template signals and engine events.
+
+        Args:
+            app: The Flask application instance.
+        """
+        self.enabled = app.config.get("INSTRUMENTATION_ENABLED", True)
+        self.server_timing = app.config.get("SERVER_TIMING_ENABLED", False)
+        if not self.enabled:
+            return
+
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        before_render_template.connect(self._template_started, app, weak=False)
+        template_rendered.connect(self._template_finished, app, weak=False)
+        # Listening on the Engine class covers every engine the app creates.
+        if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+            event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+        stats_url = app.config.get("INSTRUMENTATION_STATS_URL")
+        if stats_url:
+            app.add_url_rule(
+                stats_url,
+                "instrumentation_stats",
+                lambda: jsonify(self.stats()),
+            )
+        app.extensions["instrumentation"] = self
+
+    def _start_request(self):
+        g._request_timings = RequestTimings()
+
+    def _finish_request(self, response):
+        timings = current_timings()
+        if timings is None:
+            return response
+        wall_ms = (time.perf_counter() - timings.started) * 1000
+        size = response.content_length
+        if size is None and not response.is_streamed:
+            # Never for streamed bodies: measuring them would buffer the whole stream.
+            size = response.calculate_content_length()
+
+        self.record(
+            request.endpoint or "<unmatched>",
+            wall_ms,
+            timings.sql_ms,
+            timings.queries,
+            timings.template_ms,
+            size,
+        )
+
+        if self.server_timing:
+            metrics = [
+                f"app;dur={wall_ms:.1f}",
+                f'db;dur={timings.sql_ms:.1f};desc="{timings.queries} queries"',
+            ]
+            if timings.template_ms:
+                metrics.append(f"tpl;dur={timings.template_ms:.1f}")
+            response.headers.add("Server-Timing", ", ".join(metrics))
+        return response
+
+    def record(
+        self,
+        endpoint: str,
+        wall_ms: float,
+        sql_ms: float,
+        queries: int,
+        template_ms: float,
+        size: Optional[int],
+    ):
+        """Adds one request's measurements to the histograms of `endpoint`."""
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = EndpointStats()
+            stats.wall_ms.observe(wall_ms)
+            stats.sql_ms.observe(sql_ms)
+            stats.queries.observe(queries)
+            stats.template_ms.observe(template_ms)
+            if size is not None:
+                stats.response_bytes.observe(size)
+
+    def stats(self) -> dict:
+        """Returns the aggregated histograms of every endpoint seen so far."""
+        with self._lock:
+            return {
+                endpoint: stats.to_dict()
+                for endpoint, stats in sorted(self._endpoints.items())
+            }
+
+    def reset(self):
+        """Discards every aggregated measurement."""
+        with self._lock:
+            self._endpoints.clear()
+
+    # Template signals: Jinja includes render inside a single call, so the
+    # start/finish pairs nest only for explicit nested render_template calls.
+    def _template_started(self, sender, template, context, **extra):
+        timings = current_timings()
+        if timings is not None:
+            timings._template_starts.append(time.perf_counter())
+
+    def _template_finished(self, sender, template, context, **extra):
+        timings = current_timings()
+        if timings is not None and timings._template_starts:
+            started = timings._template_starts.pop()
+            if not timings._template_starts:  # Only count the outermost render
+                timings.template_ms += (time.perf_counter() - started) * 1000
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and current_timings() is not None:
+        context._instrumentation_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # The start time lives on the per-statement execution context, so a failed
+    # statement (which never reaches this hook) leaves nothing behind.
+    started = getattr(context, "_instrumentation_started", None)
+    timings = current_timings()
+    if started is not None and timings is not None:
+        timings.sql_ms += (time.perf_counter() - started) * 1000
+        timings.queries += 1
+
+
+# Shared instrumentation instance, bound to the app in `init_extensions`.
+instrumentation = Instrumentation()
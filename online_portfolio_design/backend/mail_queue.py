@@ -0,0 +1,309 @@
+"""
+This module provides a background delivery queue for outbound email.
+
+Sending mail inside a request holds a gunicorn worker for the whole SMTP
+handshake and turns a slow mail server into a user-facing error. Instead,
+`MailQueue.enqueue` writes the message to a durable SQLite spool and returns
+immediately; a small pool of background threads then delivers it:
+
+    - Each worker thread keeps its SMTP connection open between messages and
+      only reconnects after an error or after `MAIL_QUEUE_IDLE_TIMEOUT` seconds
+      without work.
+    - Failed deliveries are retried with exponential backoff, up to
+      `MAIL_MAX_RETRIES` attempts; after that the message stays in the spool,
+      marked as failed, for inspection.
+    - The spool survives restarts. Messages left over from a previous process
+      (or that did not fit in the bounded in-memory queue) are picked up by the
+      workers' periodic sweep.
+
+Rows are claimed with a lease (`next_attempt_at` is pushed into the future), so
+several gunicorn workers can share one spool without sending a message twice.
+
+For local testing, point `MAIL_SERVER`/`MAIL_PORT` at an SMTP stand-in such as
+`python -m aiosmtpd -n -l localhost:1025`.
+"""
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import ExitStack
+from typing import Optional
+
+from flask import Flask
+from flask_mail import Mail, Message
+
+from backend.metrics import MAIL_DELIVERIES
+from logger import logger
+
+SPOOL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    payload TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    failed INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT
+)
+"""
+
+
+def serialize_message(msg: Message) -> str:
+    """Converts a Flask-Mail message into a JSON string for the spool."""
+    return json.dumps(
+        {
+            "subject": msg.subject,
+            "sender": msg.sender,
+            "recipients": list(msg.recipients),
+            "reply_to": msg.reply_to,
+            "body": msg.body,
+            "html": msg.html,
+        }
+    )
+
+
+def deserialize_message(payload: str) -> Message:
+    """Rebuilds a Flask-Mail message from its spooled JSON form."""
+    return Message(**json.loads(payload))
+
+
+class MailSpool:
+    """A tiny SQLite-backed outbox. Each call opens its own connection, so it is thread-safe."""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")  # Readers don't block the writer
+            connection.execute(SPOOL_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=10)
+
+    def add(self, payload: str) -> int:
+        """Stores a new message, due immediately, and returns its ID."""
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "INSERT INTO outbox (payload, next_attempt_at) VALUES (?, ?)",
+                (payload, time.time()),
+            )
+            return cursor.lastrowid
+
+    def due(self, limit: int) -> list:
+        """Returns the IDs of messages whose next attempt is due."""
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT id FROM outbox WHERE failed = 0 AND next_attempt_at <= ? "
+                "ORDER BY id LIMIT ?",
+                (time.time(), limit),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def claim(self, message_id: int, lease: float) -> Optional[tuple]:
+        """
+        Leases a due message to the caller for `lease` seconds.
+
+        Returns:
+            tuple: `(payload, attempts)`, or None if the message is not due or
+            another worker already holds it.
+        """
+        now = time.time()
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "UPDATE outbox SET next_attempt_at = ? "
+                "WHERE id = ? AND failed = 0 AND next_attempt_at <= ?",
+                (now + lease, message_id, now),
+            )
+            if cursor.rowcount != 1:
+                return None
+            return connection.execute(
+                "SELECT payload, attempts FROM outbox WHERE id = ?", (message_id,)
+            ).fetchone()
+
+    def delete(self, message_id: int):
+        """Removes a delivered message."""
+        with self._connect() as connection:
+            connection.execute("DELETE FROM outbox WHERE id = ?", (message_id,))
+
+    def reschedule(self, message_id: int, attempts: int, delay: float, error: str):
+        """Records a failed attempt and schedules the next one `delay` seconds from now."""
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE outbox SET attempts = ?, next_attempt_at = ?, last_error = ? "
+                "WHERE id = ?",
+                (attempts, time.time() + delay, error, message_id),
+            )
+
+    def fail(self, message_id: int, attempts: int, error: str):
+        """Marks a message as permanently failed; it is kept for inspection."""
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE outbox SET attempts = ?, failed = 1, last_error = ? WHERE id = ?",
+                (attempts, error, message_id),
+            )
+
+
+class SmtpSession:
+    """Holds one reusable SMTP connection for a single worker thread."""
+
+    def __init__(self, mail: Mail):
+        self.mail = mail
+        self.connection = None
+        self.last_used = 0.0
+        self._stack = ExitStack()
+
+    def send(self, msg: Message):
+        """Sends a message, opening the SMTP connection first if needed."""
+        if self.connection is None:
+            self.connection = self._stack.enter_context(self.mail.connect())
+        self.connection.send(msg)
+        self.last_used = time.monotonic()
+
+    def close(self):
+        """Closes the connection (if open); the next send reconnects."""
+        try:
+            self._stack.close()
+        except Exception:
+            pass  # QUIT on a broken connection can fail; it is being dropped anyway
+        self.connection = None
+
+
+class MailQueue:
+    """
+    Delivers Flask-Mail messages from a durable spool on background threads.
+
+    The worker threads are started lazily, in the process that serves requests,
+    so that gunicorn's forked workers each get their own threads.
+    """
+
+    def __init__(self, mail: Mail):
+        self.mail = mail
+        self.app: Optional[Flask] = None
+        self.spool: Optional[MailSpool] = None
+        self.enabled = True
+        self._queue: Optional[queue.Queue] = None
+        self._threads = []
+        self._stop = threading.Event()
+        self._pid: Optional[int] = None
+        self._start_lock = threading.Lock()
+
+    def init_app(self, app: Flask):
+        """
+        Configures the queue from the application settings.
+
+        Args:
+            app: The Flask application instance.
+        """
+        self.app = app
+        self.enabled = app.config.get("MAIL_QUEUE_ENABLED", True)
+        self.workers = app.config.get("MAIL_QUEUE_WORKERS", 2)
+        self.maxsize = app.config.get("MAIL_QUEUE_MAXSIZE", 100)
+        self.max_retries = app.config.get("MAIL_MAX_RETRIES", 5)
+        self.retry_backoff = app.config.get("MAIL_RETRY_BACKOFF", 2.0)
+        self.lease = app.config.get("MAIL_SPOOL_LEASE", 120)
+        self.poll_interval = app.config.get("MAIL_QUEUE_POLL_INTERVAL", 5.0)
+        self.idle_timeout = app.config.get("MAIL_QUEUE_IDLE_TIMEOUT", 30.0)
+        if self.enabled:
+            self.spool = MailSpool(app.config["MAIL_SPOOL_PATH"])
+            # Start the workers on the first request, to recover spooled mail after a restart.
+            app.before_request(self._ensure_started)
+        app.extensions["mail_queue"] = self
+
+    def enqueue(self, msg: Message) -> Optional[int]:
+        """
+        Spools a message for background delivery and returns its spool ID.
+
+        When the queue is disabled (`MAIL_QUEUE_ENABLED = False`) the message
+        is sent synchronously instead, and None is returned.
+        """
+        if not self.enabled:
+            self.mail.send(msg)
+            MAIL_DELIVERIES.labels("sent").inc()
+            return None
+
+        message_id = self.spool.add(serialize_message(msg))
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(message_id)
+        except queue.Full:
+            # Still safe in the spool; the workers' next sweep will pick it up.
+            logger.warning(f"Mail queue full; message {message_id} left for the sweep")
+        return message_id
+
+    def _ensure_started(self):
+        """Starts the worker threads once per process (including after a fork)."""
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue(maxsize=self.maxsize)
+            self._stop.clear()
+            self._threads = [
+                threading.Thread(
+                    target=self._work, name=f"mail-queue-{number}", daemon=True
+                )
+                for number in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+            self._pid = os.getpid()
+
+    def stop(self, timeout: float = 10):
+        """Signals the workers to finish their current message and waits for them."""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._pid = None
+
+    def _work(self):
+        """Worker loop: deliver queued IDs, sweeping the spool whenever the queue is idle."""
+        with self.app.app_context():
+            session = SmtpSession(self.mail)
+            while not self._stop.is_set():
+                try:
+                    message_ids = [self._queue.get(timeout=self.poll_interval)]
+                except queue.Empty:
+                    message_ids = self.spool.due(limit=self.maxsize)
+
+                if (
+                    not message_ids
+                    and time.monotonic() - session.last_used > self.idle_timeout
+                ):
+                    session.close()  # Don't hold an idle SMTP session open
+
+                for message_id in message_ids:
+                    claimed = self.spool.claim(message_id, self.lease)
+                    if claimed is None:
+                        continue  # Already delivered or taken by another worker
+                    if not self._deliver(session, message_id, *claimed):
+                        session.close()  # Reconnect after any failure
+            session.close()
+
+    def _deliver(
+        self, session: SmtpSession, message_id: int, payload: str, attempts: int
+    ) -> bool:
+        """Sends one claimed message, updating the spool. Returns True on success."""
+        try:
+            session.send(deserialize_message(payload))
+        except Exception as e:
+            attempts += 1
+            if attempts >= self.max_retries:
+                self.spool.fail(message_id, attempts, str(e))
+                MAIL_DELIVERIES.labels("failed").inc()
+                logger.error(f"Giving up on mail {message_id} after {attempts} attempts: {e}")
+            else:
+                delay = self.retry_backoff * 2 ** (attempts - 1)
+                self.spool.reschedule(message_id, attempts, delay, str(e))
+                MAIL_DELIVERIES.labels("retry").inc()
+                logger.warning(f"Mail {message_id} failed ({e}); retrying in {delay:.1f}s")
+            return False
+
+        self.spool.delete(message_id)
+        MAIL_DELIVERIES.labels("sent").inc()
+        logger.info(f"Delivered mail {message_id}")
+        return True
@@ -0,0 +1,193 @@
+"""
+This module provides helpers for working with stored HTML content.
+
+`truncate_html` turns a block of HTML into a short, text-only teaser. It can
+either build a full BeautifulSoup tree, or stream the markup through the
+standard library's `HTMLParser` and stop as soon as enough text has been seen,
+which avoids parsing (and allocating) the rest of a long document.
+`html_to_text` returns the whole text, e.g. for the search index.
+
+Dependencies:
+    - beautifulsoup4
+"""
+
+from html.parser import HTMLParser
+from bs4 import BeautifulSoup  # Import BeautifulSoup for parsing HTML and XML
+from bs4.builder import HTMLTreeBuilder
+from bs4.dammit import EntitySubstitution
+
+# The streaming mode follows BeautifulSoup's own rules (see also the entity
+# handling in `_TextCollector`), so both modes agree:
+# elements whose strings get_text() skips (<script>, <style>, <template>, ...),
+_NON_TEXT_TAGS = frozenset(HTMLTreeBuilder.DEFAULT_STRING_CONTAINERS)
+# elements inside which whitespace-only text is kept as it is,
+_PRESERVE_WHITESPACE_TAGS = frozenset(HTMLTreeBuilder.DEFAULT_PRESERVE_WHITESPACE_TAGS)
+# elements that never have content (<br>, <img>, ...),
+_VOID_TAGS = frozenset(HTMLTreeBuilder.DEFAULT_EMPTY_ELEMENT_TAGS)
+# and the whitespace collapsed in text made only of whitespace.
+_ASCII_SPACES = " \n\t\f\r"
+
+# Characters of markup fed to the streaming parser at a time.
+_CHUNK_SIZE = 1024
+
+
+class _BudgetReached(Exception):
+    """Raised by `_TextCollector` to stop parsing once the budget is filled."""
+
+
+class _TextCollector(HTMLParser):
+    """
+    Collects the text content of HTML, up to `budget` characters.
+
+    It keeps a stack of open elements and treats the text between two pieces of
+    markup as one string, the way BeautifulSoup builds its tree, so the result
+    matches `get_text()`: a string made only of whitespace becomes a single
+    newline or space (except inside <pre> and <textarea>), and the strings of
+    <script>, <style> and <template> elements are skipped.
+    """
+
+    def __init__(self, budget: int):
+        # References are decoded here rather than by HTMLParser, whose rules for
+        # unknown and unterminated ones differ from BeautifulSoup's.
+        super().__init__(convert_charrefs=False)
+        self.budget = budget
+        self.parts = []
+        self.collected = 0
+        self._pending = []  # Text seen since the last piece of markup
+        self._open_tags = []  # Names of the currently open elements, outermost first
+        self._closed_void_tags = []  # <br>-style tags whose redundant </br> is ignored
+
+    def handle_starttag(self, tag, attrs):
+        self._end_string()
+        if tag in _VOID_TAGS:
+            self._closed_void_tags.append(tag)
+        else:
+            self._open_tags.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self._end_string()  # Self-closing: nothing to open or close
+
+    def handle_endtag(self, tag):
+        if tag in self._closed_void_tags:
+            self._closed_void_tags.remove(tag)  # The </br> of a <br>: not markup at all
+            return
+        self._end_string()
+        if tag in self._open_tags:
+            # Closing an element also closes everything opened inside it.
+            del self._open_tags[len(self._open_tags) - self._open_tags[::-1].index(tag) - 1 :]
+
+    def handle_data(self, data):
+        self._pending.append(data)
+
+    def handle_entityref(self, name):
+        # An unknown name is kept as literal text, without its semicolon.
+        self._pending.append(EntitySubstitution.HTML_ENTITY_TO_CHARACTER.get(name, f"&{name}"))
+
+    def handle_charref(self, name):
+        # Decoded as the HTML spec says: NUL, surrogates and numbers beyond Unicode
+        # become U+FFFD, and C1 controls are read as windows-1252 (&#150; is "–").
+        try:
+            code = int(name[1:], 16) if name[:1] in "xX" else int(name)
+        except ValueError:
+            code = 0
+        if code == 0 or code > 0x10FFFF or 0xD800 <= code <= 0xDFFF:
+            character = "\N{REPLACEMENT CHARACTER}"
+        else:
+            character = chr(code)
+            if 0x80 <= code <= 0x9F:
+                try:
+                    character = bytes([code]).decode("windows-1252")
+                except UnicodeDecodeError:  # Not assigned in windows-1252: kept as is
+                    pass
+        self._pending.append(character)
+
+    def handle_comment(self, data):
+        self._end_string()
+
+    def handle_decl(self, decl):
+        self._end_string()
+
+    def handle_pi(self, data):
+        self._end_string()
+
+    def unknown_decl(self, data):
+        self._end_string()
+        if data.startswith("CDATA["):  # <![CDATA[...]]> counts as text
+            self._pending.append(data[len("CDATA[") :])
+            self._end_string(cdata=True)
+
+    def close(self):
+        super().close()
+        self._end_string()
+
+    def _end_string(self, cdata: bool = False):
+        if not self._pending:
+            return
+        text = "".join(self._pending)
+        self._pending = []
+        open_tags = set(self._open_tags)
+        if open_tags & _NON_TEXT_TAGS and not cdata:  # CDATA is text wherever it is
+            return
+        if not text.strip(_ASCII_SPACES) and not open_tags & _PRESERVE_WHITESPACE_TAGS:
+            text = "\n" if "\n" in text else " "
+        self._collect(text)
+
+    def _collect(self, text: str):
+        self.parts.append(text)
+        self.collected += len(text)
+        if self.collected >= self.budget:
+            raise _BudgetReached
+
+    def text(self) -> str:
+        return "".join(self.parts)[: self.budget]
+
+
+def _streamed_text(html: str, length: int) -> str:
+    """Returns the first `length` characters of the text of `html`, parsing no further."""
+    collector = _TextCollector(length)
+    try:
+        for start in range(0, len(html), _CHUNK_SIZE):
+            collector.feed(html[start : start + _CHUNK_SIZE])
+        collector.close()  # Flush text still buffered at the end of the document
+    except _BudgetReached:
+        pass
+    return collector.text()
+
+
+def html_to_text(html: str) -> str:
+    """Returns all the text of an HTML fragment, as BeautifulSoup's `get_text()` would.
+
+    Args:
+        html (str): The HTML content.
+
+    Returns:
+        str: The text, without any markup.
+    """
+    # The text is never longer than the markup, so the budget is never reached.
+    return _streamed_text(html, len(html)) if html else ""
+
+
+def truncate_html(html: str, length: int = 250, streaming: bool = False) -> str:
+    """Truncates HTML content while preserving basic HTML structure.
+
+    Args:
+        html (str): The HTML content to truncate.
+        length (int, optional): The maximum length of the truncated text. Defaults to 250.
+        streaming (bool, optional): Parse incrementally and stop once `length`
+            characters of text have been read, instead of building a full
+            BeautifulSoup tree. Both modes produce the same text. Defaults to False.
+
+    Returns:
+        str: The truncated HTML content.
+    """
+    if streaming:
+        truncated_text = _streamed_text(html, length)
+    else:
+        soup = BeautifulSoup(html, "html.parser")  # use the BEautifulSoup
+        text = soup.get_text()  # use get text command to generate plain text
+        truncated_text = text[:length]  # truncate text to the specified length
+
+    # Re-wrap with <i> tags
+    truncated_html = f"<i>{truncated_text}...</i>"  # wrap truncated text
+
+    return truncated_html
@@ -0,0 +1,202 @@
+"""
+This module exposes Prometheus metrics for the application at `/metrics`.
+
+It covers:
+
+    - request counts and latency histograms per blueprint and endpoint,
+    - 404 responses served by the `page_not_found` handler,
+    - SQLAlchemy connection pool usage (checked-out and overflow connections),
+    - page cache hits and misses,
+    - contact form outcomes and background mail deliveries.
+
+Under gunicorn every worker is a separate process, so the metrics use
+`prometheus_client`'s multiprocess mode: each process writes its samples to
+files in `PROMETHEUS_MULTIPROC_DIR` and a scrape aggregates all of them,
+whichever worker answers it. The variable must be set before this module is
+imported; `gunicorn.conf.py` takes care of that (and of cleaning up after exited
+workers). Without it, the metrics are simply those of the current process.
+
+Metrics are opt-in (`METRICS_ENABLED`), and since they describe the site's
+traffic and internals, the endpoint is only served to scrapers presenting
+`METRICS_TOKEN` as a bearer token (`authorization` in the Prometheus scrape
+config). Without a token configured, the endpoint is not registered at all.
+"""
+
+import hmac
+import os
+import time
+import weakref
+
+from flask import Flask, Response, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from logger import logger
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time spent handling a request.",
+    ["blueprint", "endpoint", "method"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUESTS = Counter(
+    "http_requests_total",
+    "Requests handled, by response status.",
+    ["blueprint", "endpoint", "method", "status"],
+)
+APP_STARTUP = Gauge(
+    "app_startup_seconds",
+    "Time the worker took to import and build the application.",
+    multiprocess_mode="liveall",
+)
+NOT_FOUND = Counter(
+    "http_not_found_total", "Requests answered by the 404 page."
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Database connections currently checked out of the pool.",
+    ["database"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow_connections",
+    "Connections opened beyond the pool size (negative while the pool is filling).",
+    ["database"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUTS = Counter(
+    "db_pool_checkouts_total", "Connections checked out of the pool.", ["database"]
+)
+PAGE_CACHE_LOOKUPS = Counter(
+    "page_cache_lookups_total", "Rendered-page cache lookups.", ["result"]
+)
+CONTACT_SUBMISSIONS = Counter(
+    "contact_submissions_total",
+    "Contact form submissions, by outcome.",
+    ["outcome"],  # queued, invalid, recaptcha_failed or error
+)
+MAIL_DELIVERIES = Counter(
+    "mail_deliveries_total",
+    "Background mail delivery attempts, by outcome.",
+    ["outcome"],  # sent, retry or failed
+)
+
+
+def _database_label(engine: Engine) -> str:
+    """A short, password-free name for an engine's database."""
+    url = engine.url
+    return f"{url.get_backend_name()}:{url.host or os.path.basename(url.database or '')}"
+
+
+class Metrics:
+    """Wires the metrics into the request cycle and serves the `/metrics` endpoint."""
+
+    def __init__(self):
+        self.enabled = False
+        self.token = None
+        self._listening = False
+        self._watched_pools = weakref.WeakSet()
+
+    def init_app(self, app: Flask):
+        """
+        Registers the request hooks, pool listeners and the metrics endpoint.
+
+        Args:
+            app: The Flask application instance.
+        """
+        self.enabled = app.config.get("METRICS_ENABLED", False)
+        self.token = app.config.get("METRICS_TOKEN")
+        if not self.enabled:
+            return
+
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+        # Engines are created lazily, so attach to each pool the first time it is used.
+        if not self._listening:
+            event.listen(Engine, "engine_connect", self._watch_pool)
+            self._listening = True
+        if self.token:
+            app.add_url_rule(
+                app.config.get("METRICS_URL", "/metrics"), "metrics", self.export
+            )
+        else:
+            logger.warning("METRICS_TOKEN is not set; the metrics endpoint is not served")
+        app.extensions["metrics"] = self
+
+    def _start_request(self):
+        g._metrics_started = time.perf_counter()
+
+    def _finish_request(self, response):
+        started = g.get("_metrics_started")
+        if started is None:
+            return response
+        blueprint = request.blueprint or ""
+        endpoint = request.endpoint or "<unmatched>"
+        REQUEST_LATENCY.labels(blueprint, endpoint, request.method).observe(
+            time.perf_counter() - started
+        )
+        REQUESTS.labels(
+            blueprint, endpoint, request.method, str(response.status_code)
+        ).inc()
+        return response
+
+    def _watch_pool(self, connection):
+        pool = connection.engine.pool
+        if pool in self._watched_pools:
+            return
+        self._watched_pools.add(pool)
+        label = _database_label(connection.engine)
+
+        def update(returning: int = 0):
+            # Only QueuePool tracks checkouts and overflow; other pools are skipped.
+            if hasattr(pool, "checkedout"):
+                DB_POOL_CHECKED_OUT.labels(label).set(pool.checkedout() - returning)
+            if hasattr(pool, "overflow"):
+                DB_POOL_OVERFLOW.labels(label).set(pool.overflow())
+
+        def checkout(dbapi_connection, connection_record, connection_proxy):
+            DB_POOL_CHECKOUTS.labels(label).inc()
+            update()
+
+        def checkin(dbapi_connection, connection_record):
+            update(returning=1)  # Fired just before the connection goes back to the pool
+
+        event.listen(pool, "checkout", checkout)
+        event.listen(pool, "checkin", checkin)
+        update()
+
+    def _authorized(self) -> bool:
+        """Checks the request's bearer token against METRICS_TOKEN."""
+        scheme, _, credentials = request.headers.get("Authorization", "").partition(" ")
+        return scheme.lower() == "bearer" and hmac.compare_digest(
+            credentials.strip().encode("utf-8"), self.token.encode("utf-8")
+        )
+
+    def export(self):
+        """Renders every metric in the Prometheus text format, for authorized scrapers."""
+        if not self._authorized():
+            return Response(
+                "Unauthorized",
+                status=401,
+                headers={"WWW-Authenticate": 'Bearer realm="metrics"'},
+            )
+        if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = REGISTRY
+        return Response(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
+
+
+# Shared metrics instance, bound to the app in `init_extensions`.
+metrics = Metrics()
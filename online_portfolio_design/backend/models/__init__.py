@@ -1,9 +1,61 @@
+from datetime import datetime, timezone  # Used for row modification timestamps
 from flask_sqlalchemy import SQLAlchemy  # Import the SQLAlchemy integration for Flask
+from sqlalchemy import JSON
+from sqlalchemy.dialects.postgresql import JSONB
+from backend.models.routing import (
+    RoutingSession,
+)  # Session class that sends read-only queries to read replicas
 
 
 # Initialize the database instance (shared across the application)
 # This creates the database object that will be used to interact with the database.
 # Note: This does not connect to the database yet. The connection is established when
 # the application context is available (e.g., within a route or during initialization).
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 # Create an instance of SQLAlchemy class, and will be bound to the flask app later on in the process.
+# Its session routes GET-request reads to the replicas in DATABASE_REPLICA_URIS, if any.
+
+
+def utcnow() -> datetime:
+    """
+    Returns the current UTC time as a naive datetime.
+
+    Used as the default for `updated_at` columns. Naive UTC keeps the values
+    comparable across SQLite (which has no time zone support) and Postgres.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def json_type(none_as_null: bool = False):
+    """
+    Returns the column type for JSON documents: JSONB on Postgres, and JSON
+    elsewhere (SQLite stores it as text).
+
+    Values are decoded once, when a row is loaded, and encoded when it is
+    written; the model attributes hold plain dicts and lists.
+
+    Args:
+        none_as_null: Store Python None as SQL NULL rather than JSON `null`.
+    """
+    return JSON(none_as_null=none_as_null).with_variant(
+        JSONB(none_as_null=none_as_null), "postgresql"
+    )
+
+
+def split_list(value, separator: str) -> list:
+    """
+    Normalizes a list field given by an API client.
+
+    Args:
+        value: A list of strings, or a single string in the older separated
+            format (e.g. newline-separated points), or None.
+        separator (str): The separator of the string format.
+
+    Returns:
+        list: The entries, in order (empty for None or an empty string).
+    """
+    if value is None or value == "":
+        return []
+    if isinstance(value, str):
+        return value.split(separator)
+    return [str(entry) for entry in value]
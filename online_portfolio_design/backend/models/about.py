@@ -1,5 +1,5 @@
-from backend.models import db  # Import the shared db instance
-from sqlalchemy import Column, Integer, String, ForeignKey
+from backend.models import db, utcnow  # Import the shared db instance
+from sqlalchemy import Column, DateTime, Integer, String, ForeignKey
 from sqlalchemy.orm import relationship
 
 
@@ -23,12 +23,19 @@ class TechnicalSkillCategory(db.Model):
         String(100), nullable=False, unique=True
     )  # Unique category name: enforces that each category has a unique name.
     skills = relationship(
-        "TechnicalSkill", backref="category", lazy=True
+        "TechnicalSkill",
+        backref="category",
+        lazy="selectin",
+        order_by="TechnicalSkill.id",
     )  # One-to-many relationship:  Establishes a relationship with the TechnicalSkill model.
     #   - backref="category": Creates a 'category' attribute on the TechnicalSkill model,
     #     allowing you to access the category from a skill instance.
-    #   - lazy=True:  Specifies that the skills will be loaded only when accessed
-    #     (lazy loading), which can improve performance.
+    #   - lazy="selectin":  Loads the skills of every category returned by a query in one
+    #     extra SELECT ... WHERE category_id IN (...), instead of one SELECT per category.
+    #   - order_by: Keeps the skills in a stable order (the order they were added).
+    updated_at = Column(
+        DateTime, nullable=True, default=utcnow, onupdate=utcnow
+    )  # Last modification time (UTC): set on insert and refreshed on every update.
 
     def __repr__(self):
         return f"<TechnicalSkillCategory(name='{self.name}')>"
@@ -59,6 +66,9 @@ class TechnicalSkill(db.Model):
     )  # Foreign key reference: Links the skill to its category in the TechnicalSkillCategory table.
     #   - ForeignKey("technical_skill_category.id"): Specifies the foreign key relationship
     #     with the 'id' column of the 'technical_skill_category' table.
+    updated_at = Column(
+        DateTime, nullable=True, default=utcnow, onupdate=utcnow
+    )  # Last modification time (UTC): set on insert and refreshed on every update.
 
     def __repr__(self):
         return f"<TechnicalSkill(name='{self.name}', level='{self.level}')>"
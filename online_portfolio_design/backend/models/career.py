@@ -1,5 +1,18 @@
-from backend.models import db  # Import the shared db instance
-from sqlalchemy import Column, Integer, String, Text  # Import necessary column types
+from backend.models import db, split_list, utcnow  # Import the shared db instance
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Integer,
+    String,
+    Text,
+)  # Import necessary column types
+from sqlalchemy.orm import (
+    relationship,
+    validates,
+)  # Child collections, and derived columns kept in step with their source
+from backend.dates import parse_issued_on  # Parses free-form certificate dates
 
 
 # ----------------------------------------------
@@ -26,20 +39,61 @@ class Experience(db.Model):
     duration = Column(
         String(50), nullable=False
     )  # Work duration (e.g., 2020-2023): The period of employment.
-    points = Column(
-        Text, nullable=False
-    )  # Responsibilities or achievements (newline-separated): Key responsibilities and accomplishments.
-    skills = Column(
-        Text, nullable=False
-    )  # Skills used in this job (comma-separated): List of skills used in the job.
+    updated_at = Column(
+        DateTime, nullable=True, default=utcnow, onupdate=utcnow
+    )  # Last modification time (UTC): set on insert and refreshed on every update.
+    point_rows = relationship(
+        "ExperiencePoint",
+        lazy="selectin",
+        order_by="ExperiencePoint.position",
+        cascade="all, delete-orphan",
+    )  # Responsibilities or achievements, one row each (see `points`).
+    skill_rows = relationship(
+        "ExperienceSkill",
+        lazy="selectin",
+        order_by="ExperienceSkill.position",
+        cascade="all, delete-orphan",
+    )  # Skills used in this job, one row each (see `skills`).
+    #   - lazy="selectin": Loads the rows of every experience returned by a query in
+    #     one extra SELECT ... WHERE experience_id IN (...).
+    #   - cascade="all, delete-orphan": Rows are written and deleted with their experience.
+
+    # List fields stored in child tables, with the relationship holding each one.
+    COLLECTIONS = {"points": "point_rows", "skills": "skill_rows"}
+
+    @property
+    def points(self) -> list:
+        """Key responsibilities and accomplishments, in order."""
+        return [row.text for row in self.point_rows]
+
+    @points.setter
+    def points(self, value):
+        # Also accepts the older newline-separated string format.
+        self.point_rows = [
+            ExperiencePoint(position=position, text=text)
+            for position, text in enumerate(split_list(value, ExperiencePoint.SEPARATOR))
+        ]
+
+    @property
+    def skills(self) -> list:
+        """Skills used in the job, in order."""
+        return [row.name for row in self.skill_rows]
+
+    @skills.setter
+    def skills(self, value):
+        # Also accepts the older comma-separated string format.
+        self.skill_rows = [
+            ExperienceSkill(position=position, name=name)
+            for position, name in enumerate(split_list(value, ExperienceSkill.SEPARATOR))
+        ]
 
     def to_dict(self):
         """
         Convert experience object to dictionary format for JSON serialization.
 
         This method transforms the database model object into a Python dictionary,
-        making it easy to serialize as JSON for API responses. It also handles
-        the conversion of newline-separated points and comma-separated skills into lists.
+        making it easy to serialize as JSON for API responses. The points and skills
+        come from their child tables, already split into lists.
         """
         return {
             "id": self.id,
@@ -48,18 +102,65 @@ class Experience(db.Model):
             "title": self.title,
             "company": self.company,
             "duration": self.duration,
-            "points": self.points.split(
-                "\n"
-            ),  # Convert newline-separated points into list: Splits the string of points into an array, based on newline character separation
-            "skills": self.skills.split(
-                ", "
-            ),  # Convert comma-separated skills into list:  Splits the string of skills into an array, based on commas.
+            "points": self.points,  # List of responsibilities, in order
+            "skills": self.skills,  # List of skills, in order
         }
 
     def __repr__(self):
         return f"<Experience(title='{self.title}', company='{self.company}')>"
 
 
+class ExperiencePoint(db.Model):
+    """
+    Represents one responsibility or achievement of a work experience entry.
+    """
+
+    __tablename__ = "experience_point"  # Optional: Explicitly define the table name
+
+    id = Column(Integer, primary_key=True)
+    experience_id = Column(
+        Integer, ForeignKey("experience.id", ondelete="CASCADE"), nullable=False, index=True
+    )  # Foreign key reference: The experience this point belongs to.
+    position = Column(
+        Integer, nullable=False
+    )  # Zero-based position of the point within its experience.
+    text = Column(Text, nullable=False)  # The responsibility or achievement.
+
+    PARENT_KEY = "experience_id"  # Column referencing the parent row
+    VALUE_KEY = "text"  # Column holding the list entry
+    SEPARATOR = "\n"  # Separator of the older single-string format
+
+    def __repr__(self):
+        return f"<ExperiencePoint(experience_id='{self.experience_id}', position='{self.position}')>"
+
+
+class ExperienceSkill(db.Model):
+    """
+    Represents one skill used in a work experience entry.
+
+    Skill names are indexed, so finding the roles that used a skill is an index
+    lookup rather than a scan of every experience.
+    """
+
+    __tablename__ = "experience_skill"  # Optional: Explicitly define the table name
+
+    id = Column(Integer, primary_key=True)
+    experience_id = Column(
+        Integer, ForeignKey("experience.id", ondelete="CASCADE"), nullable=False, index=True
+    )  # Foreign key reference: The experience this skill belongs to.
+    position = Column(
+        Integer, nullable=False
+    )  # Zero-based position of the skill within its experience.
+    name = Column(String(100), nullable=False, index=True)  # Skill name (e.g. Python).
+
+    PARENT_KEY = "experience_id"  # Column referencing the parent row
+    VALUE_KEY = "name"  # Column holding the list entry
+    SEPARATOR = ", "  # Separator of the older single-string format
+
+    def __repr__(self):
+        return f"<ExperienceSkill(experience_id='{self.experience_id}', name='{self.name}')>"
+
+
 # ----------------------------------------------
 # Education Model
 # ----------------------------------------------
@@ -86,17 +187,39 @@ class Education(db.Model):
     year = Column(
         String(50), nullable=False
     )  # Graduation year or study duration: Year of graduation, or duration of studying.
-    additional_information = Column(
-        Text, nullable=True
-    )  # Additional info (newline-separated): Further details about the education.
+    updated_at = Column(
+        DateTime, nullable=True, default=utcnow, onupdate=utcnow
+    )  # Last modification time (UTC): set on insert and refreshed on every update.
+    note_rows = relationship(
+        "EducationNote",
+        lazy="selectin",
+        order_by="EducationNote.position",
+        cascade="all, delete-orphan",
+    )  # Further details about the education, one row each (see `additional_information`).
+
+    # List fields stored in child tables, with the relationship holding each one.
+    COLLECTIONS = {"additional_information": "note_rows"}
+
+    @property
+    def additional_information(self) -> list:
+        """Further details about the education, in order."""
+        return [row.text for row in self.note_rows]
+
+    @additional_information.setter
+    def additional_information(self, value):
+        # Also accepts the older newline-separated string format.
+        self.note_rows = [
+            EducationNote(position=position, text=text)
+            for position, text in enumerate(split_list(value, EducationNote.SEPARATOR))
+        ]
 
     def to_dict(self):
         """
         Convert education object to dictionary format for JSON serialization.
 
         This method transforms the database model object into a Python dictionary,
-        making it easy to serialize as JSON for API responses. It also handles
-        the conversion of newline-separated additional information into a list.
+        making it easy to serialize as JSON for API responses. The additional
+        information comes from its child table, already split into a list.
         """
         return {
             "id": self.id,
@@ -104,17 +227,37 @@ class Education(db.Model):
             "degree": self.degree,
             "institution": self.institution,
             "year": self.year,
-            "additional_information": (
-                self.additional_information.split("\n")
-                if self.additional_information
-                else []
-            ),  # Splits the additional information into array, if there is any
+            "additional_information": self.additional_information,  # List of details, in order
         }
 
     def __repr__(self):
         return f"<Education(degree='{self.degree}', institution='{self.institution}')>"
 
 
+class EducationNote(db.Model):
+    """
+    Represents one line of additional information about an education entry.
+    """
+
+    __tablename__ = "education_note"  # Optional: Explicitly define the table name
+
+    id = Column(Integer, primary_key=True)
+    education_id = Column(
+        Integer, ForeignKey("education.id", ondelete="CASCADE"), nullable=False, index=True
+    )  # Foreign key reference: The education entry this note belongs to.
+    position = Column(
+        Integer, nullable=False
+    )  # Zero-based position of the note within its education entry.
+    text = Column(Text, nullable=False)  # The note.
+
+    PARENT_KEY = "education_id"  # Column referencing the parent row
+    VALUE_KEY = "text"  # Column holding the list entry
+    SEPARATOR = "\n"  # Separator of the older single-string format
+
+    def __repr__(self):
+        return f"<EducationNote(education_id='{self.education_id}', position='{self.position}')>"
+
+
 # ----------------------------------------------
 # Certificate Model
 # ----------------------------------------------
@@ -141,6 +284,12 @@ class Certificate(db.Model):
     date = Column(
         String(20), nullable=False
     )  # Date of completion: The date when the certificate was issued.
+    issued_on = Column(
+        Date, nullable=True, index=True
+    )  # `date` parsed once on write, so the database can sort by it (NULL if unparseable).
+    updated_at = Column(
+        DateTime, nullable=True, default=utcnow, onupdate=utcnow
+    )  # Last modification time (UTC): set on insert and refreshed on every update.
 
     def to_dict(self):
         """
@@ -157,5 +306,14 @@ class Certificate(db.Model):
             "date": self.date,
         }
 
+    # Derived from `date`; never written directly through the APIs.
+    DERIVED_FIELDS = ("issued_on",)
+
+    @validates("date")
+    def _parse_date(self, key, value):
+        """Keeps `issued_on` in step whenever `date` is assigned."""
+        self.issued_on = parse_issued_on(value) if value else None
+        return value
+
     def __repr__(self):
         return f"<Certificate(title='{self.title}', institution='{self.institution}')>"
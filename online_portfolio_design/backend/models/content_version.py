@@ -0,0 +1,31 @@
+from backend.models import db, utcnow  # Import the shared db instance
+from sqlalchemy import Column, DateTime, Integer, String  # Import necessary column types
+
+
+# ----------------------------------------------
+# Content Version Model
+# ----------------------------------------------
+class ContentVersion(db.Model):
+    """
+    Tracks a monotonically increasing version number for each content table.
+
+    A table's row is bumped in the same transaction as every write to that table
+    (see `backend.models.events`), so the version changes on inserts, updates
+    and deletes alike, and every worker process sees the same value. ETags and
+    Last-Modified headers are derived from it without loading any content rows.
+    """
+
+    __tablename__ = "content_version"  # Optional: Explicitly define the table name
+
+    table_name = Column(
+        String(100), primary_key=True
+    )  # Name of the tracked table (e.g., "project").
+    version = Column(
+        Integer, nullable=False, default=0
+    )  # Number of committed writes seen for the table.
+    updated_at = Column(
+        DateTime, nullable=False, default=utcnow
+    )  # Time of the most recent write (UTC), including deletes.
+
+    def __repr__(self):
+        return f"<ContentVersion(table_name='{self.table_name}', version={self.version})>"
@@ -0,0 +1,81 @@
+"""
+This module tracks which database tables change inside a session and announces
+them once the surrounding transaction commits.
+
+Caches and indexes elsewhere in the application subscribe to the
+`content_changed` signal instead of hooking every write endpoint by hand, so
+they are invalidated exactly when (and only when) new data becomes visible.
+
+Every flush also bumps the matching rows of the `content_version` table inside
+the same transaction, giving all worker processes a shared, per-table version
+to derive ETags and Last-Modified headers from.
+"""
+
+from blinker import Namespace  # Blinker powers Flask's own signals
+from sqlalchemy import event, insert, update
+from backend.models import db, utcnow  # Import the shared db instance
+from backend.models.content_version import ContentVersion
+
+_signals = Namespace()
+
+# Sent after a successful commit with `tables`, a frozenset of the table names
+# that were inserted into, updated or deleted from during the transaction.
+content_changed = _signals.signal("content-changed")
+
+
+def mark_changed(session, *tables: str):
+    """
+    Records tables as modified for the current transaction of `session`.
+
+    The flush listener below finds ORM objects on its own; this is for writes
+    it cannot see, such as bulk statements or raw SQL.
+    """
+    session.info.setdefault("changed_tables", set()).update(tables)
+    _bump_versions(session, tables)
+
+
+def _bump_versions(session, tables):
+    """Increments the content version of each table within the open transaction."""
+    versions = ContentVersion.__table__
+    now = utcnow()
+    connection = session.connection()
+    for name in tables:
+        result = connection.execute(
+            update(versions)
+            .where(versions.c.table_name == name)
+            .values(version=versions.c.version + 1, updated_at=now)
+        )
+        if result.rowcount == 0:
+            # First write to a table the schema upgrade has not seeded yet.
+            connection.execute(
+                insert(versions).values(table_name=name, version=1, updated_at=now)
+            )
+
+
+@event.listens_for(db.session, "after_flush")
+def _record_flushed_tables(session, flush_context):
+    """Collects the tables touched by ORM objects in this flush."""
+    flushed = set()
+    for obj in session.new | session.deleted:
+        flushed.add(obj.__table__.name)
+    for obj in session.dirty:
+        if session.is_modified(obj, include_collections=False):
+            # Only count objects that actually had column changes.
+            flushed.add(obj.__table__.name)
+    if flushed:
+        session.info.setdefault("changed_tables", set()).update(flushed)
+        _bump_versions(session, flushed)
+
+
+@event.listens_for(db.session, "after_commit")
+def _announce_committed_tables(session):
+    """Sends `content_changed` once the transaction's writes are durable."""
+    tables = session.info.pop("changed_tables", None)
+    if tables:
+        content_changed.send(session, tables=frozenset(tables))
+
+
+@event.listens_for(db.session, "after_rollback")
+def _discard_rolled_back_tables(session):
+    """Forgets pending changes, since a rollback means nothing was written."""
+    session.info.pop("changed_tables", None)
@@ -0,0 +1,242 @@
+"""
+This module brings an existing database schema up to date with the models.
+
+`db.create_all()` only creates tables that do not exist yet; it never alters a
+table that is already there. The helpers below fill that gap with small,
+idempotent upgrade steps that are safe to run repeatedly, against both SQLite
+and Postgres. They run with `flask init-db` (see `backend.commands`).
+"""
+
+import json
+from sqlalchemy import JSON, Text, cast, inspect, insert, select, update
+from backend.dates import parse_issued_on  # Parses free-form certificate dates
+from backend.models import db, split_list, utcnow  # Import the shared db instance
+from backend.models.career import Certificate, Education, Experience
+from backend.models.content_version import ContentVersion
+from backend.models.projects import Overview, Project, ProjectTechnology, sync_technologies
+from logger import logger
+
+
+def add_missing_columns():
+    """
+    Adds model columns that are missing from existing tables.
+
+    New columns are always added as NULL-able, regardless of the model, since
+    existing rows have no value for them yet.
+    """
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+
+    with db.engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue  # Created from scratch by db.create_all()
+            existing_columns = {
+                column["name"] for column in inspector.get_columns(table.name)
+            }
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                column_type = column.type.compile(dialect=db.engine.dialect)
+                connection.exec_driver_sql(
+                    f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+                )
+                logger.info(f"Added column {table.name}.{column.name}")
+
+
+def add_missing_indexes():
+    """Creates model indexes that are missing from existing tables."""
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+
+    with db.engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue  # Created from scratch (with its indexes) by db.create_all()
+            existing_indexes = {
+                index["name"] for index in inspector.get_indexes(table.name)
+            }
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(connection)
+                    logger.info(f"Created index {index.name}")
+
+
+def backfill_certificate_dates():
+    """Parses `date` into `issued_on` for certificates written before the column existed."""
+    certificates = Certificate.__table__
+    with db.engine.begin() as connection:
+        rows = connection.execute(
+            select(certificates.c.id, certificates.c.date).where(
+                certificates.c.issued_on.is_(None)
+            )
+        ).all()
+        for certificate_id, date_string in rows:
+            issued_on = parse_issued_on(date_string) if date_string else None
+            if issued_on is not None:  # Unparseable dates stay NULL and sort last
+                connection.execute(
+                    update(certificates)
+                    .where(certificates.c.id == certificate_id)
+                    .values(issued_on=issued_on)
+                )
+
+
+def _unwrap_json(value):
+    """
+    Unwraps a value that older releases JSON-encoded more than once (e.g. the
+    old project update endpoint), so it ends up as a string holding JSON.
+    """
+    while isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            break  # A genuine string value
+    return value
+
+
+def normalize_json_columns():
+    """
+    Converts the JSON documents that older releases stored as text.
+
+    `Overview.overview_data` and `Project.technical_details` used to be Text
+    columns holding `json.dumps()` output. Every value is decoded (unwrapping
+    double-encoded ones) and written back through the JSON column type;
+    invalid technical details become NULL. On Postgres, the columns are then
+    converted to JSONB.
+    """
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+
+    with db.engine.begin() as connection:
+        for model, column_name in (
+            (Overview, "overview_data"),
+            (Project, "technical_details"),
+        ):
+            table = model.__table__
+            if table.name not in existing_tables:
+                continue
+            column = table.c[column_name]
+            rows = connection.execute(
+                select(table.c.id, cast(column, Text)).where(column.is_not(None))
+            ).all()
+            for row_id, raw in rows:
+                try:
+                    stored = json.loads(raw)
+                except ValueError:
+                    if not column.nullable:
+                        logger.warning(f"Left invalid JSON in {table.name} {row_id}")
+                        continue
+                    stored = None
+                value = _unwrap_json(stored)
+                if value is None and not column.nullable:
+                    continue
+                if value == stored and value is not None:
+                    continue  # Already a single, plain JSON document
+                connection.execute(
+                    update(table).where(table.c.id == row_id).values({column_name: value})
+                )
+                logger.info(f"Normalized {table.name}.{column_name} for row {row_id}")
+
+            if db.engine.dialect.name == "postgresql":
+                reflected = {
+                    reflected_column["name"]: reflected_column["type"]
+                    for reflected_column in inspector.get_columns(table.name)
+                }
+                if not isinstance(reflected.get(column_name), JSON):
+                    connection.exec_driver_sql(
+                        f"ALTER TABLE {table.name} ALTER COLUMN {column_name} "
+                        f"TYPE JSONB USING {column_name}::jsonb"
+                    )
+                    logger.info(f"Converted {table.name}.{column_name} to JSONB")
+
+
+def split_legacy_list_columns():
+    """
+    Moves the list fields that older releases kept in separated Text columns
+    (`experience.points`, `experience.skills` and `education.additional_information`)
+    into their child tables, then drops the old columns.
+    """
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+
+    with db.engine.begin() as connection:
+        for model in (Experience, Education):
+            table = model.__table__
+            if table.name not in existing_tables:
+                continue
+            existing_columns = {
+                column["name"] for column in inspector.get_columns(table.name)
+            }
+            for field, relationship in model.COLLECTIONS.items():
+                if field not in existing_columns:
+                    continue  # Already migrated, or created without it
+                child = getattr(model, relationship).property.mapper.class_
+                rows = connection.exec_driver_sql(
+                    f"SELECT id, {field} FROM {table.name}"
+                ).all()
+                entries = [
+                    {child.PARENT_KEY: row_id, "position": position, child.VALUE_KEY: entry}
+                    for row_id, value in rows
+                    for position, entry in enumerate(split_list(value, child.SEPARATOR))
+                ]
+                if entries:
+                    connection.execute(insert(child), entries)
+                # Same transaction as the copy, so the data is never lost half way.
+                connection.exec_driver_sql(f"ALTER TABLE {table.name} DROP COLUMN {field}")
+                logger.info(
+                    f"Moved {table.name}.{field} into {child.__tablename__} ({len(entries)} rows)"
+                )
+
+
+def backfill_project_technologies():
+    """Derives the `project_technology` rows of projects written before the table existed."""
+    technologies = ProjectTechnology.__table__
+    projects = Project.__table__
+    with db.engine.begin() as connection:
+        project_ids = connection.execute(
+            select(projects.c.id).where(
+                projects.c.technical_details.is_not(None),
+                projects.c.id.not_in(select(technologies.c.project_id)),
+            )
+        ).scalars().all()
+        sync_technologies(connection, project_ids)
+
+
+def create_search_index():
+    """Creates the full-text search tables if needed, and re-indexes every document."""
+    # Imported here: the search module depends on the models this module upgrades.
+    from backend.search import search_index
+
+    search_index.create_tables()
+    count = search_index.rebuild()
+    logger.info(f"Indexed {count} documents for search")
+
+
+def seed_content_versions():
+    """Creates a `content_version` row for every content table that lacks one."""
+    versions = ContentVersion.__table__
+    with db.engine.begin() as connection:
+        seeded = set(connection.execute(select(versions.c.table_name)).scalars())
+        for table in db.metadata.sorted_tables:
+            if table.name == versions.name or table.name in seeded:
+                continue
+            connection.execute(
+                insert(versions).values(
+                    table_name=table.name, version=0, updated_at=utcnow()
+                )
+            )
+
+
+def upgrade_schema():
+    """
+    Runs every upgrade step in order. Must be called within an application context,
+    after `db.create_all()`.
+    """
+    add_missing_columns()
+    add_missing_indexes()
+    backfill_certificate_dates()
+    normalize_json_columns()
+    split_legacy_list_columns()
+    backfill_project_technologies()
+    create_search_index()
+    seed_content_versions()
@@ -1,6 +1,20 @@
-from backend.models import db  # Import the shared db instance
-from sqlalchemy import Column, Integer, String, Text  # Import necessary column types
-import json  # Import the json module for working with JSON data
+from backend.models import db, json_type, utcnow  # Import the shared db instance
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    delete,
+    insert,
+    select,
+)  # Import necessary column types and statements
+from sqlalchemy.orm import (
+    relationship,
+    validates,
+)  # Derived technology rows, kept in step with the technical details
 
 
 # ----------------------------------------------
@@ -21,23 +35,24 @@ class Overview(db.Model):
     # Unique identifier for the overview entry.
 
     overview_data = Column(
-        Text, nullable=False
-    )  # JSON string containing overview data: Stores the overview information as a JSON string.
+        json_type(), nullable=False
+    )  # Overview data: Stores the overview information as a JSON document (JSONB on Postgres).
     # The actual content to be displayed.
+    updated_at = Column(
+        DateTime, nullable=True, default=utcnow, onupdate=utcnow
+    )  # Last modification time (UTC): set on insert and refreshed on every update.
 
     def to_dict(self):
         """
         Convert overview object to dictionary format for JSON serialization.
 
         This method converts the database model object into a Python dictionary,
-        making it easy to serialize as JSON for API responses.  It also deserializes
-        the JSON string stored in the `overview_data` field.
+        making it easy to serialize as JSON for API responses. The `overview_data`
+        field is already decoded, since it is stored as a JSON document.
         """
         return {
             "id": self.id,
-            "overview_data": json.loads(
-                self.overview_data
-            ),  # Deserialize JSON string:  Loads the JSON data from the `overview_data` field.
+            "overview_data": self.overview_data,
         }
 
     def __repr__(self):
@@ -73,48 +88,152 @@ class Project(db.Model):
         String(200), nullable=True
     )  # Live demo link (optional):  Link to a live demo of the project.
     technical_details = Column(
-        Text, nullable=True
-    )  # JSON-encoded technical details: Technical specifications.
+        json_type(none_as_null=True), nullable=True
+    )  # Technical details as a JSON document (JSONB on Postgres): Technical specifications.
     key_learnings = Column(
         Text, nullable=False
     )  # Key takeaways from the project: Learnings while working on it.
     status = Column(
-        String(50), nullable=False
+        String(50), nullable=False, index=True
     )  # Project status (e.g., Completed, In Progress): current status of the project.
     demonstration = Column(
         String(500), nullable=True
     )  # Link to a demonstration video or article: URL link.
-
-    def to_dict(self):
+    updated_at = Column(
+        DateTime, nullable=True, default=utcnow, onupdate=utcnow
+    )  # Last modification time (UTC): set on insert and refreshed on every update.
+    technology_rows = relationship(
+        "ProjectTechnology",
+        cascade="all, delete-orphan",
+    )  # The technologies listed in `technical_details`, one row each (kept in step on write).
+
+    # Every field exposed by `to_dict`, in serialization order.
+    FIELDS = (
+        "id",
+        "name",
+        "description",
+        "github_link",
+        "project_image",
+        "demo_link",
+        "technical_details",
+        "key_learnings",
+        "status",
+        "demonstration",
+    )
+
+    # Compact projection for list views, which only show a name, image and status.
+    SUMMARY_FIELDS = ("id", "name", "project_image", "status")
+
+    def to_dict(self, fields=None):
         """
         Convert project object to dictionary format for JSON serialization.
 
         This method transforms the database model object into a Python dictionary,
-        making it easy to serialize as JSON for API responses. It also handles
-        deserializing the JSON string stored in the `technical_details` field,
-        with robust error handling to prevent issues if the field contains invalid JSON.
+        making it easy to serialize as JSON for API responses. The
+        `technical_details` field is stored as a JSON document, so it arrives
+        already decoded; a missing value is reported as an empty dict.
+
+        Args:
+            fields: Optional iterable of field names (see `FIELDS`) to include.
+                Only those attributes are read, so fields left out can stay
+                unloaded (e.g. with `load_only`). Defaults to every field.
         """
-        try:
-            technical_details = (
-                json.loads(self.technical_details) if self.technical_details else {}
-            )
-        except (TypeError, json.JSONDecodeError):
-            technical_details = (
-                {}
-            )  # Or handle the error more gracefully: If there's a JSON error, return an empty dictionary rather than crashing.
-
-        return {
-            "id": self.id,
-            "name": self.name,
-            "description": self.description,
-            "github_link": self.github_link,
-            "project_image": self.project_image,
-            "demo_link": self.demo_link,
-            "technical_details": technical_details,
-            "key_learnings": self.key_learnings,
-            "status": self.status,
-            "demonstration": self.demonstration,
-        }
+        data = {}
+        for field in fields or self.FIELDS:
+            if field == "technical_details":
+                data[field] = self.technical_details or {}
+            else:
+                data[field] = getattr(self, field)
+        return data
+
+    @validates("technical_details")
+    def _index_technologies(self, key, value):
+        """Keeps the technology rows in step whenever `technical_details` is assigned."""
+        if value != self.technical_details or not self.technology_rows:
+            self.technology_rows = [
+                ProjectTechnology(category=category, name=name)
+                for category, name in extract_technologies(value)
+            ]
+        return value
 
     def __repr__(self):
         return f"<Project(name='{self.name}', status='{self.status}')>"
+
+
+class ProjectTechnology(db.Model):
+    """
+    Represents one technology listed in a project's technical details.
+
+    The rows are derived from `Project.technical_details` on every write
+    (`{"Languages": ["Python", "Go"]}` gives a row for Python and one for Go),
+    so projects can be filtered and counted by technology with indexed queries
+    instead of decoding every project's JSON.
+    """
+
+    __tablename__ = "project_technology"  # Optional: Explicitly define the table name
+    __table_args__ = (
+        # Covers both "which projects use X" and the per-technology project counts.
+        Index("ix_project_technology_name_project_id", "name", "project_id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    project_id = Column(
+        Integer, ForeignKey("project.id", ondelete="CASCADE"), nullable=False, index=True
+    )  # Foreign key reference: The project listing the technology.
+    category = Column(
+        String(100), nullable=False
+    )  # The technical details key (e.g. Languages).
+    name = Column(String(100), nullable=False)  # The technology (e.g. Python).
+
+    def __repr__(self):
+        return f"<ProjectTechnology(project_id='{self.project_id}', name='{self.name}')>"
+
+
+def extract_technologies(technical_details) -> list:
+    """
+    Lists the technologies of a project's technical details.
+
+    Args:
+        technical_details: The decoded technical details: a dict mapping a
+            category to a technology or a list of them.
+
+    Returns:
+        list: Unique (category, name) pairs, in order.
+    """
+    if not isinstance(technical_details, dict):
+        return []
+    pairs = []
+    for category, value in technical_details.items():
+        for name in value if isinstance(value, list) else [value]:
+            if isinstance(name, (dict, list)) or name is None or name == "":
+                continue  # Only plain values name a technology
+            pair = (str(category)[:100], str(name)[:100])
+            if pair not in pairs:
+                pairs.append(pair)
+    return pairs
+
+
+def sync_technologies(executor, project_ids) -> None:
+    """
+    Rebuilds the technology rows of the given projects from their technical
+    details, for writes that bypass the ORM (bulk statements, migrations).
+
+    Args:
+        executor: A Session or Connection, inside the writing transaction.
+        project_ids: The IDs of the projects to rebuild; IDs of deleted
+            projects just lose their rows.
+    """
+    project_ids = list(project_ids)
+    if not project_ids:
+        return
+    technologies = ProjectTechnology.__table__
+    executor.execute(delete(technologies).where(technologies.c.project_id.in_(project_ids)))
+    rows = [
+        {"project_id": project_id, "category": category, "name": name}
+        for project_id, technical_details in executor.execute(
+            select(Project.id, Project.technical_details).where(Project.id.in_(project_ids))
+        )
+        for category, name in extract_technologies(technical_details)
+    ]
+    if rows:
+        executor.execute(insert(technologies), rows)
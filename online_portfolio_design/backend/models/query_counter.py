@@ -0,0 +1,80 @@
+"""
+This module provides helpers for counting the SQL statements a block of code runs.
+
+They make N+1 query regressions easy to catch: wrap a request in
+`assert_max_queries` and it fails as soon as the number of statements grows
+with the amount of data, e.g.
+
+    with app.app_context(), assert_max_queries(1):
+        client.get("/about")
+
+Note that the page cache and conditional GET layers answer repeat requests
+without touching the database, so disable the page cache
+(`PAGE_CACHE_ENABLED = False`) when measuring a view's own queries.
+"""
+
+from contextlib import contextmanager
+from typing import List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from backend.models import db  # Import the shared db instance
+
+
+class QueryCounter:
+    """Collects every SQL statement executed on an engine while it is attached."""
+
+    def __init__(self):
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        """The number of statements recorded so far."""
+        return len(self.statements)
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        # Signature of the "before_cursor_execute" engine event.
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries(engine: Engine = None):
+    """
+    Counts the statements executed inside the `with` block.
+
+    Args:
+        engine: The engine to observe. Defaults to the application's engine,
+            which requires an application context.
+
+    Yields:
+        QueryCounter: The counter; read `count` or `statements` after the block.
+    """
+    engine = engine if engine is not None else db.engine
+    counter = QueryCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
+
+
+@contextmanager
+def assert_max_queries(expected: int, engine: Engine = None):
+    """
+    Fails with an AssertionError if the block executes more than `expected` statements.
+
+    Args:
+        expected: The maximum number of statements allowed.
+        engine: The engine to observe (defaults to the application's engine).
+    """
+    with count_queries(engine) as counter:
+        yield counter
+    if counter.count > expected:
+        listing = "\n".join(
+            f"  {number}. {statement}"
+            for number, statement in enumerate(counter.statements, start=1)
+        )
+        raise AssertionError(
+            f"Expected at most {expected} queries, got {counter.count}:\n{listing}"
+        )
@@ -0,0 +1,119 @@
+"""
+This module routes read-only queries to read replicas.
+
+Replicas are configured with `DATABASE_REPLICA_URIS` (a comma-separated list),
+which `configure_database` turns into `replica_<n>` binds. `RoutingSession`,
+the class behind `db.session`, then picks an engine for every statement:
+
+    - SELECTs issued while handling a GET or HEAD request go to a replica. A
+      request sticks to the replica it started on, and replicas are taken in
+      turn across requests.
+    - Everything else goes to the primary: writes, flushes, any statement made
+      outside a request (CLI commands, background threads), and every statement
+      of a POST/PUT/PATCH/DELETE request.
+    - Once a request has written, the rest of it reads from the primary as well,
+      so it sees its own writes.
+    - After a commit, the whole process reads from the primary for
+      `DATABASE_REPLICA_LAG_WINDOW` seconds. The page cache and project index are
+      rebuilt right after a commit, and must not be refilled from a replica
+      that has not caught up yet.
+
+To try it locally, copy the SQLite database to a second file and point
+`DATABASE_REPLICA_URIS` at the copy; reads then come from the copy while writes
+land in the original.
+"""
+
+import itertools
+import time
+from typing import List, Optional
+
+from flask import Flask, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+# Bind keys given to the replica engines (replica_1, replica_2, ...).
+REPLICA_BIND_PREFIX = "replica_"
+
+# Request methods whose reads may be served by a replica.
+READ_ONLY_METHODS = frozenset({"GET", "HEAD"})
+
+
+class ReplicaRouter:
+    """Decides, per statement, whether a replica may serve it, and which one."""
+
+    def __init__(self):
+        self.replica_keys: List[str] = []
+        self.lag_window = 5.0
+        self._primary_until = 0.0  # monotonic time until which reads stay on the primary
+        self._turn = itertools.count()
+
+    def init_app(self, app: Flask):
+        """
+        Configures the router from the replica binds and settings of the app.
+
+        Args:
+            app: The Flask application instance.
+        """
+        self.replica_keys = sorted(
+            key
+            for key in (app.config.get("SQLALCHEMY_BINDS") or {})
+            if key.startswith(REPLICA_BIND_PREFIX)
+        )
+        self.lag_window = app.config.get("DATABASE_REPLICA_LAG_WINDOW", 5.0)
+        app.extensions["replica_router"] = self
+
+    def note_write(self):
+        """Keeps every read in this process on the primary while replicas catch up."""
+        self._primary_until = time.monotonic() + self.lag_window
+
+    def stick_to_primary(self):
+        """Sends the remaining statements of the current request to the primary."""
+        if has_request_context():
+            g._db_use_primary = True
+
+    def replica_for_request(self) -> Optional[str]:
+        """Returns the bind key of the replica to read from, or None for the primary."""
+        if (
+            not self.replica_keys
+            or not has_request_context()
+            or request.method not in READ_ONLY_METHODS
+            or g.get("_db_use_primary", False)
+            or time.monotonic() < self._primary_until
+        ):
+            return None
+        key = g.get("_db_replica")
+        if key is None:
+            key = self.replica_keys[next(self._turn) % len(self.replica_keys)]
+            g._db_replica = key
+        return key
+
+
+# Shared router instance, bound to the app in `init_extensions`.
+replica_router = ReplicaRouter()
+
+
+class RoutingSession(Session):
+    """The session behind `db.session`; sends read-only statements to a replica."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            if getattr(clause, "is_select", False) and not self._flushing:
+                key = replica_router.replica_for_request()
+                if key is not None:
+                    return self._db.engines[key]
+            else:
+                # A write (or a flush, or a raw connection): read our own writes from now on.
+                self.info["wrote_to_primary"] = True
+                replica_router.stick_to_primary()
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _start_replica_lag_window(session):
+    if session.info.pop("wrote_to_primary", False):
+        replica_router.note_write()
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _forget_rolled_back_write(session):
+    session.info.pop("wrote_to_primary", None)
@@ -0,0 +1,94 @@
+"""
+This module caches the decoded and truncated projects overview.
+
+The projects page shows the overview twice: as a decoded dict and as a short,
+text-only teaser made by `truncate_html`. Both are derived from
+`Overview.overview_data`, so they are computed once per overview revision (its
+ID and `updated_at`) and reused until the overview changes.
+
+A lookup only reads the revision columns; the (possibly large) overview text is
+loaded and parsed on a miss. Writes in this process drop the entry at once, via
+the `content_changed` signal; a write handled by another worker changes
+`updated_at`, which makes the next lookup here a miss.
+"""
+
+import threading
+from typing import Optional, Tuple
+
+from flask import Flask
+from sqlalchemy import select
+
+from backend.models import db
+from backend.models.events import content_changed
+from backend.models.projects import Overview
+from backend.markup import truncate_html
+
+# Length of the text-only teaser shown above the full overview.
+TEASER_LENGTH = 250
+
+
+class OverviewCache:
+    """Holds the decoded overview and its teaser for the latest overview revision."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._revision: Optional[tuple] = None  # (id, updated_at) of the cached entry
+        self._entry: Tuple[dict, Optional[str]] = ({}, None)
+
+    def init_app(self, app: Flask):
+        """
+        Subscribes the cache to commit notifications.
+
+        Args:
+            app: The Flask application instance.
+        """
+        content_changed.connect(self._on_content_changed, weak=False)
+        app.extensions["overview_cache"] = self
+
+    def invalidate(self):
+        """Drops the cached entry; the next lookup rebuilds it."""
+        with self._lock:
+            self._revision = None
+            self._entry = ({}, None)
+
+    def get(self) -> Tuple[dict, Optional[str]]:
+        """
+        Returns the decoded overview and its truncated teaser. Requires an
+        application context.
+
+        Returns:
+            tuple: The overview dict ({} when there is no overview) and the
+            teaser HTML (None when there is no overview).
+        """
+        revision = db.session.execute(
+            select(Overview.id, Overview.updated_at).order_by(Overview.id).limit(1)
+        ).first()
+        if revision is None:
+            return {}, None
+        revision = tuple(revision)
+
+        with self._lock:
+            if revision == self._revision:
+                return self._entry
+
+        overview = db.session.get(Overview, revision[0])
+        if overview is None:  # Deleted between the two queries
+            return {}, None
+        overview_dict = overview.overview_data  # Decoded by the JSON column type
+        teaser = truncate_html(
+            overview_dict["overview_text"], TEASER_LENGTH, streaming=True
+        )
+        # Store it under the revision actually read, so a concurrent write is never masked.
+        entry = (overview_dict, teaser)
+        with self._lock:
+            self._revision = (overview.id, overview.updated_at)
+            self._entry = entry
+        return entry
+
+    def _on_content_changed(self, sender, tables: frozenset):
+        if Overview.__tablename__ in tables:
+            self.invalidate()
+
+
+# Shared overview cache instance, bound to the app in `init_extensions`.
+overview_cache = OverviewCache()
@@ -0,0 +1,92 @@
+"""
+This module provides keyset (cursor) pagination helpers.
+
+Offset pagination (`LIMIT n OFFSET m`) makes the database walk past every
+skipped row, and Flask-SQLAlchemy's `paginate()` adds a COUNT(*) on top.
+Keyset pagination instead seeks straight to the first row of a page through
+the primary key index (`WHERE id >= :first_id ORDER BY id LIMIT n`), so the
+cost of a page stays flat however large the table grows.
+"""
+
+import base64
+import binascii
+import json
+from typing import List, Optional
+
+from flask_sqlalchemy.pagination import Pagination
+
+
+def encode_cursor(after_id: int) -> str:
+    """Encodes the last ID of a page as an opaque, URL-safe cursor string."""
+    payload = json.dumps({"after_id": after_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Decodes a cursor produced by `encode_cursor`.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return int(payload["after_id"])
+    except (binascii.Error, UnicodeError, KeyError, TypeError, ValueError):
+        raise ValueError("Invalid pagination cursor.")
+
+
+def keyset_page(query, id_column, after_id: Optional[int], limit: int):
+    """
+    Fetches one page of rows with an ID greater than `after_id`.
+
+    Args:
+        query: The base query (e.g. `Project.query`).
+        id_column: The ordered, indexed key column (e.g. `Project.id`).
+        after_id: The last ID of the previous page, or None for the first page.
+        limit: The maximum number of rows to return.
+
+    Returns:
+        tuple: The rows of the page and the cursor of the next page (None when
+        this is the last page).
+    """
+    if after_id is not None:
+        query = query.filter(id_column > after_id)
+    # Fetch one extra row to learn whether another page follows, without a COUNT.
+    rows = query.order_by(id_column).limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(getattr(rows[-1], id_column.key))
+    return rows, None
+
+
+class KeysetPagination(Pagination):
+    """
+    A drop-in replacement for Flask-SQLAlchemy's pagination object that pages
+    through an ordered list of known IDs (such as the project index).
+
+    The ID list gives the first ID of any page and the total without touching
+    the database, so only the page's own rows are queried. Expects `query`,
+    `id_column` and `ids` keyword arguments.
+    """
+
+    def _page_ids(self) -> List[int]:
+        ids = self._query_args["ids"]
+        return ids[self._query_offset : self._query_offset + self.per_page]
+
+    def _query_items(self) -> list:
+        page_ids = self._page_ids()
+        if not page_ids:
+            return []
+        id_column = self._query_args["id_column"]
+        return (
+            self._query_args["query"]
+            .filter(id_column >= page_ids[0])
+            .order_by(id_column)
+            .limit(self.per_page)
+            .all()
+        )
+
+    def _query_count(self) -> int:
+        return len(self._query_args["ids"])
@@ -0,0 +1,137 @@
+"""
+This module keeps an in-memory index of the existing project IDs.
+
+Route validation (`is_valid_project_route`), pagination bounds and the
+count/last-ID endpoints only need to know which project IDs exist. The index
+answers those questions from memory: it loads every ID with a single query,
+and is reloaded lazily once the `project` table changes.
+
+Like the page cache, the index is per worker process. Each snapshot of it is
+labelled with the `content_version` of the `project` table it was loaded at,
+and is only used while `content_versions` still reports that version, so a
+worker never serves IDs older than the version its ETags advertise, whichever
+process made the write.
+"""
+
+import threading
+from typing import List, NamedTuple, Optional
+
+from flask import Flask
+from sqlalchemy import select
+
+from backend.conditional import content_versions
+from backend.models import db
+from backend.models.content_version import ContentVersion
+from backend.models.projects import Project
+
+# Attempts at reading the IDs without a write being committed in between.
+_LOAD_ATTEMPTS = 3
+
+
+class ProjectIndexSnapshot(NamedTuple):
+    """The project IDs as of one `content_version` of the `project` table."""
+
+    version: int
+    ids: List[int]  # Ascending
+    id_set: frozenset
+
+    def count(self) -> int:
+        """Returns the total number of projects."""
+        return len(self.ids)
+
+    def last_id(self) -> Optional[int]:
+        """Returns the highest project ID, or None if there are no projects."""
+        return self.ids[-1] if self.ids else None
+
+    def contains(self, project_id: int) -> bool:
+        """Checks whether a project with the given ID exists."""
+        return project_id in self.id_set
+
+    def page_count(self, per_page: int) -> int:
+        """Returns the number of pages needed to list every project."""
+        return (self.count() + per_page - 1) // per_page
+
+
+class ProjectIndex:
+    """A sorted list (and set) of every project ID, reloaded when its version changes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot: Optional[ProjectIndexSnapshot] = None
+
+    def init_app(self, app: Flask):
+        """
+        Registers the index with the application.
+
+        Args:
+            app: The Flask application instance.
+        """
+        app.extensions["project_index"] = self
+
+    @staticmethod
+    def _read_version() -> int:
+        return (
+            db.session.execute(
+                select(ContentVersion.version).where(
+                    ContentVersion.table_name == Project.__tablename__
+                )
+            ).scalar()
+            or 0
+        )
+
+    def _load(self) -> ProjectIndexSnapshot:
+        # Writes bump the version in the same transaction, so IDs read between
+        # two identical version reads are exactly those of that version. If the
+        # table keeps changing, the IDs are labelled with the older version,
+        # which makes the next lookup load them again.
+        for _ in range(_LOAD_ATTEMPTS):
+            version = self._read_version()
+            ids = db.session.execute(select(Project.id).order_by(Project.id)).scalars().all()
+            if self._read_version() == version:
+                break
+        snapshot = ProjectIndexSnapshot(version, list(ids), frozenset(ids))
+        with self._lock:
+            if self._snapshot is None or snapshot.version >= self._snapshot.version:
+                self._snapshot = snapshot
+        return snapshot
+
+    def snapshot(self) -> ProjectIndexSnapshot:
+        """
+        Returns the IDs as of the current version of the `project` table,
+        reloading them if that version changed. Requires an application context.
+
+        Answers that must agree with each other (e.g. a count and a version
+        token) should come from one snapshot.
+        """
+        version = content_versions.get((Project.__tablename__,))[Project.__tablename__][0]
+        with self._lock:
+            snapshot = self._snapshot
+        # A snapshot newer than the memoized version was loaded from the
+        # database after it, so it is current too.
+        if snapshot is not None and snapshot.version >= version:
+            return snapshot
+        return self._load()
+
+    def ids(self) -> List[int]:
+        """Returns every project ID in ascending order."""
+        return self.snapshot().ids
+
+    def count(self) -> int:
+        """Returns the total number of projects."""
+        return self.snapshot().count()
+
+    def last_id(self) -> Optional[int]:
+        """Returns the highest project ID, or None if there are no projects."""
+        return self.snapshot().last_id()
+
+    def contains(self, project_id: int) -> bool:
+        """Checks whether a project with the given ID exists."""
+        return self.snapshot().contains(project_id)
+
+    def page_count(self, per_page: int) -> int:
+        """Returns the number of pages needed to list every project."""
+        return self.snapshot().page_count(per_page)
+
+
+# Shared project index instance, bound to the app in `init_extensions`.
+project_index = ProjectIndex()
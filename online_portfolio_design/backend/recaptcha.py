@@ -0,0 +1,177 @@
+"""
+This module provides the reCAPTCHA token verification service.
+
+Verification calls Google's siteverify endpoint on the request path, so it is
+guarded against a slow or failing endpoint:
+
+    - A pooled `requests.Session` keeps connections alive between calls.
+    - Every call has strict connect and read timeouts.
+    - A circuit breaker stops calling the endpoint for `RECAPTCHA_RESET_TIMEOUT`
+      seconds after `RECAPTCHA_FAILURE_THRESHOLD` consecutive failures, so
+      workers fail fast instead of queueing up behind timeouts.
+    - Rejected tokens are remembered for `RECAPTCHA_VERDICT_TTL` seconds, so a
+      duplicate submission of the same token is refused without a second
+      round trip. A token is only valid once, so one that passes is remembered
+      as consumed: replaying it is refused too, as Google itself would.
+
+Failures (timeouts, errors, an open circuit) count as a failed verification.
+Point `RECAPTCHA_VERIFY_URL` at a local fake verifier, or pass a custom
+`session` to `init_app`, to test without reaching Google.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from typing import Optional
+
+import requests
+from cachetools import TTLCache  # Time-aware cache for token verdicts
+from flask import Flask
+from requests.adapters import HTTPAdapter
+
+from logger import logger
+
+GOOGLE_VERIFY_URL = "https://www.google.com/recaptcha/api/siteverify"
+
+
+class CircuitBreaker:
+    """
+    Trips open after a run of consecutive failures and lets a single trial call
+    through once `reset_timeout` seconds have passed.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+
+    def allow(self) -> bool:
+        """Returns True if a call may be attempted right now."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                # Half-open: let one trial through; it re-opens the circuit on failure.
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.warning("reCAPTCHA circuit opened after repeated failures")
+                self._opened_at = time.monotonic()
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._opened_at is not None
+
+
+class RecaptchaVerifier:
+    """Verifies reCAPTCHA tokens through a pooled, timeout-bounded HTTP client."""
+
+    def __init__(self):
+        self.verify_url = GOOGLE_VERIFY_URL
+        self.secret_key: Optional[str] = None
+        self.timeout = (2.0, 3.0)  # (connect, read) seconds
+        self.pool_size = 10
+        self.breaker = CircuitBreaker()
+        self._verdicts = TTLCache(maxsize=1024, ttl=120)  # Rejected or consumed tokens
+        self._lock = threading.Lock()
+        self._session: Optional[requests.Session] = None
+        self._session_pid: Optional[int] = None
+
+    def init_app(self, app: Flask, session: requests.Session = None):
+        """
+        Configures the verifier from the application settings.
+
+        Args:
+            app: The Flask application instance.
+            session: Optional HTTP session to use instead of the pooled default
+                (e.g. one wired to a fake verifier in tests).
+        """
+        self.verify_url = app.config.get("RECAPTCHA_VERIFY_URL", GOOGLE_VERIFY_URL)
+        self.secret_key = app.config.get("RECAPTCHA_PRIVATE_KEY")
+        self.timeout = (
+            app.config.get("RECAPTCHA_CONNECT_TIMEOUT", 2.0),
+            app.config.get("RECAPTCHA_READ_TIMEOUT", 3.0),
+        )
+        self.pool_size = app.config.get("RECAPTCHA_POOL_SIZE", 10)
+        self.breaker = CircuitBreaker(
+            failure_threshold=app.config.get("RECAPTCHA_FAILURE_THRESHOLD", 5),
+            reset_timeout=app.config.get("RECAPTCHA_RESET_TIMEOUT", 30),
+        )
+        self._verdicts = TTLCache(
+            maxsize=1024, ttl=app.config.get("RECAPTCHA_VERDICT_TTL", 120)
+        )
+        if session is not None:
+            self._session, self._session_pid = session, os.getpid()
+        app.extensions["recaptcha"] = self
+
+    @property
+    def session(self) -> requests.Session:
+        """The pooled HTTP session, created once per process (sockets don't survive a fork)."""
+        with self._lock:
+            if self._session is None or self._session_pid != os.getpid():
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1, pool_maxsize=self.pool_size, max_retries=0
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session, self._session_pid = session, os.getpid()
+            return self._session
+
+    def verify(self, token: str) -> bool:
+        """
+        Verifies a reCAPTCHA token.
+
+        Args:
+            token (str): The reCAPTCHA token received from the client-side.
+
+        Returns:
+            bool: True if the verification is successful, False otherwise
+            (including when no private key is configured, the endpoint fails or
+            times out, or the circuit breaker is open).
+        """
+        if not self.secret_key or not token:
+            return False
+
+        key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        with self._lock:
+            verdict = self._verdicts.get(key)
+        if verdict is not None:
+            return verdict
+
+        if not self.breaker.allow():
+            return False
+
+        try:
+            response = self.session.post(
+                self.verify_url,
+                data={"secret": self.secret_key, "response": token},
+                timeout=self.timeout,
+            )
+            response.raise_for_status()  # Raise HTTPError for bad responses (4xx or 5xx)
+            verdict = bool(response.json().get("success", False))
+        except (requests.exceptions.RequestException, ValueError) as e:
+            self.breaker.record_failure()
+            logger.warning(f"reCAPTCHA verification failed: {e}")
+            return False  # Not cached, so a retry after recovery gets a real verdict
+
+        self.breaker.record_success()
+        with self._lock:
+            # Only the first use of a token passes; any later one is rejected.
+            self._verdicts[key] = False
+        return verdict
@@ -1,5 +1,8 @@
 from flask import Blueprint, render_template
+from sqlalchemy.orm import joinedload
 from backend.models.about import TechnicalSkillCategory
+from backend.cache import cached_page  # Serve the rendered page from memory
+from backend.conditional import conditional_get  # Answer revalidations with 304
 from typing import List  # Import for type hinting
 
 # ----- About Page -----
@@ -11,6 +14,8 @@ about_bp = Blueprint("about", __name__, url_prefix="/about")
 @about_bp.route(
     ""
 )  # Maps the root URL ("/") within the Blueprint to the about() function
+@conditional_get("technical_skill_category", "technical_skill")
+@cached_page("technical_skill_category", "technical_skill")
 def about():
     """
     Renders the about page (about.html) with technical skill categories and their skills.
@@ -19,13 +24,22 @@ def about():
     and passes them to the 'about.html' template for rendering.  The template then
     iterates through these categories and displays the associated skills.
 
+    The skills are joined-eager-loaded with their categories, so the page costs a
+    single SELECT no matter how many categories exist.
+
     Returns:
         tuple: A tuple containing:
             - The rendered HTML content of the 'about.html' template (as a string).
             - The HTTP status code 200 (OK), indicating successful retrieval and rendering.
     """
-    # Query the database to retrieve all technical skill categories.
-    categories: List[TechnicalSkillCategory] = TechnicalSkillCategory.query.all()
+    # Query the database to retrieve all technical skill categories, with their skills.
+    categories: List[TechnicalSkillCategory] = (
+        TechnicalSkillCategory.query.options(
+            joinedload(TechnicalSkillCategory.skills)
+        )
+        .order_by(TechnicalSkillCategory.id)
+        .all()
+    )
     # Use type hinting to indicate that 'categories' is a list of TechnicalSkillCategory objects.
 
     # Render the 'about.html' template, passing the skill categories as 'skills_data'.
@@ -0,0 +1,328 @@
+"""
+This module implements the batch (bulk) write endpoints shared by the projects
+and career blueprints.
+
+A batch is a JSON array of records, or an NDJSON stream (one JSON object per
+line, sent with `Content-Type: application/x-ndjson`). Each record carries an
+`op` of "create", "update" or "delete" (defaulting to "update" when an `id` is
+given and "create" otherwise) plus the model fields to write.
+
+Every record is validated before anything is written. The whole batch is then
+applied with bulk INSERT / UPDATE / DELETE statements in a single transaction
+and committed once, and the response reports a result per record, in input order.
+
+List fields a model keeps in child tables (its `COLLECTIONS`, e.g. an
+experience's points) are written by replacing the child rows of each record
+that sets them.
+"""
+
+import json
+from typing import Callable, List, Optional
+
+from flask import current_app, jsonify, request
+from sqlalchemy import JSON, String, delete, insert, select, update
+
+from backend.models import db, split_list
+from backend.models.events import mark_changed
+from logger import logger
+
+# Maps each supported operation to the status reported for it.
+BULK_OPERATIONS = {"create": "created", "update": "updated", "delete": "deleted"}
+
+
+def read_bulk_records() -> List[dict]:
+    """
+    Reads the batch from the request body, as a JSON array or NDJSON lines.
+
+    Raises:
+        ValueError: If the body is not valid JSON / NDJSON or not a list of objects.
+    """
+    if request.mimetype in ("application/x-ndjson", "application/ndjson"):
+        records = []
+        for number, line in enumerate(request.stream, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON on line {number}: {e.msg}.")
+    else:
+        records = request.get_json(silent=True)
+        if records is None:
+            raise ValueError("Request body must be a JSON array or NDJSON.")
+
+    if not isinstance(records, list) or not all(
+        isinstance(record, dict) for record in records
+    ):
+        raise ValueError("Request body must be a list of JSON objects.")
+    return records
+
+
+def collections(model) -> dict:
+    """Returns the list fields `model` keeps in child tables, mapped to the child model."""
+    return {
+        field: getattr(model, relationship).property.mapper.class_
+        for field, relationship in getattr(model, "COLLECTIONS", {}).items()
+    }
+
+
+def writable_fields(model) -> set:
+    """Returns the fields a batch may set: every column except the key, timestamps and derived columns, plus the list fields."""
+    derived = set(getattr(model, "DERIVED_FIELDS", ()))
+    return {
+        column.name
+        for column in model.__table__.columns
+        if not column.primary_key
+        and column.name != "updated_at"
+        and column.name not in derived
+    } | set(collections(model))
+
+
+def required_fields(model) -> set:
+    """Returns the columns a "create" record must provide (NOT NULL, no default)."""
+    return {
+        column.name
+        for column in model.__table__.columns
+        if not column.nullable and not column.primary_key and column.default is None
+    }
+
+
+def is_id(value) -> bool:
+    """Checks that a record ID is an integer (JSON true/false are not IDs)."""
+    return type(value) is int
+
+
+def check_value(column, value) -> Optional[str]:
+    """Returns an error message if `value` cannot be written to `column`, or None."""
+    if value is None or isinstance(column.type, JSON):
+        return None  # NULL is checked separately; a JSON column takes any JSON value
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return None
+    if python_type is bool:
+        valid = isinstance(value, bool)
+    elif python_type is int:
+        valid = type(value) is int
+    elif python_type is float:
+        valid = type(value) in (int, float)
+    elif python_type is str:
+        valid = isinstance(value, str)
+    else:
+        return None
+    if not valid:
+        return f"Field '{column.name}' must be of type {python_type.__name__}."
+    length = getattr(column.type, "length", None)
+    if isinstance(column.type, String) and length and len(value) > length:
+        return f"Field '{column.name}' must be at most {length} characters long."
+    return None
+
+
+def validate_record(record: dict, model, existing_ids: set) -> Optional[str]:
+    """Returns an error message for an invalid record, or None if it is valid."""
+    op = record["op"]
+    if not isinstance(op, str) or op not in BULK_OPERATIONS:
+        return f"Unknown op '{op}'; expected one of {', '.join(BULK_OPERATIONS)}."
+
+    if op in ("update", "delete"):
+        if not is_id(record.get("id")):
+            return f"An integer 'id' is required to {op} a record."
+        if record["id"] not in existing_ids:
+            return f"No {model.__tablename__} with id {record['id']}."
+    elif "id" in record:
+        return "'id' must not be set when creating a record."
+
+    unknown = set(record) - writable_fields(model) - {"op", "id"}
+    if unknown:
+        return f"Unknown field(s): {', '.join(sorted(unknown))}."
+
+    for field in set(collections(model)) & set(record):
+        value = record[field]
+        if not (
+            value is None
+            or isinstance(value, str)
+            or (isinstance(value, list) and all(isinstance(entry, str) for entry in value))
+        ):
+            return f"Field '{field}' must be a list of strings."
+
+    columns = model.__table__.columns
+    for field in sorted(set(record) & set(columns.keys()) - {"id"}):
+        error = check_value(columns[field], record[field])
+        if error:
+            return error
+
+    if op == "create":
+        missing = {
+            field for field in required_fields(model) if record.get(field) is None
+        }
+        if missing:
+            return f"Missing required field(s): {', '.join(sorted(missing))}."
+    elif op == "update":
+        nulled = {
+            field
+            for field in required_fields(model) & set(record)
+            if record[field] is None
+        }
+        if nulled:
+            return f"Field(s) cannot be null: {', '.join(sorted(nulled))}."
+    return None
+
+
+def write_collections(model, written: List[tuple]):
+    """
+    Replaces the child rows of the list fields set by a batch.
+
+    Args:
+        model: The model class the batch targets.
+        written: (id, record) pairs for the records that were created or updated.
+    """
+    for field, child in collections(model).items():
+        values = [(parent_id, record[field]) for parent_id, record in written if field in record]
+        if not values:
+            continue
+        parent_key = getattr(child, child.PARENT_KEY)
+        db.session.execute(
+            delete(child).where(parent_key.in_([parent_id for parent_id, _ in values]))
+        )
+        rows = [
+            {child.PARENT_KEY: parent_id, "position": position, child.VALUE_KEY: entry}
+            for parent_id, value in values
+            for position, entry in enumerate(split_list(value, child.SEPARATOR))
+        ]
+        if rows:
+            db.session.execute(insert(child), rows)
+
+
+def bulk_write(
+    model,
+    prepare: Callable[[dict], dict] = None,
+    after_write: Callable[[set], None] = None,
+):
+    """
+    Validates and applies a batch of writes to `model` in one transaction.
+
+    Args:
+        model: The model class the batch targets.
+        prepare: Optional function that converts a record's fields into column
+            values (e.g. encoding nested JSON) before they are written.
+        after_write: Optional function called with the IDs of every created,
+            updated and deleted record, inside the transaction, to maintain
+            rows derived from them.
+
+    Returns:
+        tuple: A JSON response and status code. 200 with one result per record
+        on success, 400/413/422 if the batch is rejected (nothing is written),
+        or 500 if the database write fails (the transaction is rolled back).
+    """
+    try:
+        records = read_bulk_records()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if not records:
+        return jsonify({"error": "Request body is empty."}), 400
+
+    max_records = current_app.config.get("BULK_MAX_RECORDS", 1000)
+    if len(records) > max_records:
+        return (
+            jsonify({"error": f"A batch may contain at most {max_records} records."}),
+            413,
+        )
+
+    for record in records:
+        record.setdefault("op", "update" if "id" in record else "create")
+
+    # Look up every referenced ID with a single query.
+    referenced_ids = {
+        record["id"] for record in records if is_id(record.get("id"))
+    }
+    existing_ids = (
+        set(
+            db.session.execute(
+                select(model.id).where(model.id.in_(referenced_ids))
+            ).scalars()
+        )
+        if referenced_ids
+        else set()
+    )
+
+    errors = []
+    seen_ids = set()
+    for index, record in enumerate(records):
+        error = validate_record(record, model, existing_ids)
+        if not error and record["op"] != "create":
+            # Operations are grouped by type when applied, so each ID may only appear once.
+            if record["id"] in seen_ids:
+                error = f"id {record['id']} appears more than once in the batch."
+            seen_ids.add(record["id"])
+        if error:
+            errors.append({"index": index, "error": error})
+    if errors:
+        return jsonify({"error": "Batch rejected; nothing was written.", "errors": errors}), 422
+
+    list_fields = set(collections(model))
+
+    def values(record: dict) -> dict:
+        fields = {
+            key: value
+            for key, value in record.items()
+            if key != "op" and key not in list_fields  # List fields go to child tables
+        }
+        return prepare(fields) if prepare else fields
+
+    creates = [(i, r) for i, r in enumerate(records) if r["op"] == "create"]
+    updates = [values(r) for r in records if r["op"] == "update"]
+    updates = [fields for fields in updates if len(fields) > 1]  # Not only list fields
+    deletes = [r["id"] for r in records if r["op"] == "delete"]
+    results = [
+        {
+            "index": index,
+            "op": record["op"],
+            "id": record.get("id"),
+            "status": BULK_OPERATIONS[record["op"]],
+        }
+        for index, record in enumerate(records)
+    ]
+
+    try:
+        if creates:
+            new_ids = db.session.scalars(
+                insert(model).returning(model.id, sort_by_parameter_order=True),
+                [values(record) for _, record in creates],
+            ).all()
+            for (index, _), new_id in zip(creates, new_ids):
+                results[index]["id"] = new_id
+        if updates:
+            db.session.execute(update(model), updates)
+        if list_fields:
+            write_collections(
+                model,
+                [
+                    (results[index]["id"], record)
+                    for index, record in enumerate(records)
+                    if record["op"] != "delete"
+                ],
+            )
+        if deletes:
+            for child in collections(model).values():
+                # Not left to ON DELETE CASCADE: SQLite does not enforce foreign keys by default.
+                db.session.execute(
+                    delete(child).where(getattr(child, child.PARENT_KEY).in_(deletes))
+                )
+            db.session.execute(delete(model).where(model.id.in_(deletes)))
+        if after_write:
+            after_write({result["id"] for result in results})
+        mark_changed(
+            db.session,
+            model.__tablename__,
+            *(child.__tablename__ for child in collections(model).values()),
+        )
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        # The exception may quote SQL and bound values; keep it in the log.
+        logger.exception(f"Failed to apply a {model.__tablename__} batch")
+        return jsonify({"error": "Failed to apply batch."}), 500
+
+    return jsonify({"results": results}), 200
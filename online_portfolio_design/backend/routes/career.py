@@ -1,8 +1,19 @@
-from flask import Blueprint, request, jsonify, render_template
-from backend.models.career import db, Experience, Education, Certificate
-from backend.routes.utils import (
-    parse_date,
-)  # Function to parse date strings for sorting
+from flask import Blueprint, request, jsonify, render_template, url_for
+from sqlalchemy.orm import selectinload
+from backend.models.career import (
+    db,
+    Experience,
+    ExperienceSkill,
+    Education,
+    Certificate,
+)
+from backend.dates import (
+    parse_issued_on,
+)  # Parses certificate dates for the bulk API, which bypasses the model validators
+from backend.routes.bulk import bulk_write  # Shared batch write implementation
+from backend.routes.search import search_endpoint  # Shared full-text search implementation
+from backend.cache import cached_page  # Serve the rendered page from memory
+from backend.conditional import conditional_get  # Answer revalidations with 304
 from typing import List  # Import for type hinting
 
 career_bp = Blueprint("career", __name__, url_prefix="/career")
@@ -11,13 +22,24 @@ career_bp = Blueprint("career", __name__, url_prefix="/career")
 
 # ------------------------ EXPERIENCE API ------------------------ #
 @career_bp.route("/api/experience", methods=["GET", "POST"])
+@conditional_get("experience", "experience_point", "experience_skill")
 def handle_experience():
-    """Handles GET and POST requests for work experience entries."""
+    """
+    Handles GET and POST requests for work experience entries.
+
+    GET accepts an optional `skill` query parameter, which returns only the
+    roles that used that skill (an exact match, looked up in the skill index).
+    """
 
     if request.method == "GET":
         """Retrieves all work experience entries."""
-        experiences: List[Experience] = Experience.query.all()
-        # Query all Experience objects from the database
+        query = Experience.query
+        skill = request.args.get("skill")
+        if skill:
+            query = query.filter(Experience.skill_rows.any(ExperienceSkill.name == skill))
+            # EXISTS subquery on the indexed experience_skill.name column
+        experiences: List[Experience] = query.all()
+        # Query the Experience objects (their points and skills are selectin-loaded)
         return jsonify([exp.to_dict() for exp in experiences]), 200
         # Return a JSON response with all experiences, converted to dictionaries, and a 200 OK status
 
@@ -92,9 +114,11 @@ def manage_experience(id):
         # Update the company, or keep the existing company if not provided
         experience.duration = data.get("duration", experience.duration)
         # Update the duration, or keep the existing duration if not provided
-        experience.points = data.get("points", experience.points)
+        if "points" in data:  # Assigning replaces the child rows, so only when given
+            experience.points = data["points"]
         # Update the points, or keep the existing points if not provided
-        experience.skills = data.get("skills", experience.skills)
+        if "skills" in data:
+            experience.skills = data["skills"]
         # Update the skills, or keep the existing skills if not provided
         db.session.commit()
         # Commit the changes to the database
@@ -108,8 +132,35 @@ def manage_experience(id):
         # Return an error message and a 500 Internal Server Error status
 
 
+@career_bp.route("/api/experience/bulk", methods=["POST"])
+def bulk_experience():
+    """Creates, updates and deletes many work experience entries in one transaction."""
+    return bulk_write(Experience)
+    # Validate every record, apply the batch, and return a result per record
+
+
+@career_bp.route("/api/search")
+@conditional_get("experience", "experience_skill")
+def search_experience():
+    """
+    Searches the work experience entries' titles, companies and skills.
+
+    Query Parameters:
+        - q: The search terms; every word must match (as a word prefix).
+        - limit: The maximum number of results (default 10).
+
+    Returns:
+        - JSON response with the ranked results and their highlighted snippets.
+        - 400 error if `q` is missing or `limit` is invalid.
+    """
+    return search_endpoint(
+        "experience", lambda experience_id: url_for("career.career", _anchor="experience")
+    )
+
+
 # ------------------------ EDUCATION API ------------------------ #
 @career_bp.route("/api/education", methods=["GET", "POST"])
+@conditional_get("education", "education_note")
 def handle_education():
     """Handles GET and POST requests for education entries."""
 
@@ -187,9 +238,8 @@ def manage_education(id):
         # Update the institution, or keep the existing institution if not provided
         education.year = data.get("year", education.year)
         # Update the year, or keep the existing year if not provided
-        education.additional_information = data.get(
-            "additional_information", education.additional_information
-        )
+        if "additional_information" in data:  # Assigning replaces the child rows
+            education.additional_information = data["additional_information"]
         # Update the additional_information, or keep the existing additional_information if not provided
         db.session.commit()
         # Commit the changes to the database
@@ -203,8 +253,16 @@ def manage_education(id):
         # Return an error message and a 500 Internal Server Error status
 
 
+@career_bp.route("/api/education/bulk", methods=["POST"])
+def bulk_education():
+    """Creates, updates and deletes many education entries in one transaction."""
+    return bulk_write(Education)
+    # Validate every record, apply the batch, and return a result per record
+
+
 # ------------------------ CERTIFICATE API ------------------------ #
 @career_bp.route("/api/certificates", methods=["GET", "POST"])
+@conditional_get("certificate")
 def handle_certificate():
     """Handles GET and POST requests for certificate entries."""
 
@@ -296,23 +354,51 @@ def manage_certificate(id):
         # Return an error message and a 500 Internal Server Error status
 
 
+@career_bp.route("/api/certificates/bulk", methods=["POST"])
+def bulk_certificate():
+    """Creates, updates and deletes many certificate entries in one transaction."""
+
+    def prepare(fields: dict) -> dict:
+        if "date" in fields:
+            # Bulk statements skip the model's validators, so derive issued_on here
+            fields["issued_on"] = parse_issued_on(fields["date"]) if fields["date"] else None
+        return fields
+
+    return bulk_write(Certificate, prepare)
+    # Validate every record, apply the batch, and return a result per record
+
+
 # ------------------------ CAREER PAGE ROUTE ------------------------ #
+# Every table the career page is rendered from.
+CAREER_TABLES = (
+    "experience",
+    "experience_point",
+    "experience_skill",
+    "education",
+    "education_note",
+    "certificate",
+)
+
+
 @career_bp.route("")
+@conditional_get(*CAREER_TABLES)
+@cached_page(*CAREER_TABLES)
 def career():
     """Renders the career page with work experience, education, and certificate data."""
 
-    experiences: List[Experience] = Experience.query.all()
-    # Query all Experience objects from the database
-    educations: List[Education] = Education.query.all()
-    # Query all Education objects from the database
-    certifications: List[Certificate] = Certificate.query.all()
-    # Query all Certificate objects from the database
-
-    sorted_certificates: List[Certificate] = sorted(
-        certifications, key=lambda cert: parse_date(cert.date), reverse=True
-    )
-    # Sort the certificates by date in descending order
-    # The function that is sorting the list, use the parse_date function for the work.
+    experiences: List[Experience] = Experience.query.options(
+        selectinload(Experience.point_rows), selectinload(Experience.skill_rows)
+    ).all()
+    # Query all Experience objects, with their points and skills in one extra SELECT each
+    educations: List[Education] = Education.query.options(
+        selectinload(Education.note_rows)
+    ).all()
+    # Query all Education objects, with their notes in one extra SELECT
+    sorted_certificates: List[Certificate] = Certificate.query.order_by(
+        Certificate.issued_on.desc().nulls_last(), Certificate.id
+    ).all()
+    # Query the certificates newest first; the database sorts on the indexed, pre-parsed
+    # `issued_on` column, and certificates with an unrecognised date come last.
 
     return render_template(
         "career.html",
@@ -6,13 +6,17 @@ from flask import (
     current_app,
 )  # Import necessary Flask modules
 from backend.extensions import (
-    mail,
-)  # Import initialized mail instance for sending emails
+    mail_queue,
+    recaptcha,
+)  # Import the background mail queue and the reCAPTCHA verification service
 from flask_mail import Message  # Import Message class for constructing email messages
 from backend.routes.contact.contact_form import (
     ContactForm,
 )  # Import the ContactForm class for form handling
-import requests  # Import the requests library for making HTTP requests
+from backend.metrics import (
+    CONTACT_SUBMISSIONS,
+)  # Import the counter of contact form outcomes
+from logger import logger
 
 # Create a Blueprint for the contact route
 contact_bp = Blueprint(
@@ -20,38 +24,6 @@ contact_bp = Blueprint(
 )  # Blueprint for contact-related routes, prefixed with "/contact"
 
 
-def verify_recaptcha(token: str) -> bool:
-    """
-    Verifies the reCAPTCHA response using Google's API.
-
-    This function sends a POST request to Google's reCAPTCHA API to verify
-    the provided token.  It checks if the 'success' field in the JSON response
-    is True, indicating that the reCAPTCHA verification was successful.
-
-    Args:
-        token (str): The reCAPTCHA response token received from the client-side.
-
-    Returns:
-        bool: True if the reCAPTCHA verification was successful, False otherwise.
-              It also returns False if RECAPTCHA_PRIVATE_KEY is not configured.
-    """
-    secret_key = current_app.config.get(
-        "RECAPTCHA_PRIVATE_KEY"
-    )  # Get the reCAPTCHA private key from Flask's configuration
-    if not secret_key:
-        # If no secret key is found, the recaptcha function will fail
-        return False  # Fails if no secret key is found
-
-    url = "https://www.google.com/recaptcha/api/siteverify"
-    # The URL for Google's reCAPTCHA API
-    response = requests.post(
-        url, data={"secret": secret_key, "response": token}
-    )  # Send a POST request to the API with the secret key and token
-    return response.json().get(
-        "success", False
-    )  # Return True if the verification was successful, False otherwise
-
-
 @contact_bp.route("", methods=["GET", "POST"])
 def contact():
     """
@@ -60,7 +32,8 @@ def contact():
     This route handles both GET and POST requests to the contact page.
     - On a GET request, it renders the contact form.
     - On a POST request, it validates the form data, verifies the reCAPTCHA,
-      and sends an email if validation passes.
+      and queues an email for background delivery if validation passes. The
+      response is returned as soon as the message is safely spooled.
     - Returns JSON responses for AJAX-based submissions, including success/failure status
       and error messages.
     """
@@ -68,6 +41,7 @@ def contact():
 
     if request.method == "POST":  # If the request method is POST (form submission)
         if not form.validate_on_submit():  # If the form data is invalid
+            CONTACT_SUBMISSIONS.labels("invalid").inc()
             return (
                 jsonify(
                     {
@@ -85,6 +59,7 @@ def contact():
         )  # Get the reCAPTCHA response token from the form data
 
         if not token:  # If the reCAPTCHA token is missing
+            CONTACT_SUBMISSIONS.labels("recaptcha_failed").inc()
             return (
                 jsonify(
                     {
@@ -95,7 +70,7 @@ def contact():
                 400,
             )  # Return a JSON response indicating that reCAPTCHA verification failed
 
-        if verify_recaptcha(token):  # If the reCAPTCHA verification is successful
+        if recaptcha.verify(token):  # If the reCAPTCHA verification is successful
             # Extract form data
             name = form.name.data
             email = form.email.data
@@ -114,10 +89,24 @@ def contact():
                 # The body of the email message
             )
 
-            # Send email
-            mail.send(msg)
-            # Send the email message using Flask-Mail
-
+            # Queue email
+            try:
+                mail_queue.enqueue(msg)
+                # Spool the message; a background worker sends it using Flask-Mail
+            except Exception as e:
+                logger.error(f"Failed to queue contact form email: {e}")
+                CONTACT_SUBMISSIONS.labels("error").inc()
+                return (
+                    jsonify(
+                        {
+                            "success": False,
+                            "message": "Your message could not be sent. Please try again later.",
+                        }
+                    ),
+                    503,
+                )  # Return a JSON response indicating that the message could not be queued
+
+            CONTACT_SUBMISSIONS.labels("queued").inc()
             return (
                 jsonify(
                     {
@@ -129,6 +118,7 @@ def contact():
             )  # Return a JSON response indicating that the message was sent successfully
         else:
             # If the reCAPTCHA verification fails
+            CONTACT_SUBMISSIONS.labels("recaptcha_failed").inc()
             return (
                 jsonify(
                     {
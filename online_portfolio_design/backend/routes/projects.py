@@ -1,12 +1,34 @@
 from flask import Blueprint, request, jsonify, render_template, redirect, url_for, abort
 from sqlalchemy.exc import SQLAlchemyError
-from backend.models.projects import db, Overview, Project
-import json
+from sqlalchemy.orm import load_only
+from backend.models.projects import (
+    db,
+    Overview,
+    Project,
+    ProjectTechnology,
+    sync_technologies,
+)
+from backend.models.events import mark_changed  # Records writes made with bulk statements
+from backend.facets import (
+    filter_projects,
+    project_facets,
+)  # Status / technology filters and cached facet counts
+from backend.cache import cached_page  # Serve rendered pages from memory
+from backend.conditional import conditional_get  # Answer revalidations with 304
+from backend.project_index import project_index  # In-memory index of project IDs
+from backend.overview_cache import (
+    overview_cache,
+)  # Decoded and truncated overview, per revision
+from backend.pagination import (
+    KeysetPagination,
+    decode_cursor,
+    keyset_page,
+)  # Cursor-based pagination helpers
 from backend.routes.utils import (
-    truncate_html,
-    get_project_id,
     is_valid_project_route,  # Function to validate project route paths
 )
+from backend.routes.bulk import bulk_write  # Shared batch write implementation
+from backend.routes.search import search_endpoint  # Shared full-text search implementation
 
 # Create a Blueprint for project-related routes
 projects_bp = Blueprint("projects", __name__, url_prefix="/projects")
@@ -14,6 +36,77 @@ projects_bp = Blueprint("projects", __name__, url_prefix="/projects")
 # Define the number of projects to be displayed per page in pagination
 PROJECTS_PER_PAGE = 12
 
+# Default and maximum page sizes for cursor-paginated API requests
+API_DEFAULT_LIMIT = 20
+API_MAX_LIMIT = 100
+
+
+def parse_keyset_args(args) -> tuple:
+    """
+    Reads the `cursor` (or `after_id`) and `limit` query parameters.
+
+    Returns:
+        tuple: The ID to continue after (None for the first page) and the page size.
+
+    Raises:
+        ValueError: If a parameter is not a valid cursor or integer.
+    """
+    if args.get("cursor"):
+        after_id = decode_cursor(args["cursor"])
+    elif args.get("after_id"):
+        after_id = int(args["after_id"])
+    else:
+        after_id = None
+    limit = int(args.get("limit", API_DEFAULT_LIMIT))
+    return after_id, min(max(limit, 1), API_MAX_LIMIT)
+
+
+def parse_fields(args, default: tuple) -> tuple:
+    """
+    Reads the `fields` query parameter (a comma-separated list of project fields).
+
+    `fields=all` selects every field. The `id` field is always included.
+
+    Returns:
+        tuple: The selected field names, or `default` if the parameter is absent.
+
+    Raises:
+        ValueError: If an unknown field is requested.
+    """
+    raw = args.get("fields")
+    if not raw:
+        return default
+    if raw == "all":
+        return Project.FIELDS
+
+    requested = {field.strip() for field in raw.split(",") if field.strip()}
+    unknown = requested - set(Project.FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}.")
+    # Keep the model's field order and always include the primary key
+    return tuple(field for field in Project.FIELDS if field in requested or field == "id")
+
+
+def parse_filters(args) -> tuple:
+    """
+    Reads the `status` and `tech` query parameters. Both may be repeated, e.g.
+    `?status=Completed&tech=Python&tech=Flask`.
+
+    Returns:
+        tuple: The statuses (any of which matches) and the technologies (all
+        of which must match).
+    """
+    statuses = [status for status in args.getlist("status") if status]
+    technologies = [technology for technology in args.getlist("tech") if technology]
+    return statuses, technologies
+
+
+def project_query(fields: tuple):
+    """Returns a project query that only loads the columns behind `fields`."""
+    return Project.query.options(
+        load_only(*(getattr(Project, field) for field in fields))
+    )
+
 
 # ----- Projects Overview API -----
 @projects_bp.route("/api/overview", methods=["GET"])
@@ -32,20 +125,43 @@ def handle_overview():
 
 # ----- Projects CRUD API -----
 @projects_bp.route("/api", methods=["GET", "POST"])
+@conditional_get("project", "project_technology")
 def handle_projects():
     """
     Handle API requests for projects:
-    - GET: Retrieve all projects from the database.
+    - GET: Retrieve all projects from the database. When `cursor`, `after_id` or
+      `limit` is given, retrieve one keyset-paginated page instead. Projects are
+      returned in their compact summary projection (`Project.SUMMARY_FIELDS`)
+      unless `fields` lists the wanted fields (or is `all`). `status` and `tech`
+      filter the projects (see `parse_filters`) across the whole catalogue.
     - POST: Create a new project.
 
     Returns:
         - JSON response containing all projects (GET request).
+        - JSON object with `items` and an opaque `next_cursor` (paginated GET request);
+          `next_cursor` is null on the last page.
         - JSON response with the newly created project (POST request).
         - 400 error if request data is invalid.
     """
     if request.method == "GET":
-        projects = Project.query.all()
-        return jsonify([project.to_dict() for project in projects])
+        try:
+            fields = parse_fields(request.args, Project.SUMMARY_FIELDS)
+            after_id, limit = parse_keyset_args(request.args)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        query = filter_projects(project_query(fields), *parse_filters(request.args))
+
+        if not {"cursor", "after_id", "limit"} & request.args.keys():
+            projects = query.order_by(Project.id).all()
+            return jsonify([project.to_dict(fields) for project in projects])
+
+        projects, next_cursor = keyset_page(query, Project.id, after_id, limit)
+        return jsonify(
+            {
+                "items": [project.to_dict(fields) for project in projects],
+                "next_cursor": next_cursor,
+            }
+        )
 
     data = request.get_json()
     if not data:
@@ -59,9 +175,9 @@ def handle_projects():
             github_link=data.get("github_link"),
             project_image=data.get("project_image"),
             demo_link=data.get("demo_link"),
-            technical_details=json.dumps(
-                data.get("technical_details")
-            ),  # Store technical details as JSON
+            technical_details=data.get(
+                "technical_details"
+            ),  # Stored as a JSON document
             key_learnings=data.get("key_learnings"),
             status=data.get("status"),
             demonstration=data.get("demonstration"),
@@ -81,7 +197,7 @@ def handle_projects():
 def manage_project(id):
     """
     Handle API requests for a specific project by ID:
-    - GET: Retrieve the project.
+    - GET: Retrieve the project (optionally only the comma-separated `fields`).
     - DELETE: Remove the project.
     - PUT: Update the project details.
 
@@ -91,10 +207,15 @@ def manage_project(id):
         - JSON updated project (PUT request).
         - 400 error if request data is invalid.
     """
-    project = Project.query.get_or_404(id)  # Fetch project by ID or return 404 error
-
     if request.method == "GET":
-        return jsonify(project.to_dict())
+        try:
+            fields = parse_fields(request.args, Project.FIELDS)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        project = project_query(fields).get_or_404(id)
+        return jsonify(project.to_dict(fields))
+
+    project = Project.query.get_or_404(id)  # Fetch project by ID or return 404 error
 
     if request.method == "DELETE":
         try:
@@ -116,9 +237,9 @@ def manage_project(id):
         project.github_link = data.get("github_link", project.github_link)
         project.project_image = data.get("project_image", project.project_image)
         project.demo_link = data.get("demo_link", project.demo_link)
-        project.technical_details = json.dumps(
-            data.get("technical_details", project.technical_details)
-        )
+        project.technical_details = data.get(
+            "technical_details", project.technical_details
+        )  # Already decoded: re-encoding the current value would double-encode it
         project.key_learnings = data.get("key_learnings", project.key_learnings)
         project.status = data.get("status", project.status)
         project.demonstration = data.get("demonstration", project.demonstration)
@@ -129,10 +250,73 @@ def manage_project(id):
         return jsonify({"error": f"Failed to update project. {str(e)}"}), 400
 
 
+@projects_bp.route("/api/bulk", methods=["POST"])
+def bulk_projects():
+    """
+    Create, update and delete many projects in one transaction.
+
+    Accepts a JSON array (or NDJSON stream) of project records, each with an
+    optional `op` ("create", "update" or "delete"). See `backend.routes.bulk`.
+
+    Returns:
+        - JSON response with one result per record, in input order.
+        - 400/413/422 error if the batch is rejected; nothing is written.
+    """
+    return bulk_write(Project, after_write=sync_project_technologies)
+    # technical_details is a JSON column: no encoding needed, but its technology rows need rebuilding
+
+
+def sync_project_technologies(project_ids: set):
+    """Rebuilds the technology rows of the projects written by a batch."""
+    sync_technologies(db.session, project_ids)
+    mark_changed(db.session, ProjectTechnology.__tablename__)
+
+
+@projects_bp.route("/api/facets")
+@conditional_get("project", "project_technology")
+def get_project_facets():
+    """
+    Returns the project counts per status and per technology, for building
+    filter controls. Accepts the same `status` and `tech` filters as `/api`.
+
+    The counts come from indexed queries and are cached per content version,
+    so repeat requests are answered from memory until the projects change.
+
+    Returns:
+        - JSON object with `total`, and `status` and `technology` lists of
+          `{"value", "count"}` objects, most common first.
+    """
+    try:
+        return jsonify(project_facets.get(*parse_filters(request.args)))
+    except SQLAlchemyError as e:
+        db.session.rollback()  # Rollback transaction
+        return jsonify({"error": "Database error occurred"}), 500  # Error response
+
+
+@projects_bp.route("/api/search")
+@conditional_get("project")
+def search_projects():
+    """
+    Searches the projects' names, descriptions, key learnings and technical details.
+
+    Query Parameters:
+        - q: The search terms; every word must match (as a word prefix).
+        - limit: The maximum number of results (default 10).
+
+    Returns:
+        - JSON response with the ranked results and their highlighted snippets.
+        - 400 error if `q` is missing or `limit` is invalid.
+    """
+    return search_endpoint(
+        "project",
+        lambda project_id: url_for("projects.project_detail", project_id=project_id),
+    )
+
+
 @projects_bp.route("/api/total_count")
 def get_project_count():
     try:
-        total_projects = db.session.query(Project).count()  # Efficient count query
+        total_projects = project_index.count()  # Served from the in-memory ID index
         return jsonify({"total_projects": total_projects})  # Only return the count
     except SQLAlchemyError as e:
         db.session.rollback()  # Rollback transaction
@@ -141,11 +325,42 @@ def get_project_count():
         return jsonify({"error": "An unexpected error occurred"}), 500
 
 
+@projects_bp.route("/api/meta")
+@conditional_get("project")
+def get_project_meta():
+    """
+    Returns everything the client-side route validation needs in one response:
+    the project count, the highest project ID, the page size and page count,
+    and a version token that changes whenever the projects do.
+
+    It is served from one snapshot of the in-memory project index, so every
+    field belongs to the version it reports, and answered with 304 when the
+    client's copy is still current.
+    """
+    try:
+        index = project_index.snapshot()
+        return jsonify(
+            {
+                "total_projects": index.count(),
+                "last_id": index.last_id(),
+                "per_page": PROJECTS_PER_PAGE,
+                "page_count": index.page_count(PROJECTS_PER_PAGE),
+                "version": index.version,
+            }
+        )
+    except SQLAlchemyError as e:
+        db.session.rollback()  # Rollback transaction
+        return jsonify({"error": "Database error occurred"}), 500  # Error response
+    except Exception as e:
+        return jsonify({"error": "An unexpected error occurred"}), 500
+
+
 @projects_bp.route("/last_id")
 def get_last_project():
     try:
-        # Query for the last project, ordered by ID in descending order
-        last_project = Project.query.order_by(Project.id.desc()).first()
+        # Look up the highest ID in the index, then load that project by primary key
+        last_id = project_index.last_id()
+        last_project = db.session.get(Project, last_id) if last_id else None
 
         if last_project:
             return jsonify(last_project.to_dict())
@@ -173,28 +388,28 @@ def default_projects():
 
 
 @projects_bp.route("/page/<int:page_num>", methods=["GET"])
+@conditional_get("project", "overview")
+@cached_page("project", "overview")
 def projects(page_num=1):
     """
     Render the projects page with pagination.
     """
-    overview = Overview.query.first()
-
-    if overview:
-        truncated_overview = truncate_html(
-            json.loads(overview.overview_data)["overview_text"]
-        )
-        overview_dict = json.loads(overview.overview_data)
-    else:
-        overview_dict = {}
+    # Decoded and truncated once per overview revision; ({}, None) without an overview
+    overview_dict, truncated_overview = overview_cache.get()
 
-    # Pagination logic
-    projects_paginator = Project.query.order_by(Project.id).paginate(
+    # Pagination logic: the project index supplies the first ID of the page and the
+    # total, so the database only seeks to that ID (no OFFSET scan, no COUNT query)
+    index = project_index.snapshot()
+    projects_paginator = KeysetPagination(
         page=page_num,
         per_page=PROJECTS_PER_PAGE,
         error_out=True,  # Raise 404 for invalid pages
+        query=Project.query,
+        id_column=Project.id,
+        ids=index.ids,
     )
 
-    total_projects = Project.query.count()
+    total_projects = projects_paginator.total
 
     return render_template(
         "/projects/projects.html",
@@ -206,20 +421,23 @@ def projects(page_num=1):
             path,
             total_projects,
             PROJECTS_PER_PAGE,
-            lambda project_id: get_project_id(project_id, Project),
+            index.contains,
         ),
         projects_per_page=PROJECTS_PER_PAGE,
     )
 
 
 @projects_bp.route("/<int:project_id>")
+@conditional_get("project")
+@cached_page("project")
 def project_detail(project_id):
     """
     Render the project detail page for a specific project.
     """
     project = Project.query.get_or_404(project_id)  # Fetch project by ID or return 404
     project_data = project.to_dict()
-    total_projects = Project.query.count()
+    index = project_index.snapshot()
+    total_projects = index.count()
 
     return render_template(
         "/projects/project_detail.html",
@@ -228,7 +446,7 @@ def project_detail(project_id):
             path,
             total_projects,
             PROJECTS_PER_PAGE,
-            lambda project_id: get_project_id(project_id, Project),
+            index.contains,
         ),
         projects_per_page=PROJECTS_PER_PAGE,
     )
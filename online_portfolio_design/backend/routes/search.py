@@ -0,0 +1,58 @@
+"""
+This module implements the full-text search endpoints shared by the projects
+and career blueprints.
+
+A search is a GET request with the visitor's terms in `q` and an optional
+`limit`. The response lists the matching documents, best match first, each with
+its `id`, `title`, a highlighted HTML `snippet` (matches wrapped in `<mark>`),
+its relevance `score` and the `url` of the page showing it. See `backend.search`.
+"""
+
+from typing import Callable
+
+from flask import current_app, jsonify, request
+from sqlalchemy.exc import SQLAlchemyError
+
+from backend.models import db
+from backend.search import search_index
+from logger import logger
+
+# Number of results returned when the request does not set `limit`.
+SEARCH_DEFAULT_LIMIT = 10
+
+
+def search_endpoint(kind: str, link: Callable[[int], str]):
+    """
+    Runs the search described by the request's query parameters.
+
+    Args:
+        kind (str): The kind of document to search ("project" or "experience").
+        link: Function returning the page URL of a document, given its ID.
+
+    Returns:
+        tuple: A JSON response and status code. 200 with the results, 400 for a
+        missing query or invalid limit, 404 if search is disabled, or 503 if
+        the search index is not available.
+    """
+    if not search_index.enabled:
+        return jsonify({"error": "Search is disabled."}), 404
+
+    query = request.args.get("q", "").strip()
+    if not query:
+        return jsonify({"error": "The 'q' query parameter is required."}), 400
+    try:
+        limit = int(request.args.get("limit", SEARCH_DEFAULT_LIMIT))
+    except ValueError:
+        return jsonify({"error": "'limit' must be an integer."}), 400
+    limit = min(max(limit, 1), current_app.config.get("SEARCH_MAX_RESULTS", 50))
+
+    try:
+        results = search_index.search(kind, query, limit)
+    except SQLAlchemyError:
+        db.session.rollback()  # Rollback transaction
+        logger.exception(f"{kind} search failed; has `flask init-db` been run?")
+        return jsonify({"error": "Search is unavailable."}), 503
+
+    for result in results:
+        result["url"] = link(result["id"])
+    return jsonify({"query": query, "results": results}), 200
@@ -1,101 +1,26 @@
 """
 This module provides utility functions for:
-    - Verifying reCAPTCHA tokens.
-    - Parsing dates in various formats, including those with ordinal suffixes.
+    - Truncating HTML content (re-exported from `backend.markup`).
+    - Verifying reCAPTCHA tokens (through the shared verification service).
+    - Parsing dates in various formats, including those with ordinal suffixes
+      (re-exported from `backend.dates`).
 
 Dependencies:
-    - flask
-    - requests
     - re
-    - datetime
-    - beautifulsoup4
-    - Project model (from projects.py [model(s) file])
 """
 
-from flask import current_app  # Import the current_app object from Flask
-import requests  # Import the requests library for making HTTP requests
 import re  # Import the re module for regular expressions
-from datetime import (
-    datetime,
-)  # Import the datetime class for working with dates and times
-from bs4 import BeautifulSoup  # Import BeautifulSoup for parsing HTML and XML
-from backend.models.projects import Project  # Import the Project Model for type hinting
+from backend.dates import (
+    parse_date,
+    remove_ordinal_suffix,
+)  # Re-exported: the date helpers now live in backend.dates
+from backend.markup import (
+    truncate_html,
+)  # Re-exported: the HTML helpers now live in backend.markup
+from backend.extensions import recaptcha  # Import the reCAPTCHA verification service
 
 
 # >>>>> Projects Page-Related >>>>
-def remove_ordinal_suffix(date_string: str) -> str:
-    """
-    Removes ordinal suffixes like 'st', 'nd', 'rd', 'th' from a date string.
-
-    Args:
-        date_string (str): A date string that may contain ordinal suffixes.
-
-    Returns:
-        str: The cleaned date string without ordinal suffixes.
-    """
-    return re.sub(
-        r"(\d+)(st|nd|rd|th)", r"\1", date_string
-    )  # Use the RE sub function to give results
-
-
-def parse_date(date_string: str) -> datetime:
-    """
-    Parses a date string after removing ordinal suffixes, attempting multiple formats.
-
-    Args:
-        date_string (str): A date string that may include ordinal suffixes.
-
-    Returns:
-        datetime: A datetime object representing the parsed date, or datetime.min if parsing fails.
-    """
-    date_string = remove_ordinal_suffix(date_string).strip()
-    # Remove these parts from the date, to parse
-
-    formats = [
-        # Formats for the date code, with a variety of options
-        "%b %d, %Y",  # Example: Sep 17, 2021
-        "%B %d, %Y",  # Example: September 17, 2021
-        "%b %d %Y",  # Example: Jun 2 2021
-        "%B %d %Y",  # Example: June 2 2021
-    ]
-
-    for fmt in formats:
-        # for loop to check various formats of date
-        try:
-            # For the following operation in this file,
-            return datetime.strptime(date_string, fmt)
-        except ValueError:
-            # Value Error
-            continue  # Try the next format
-
-    return datetime.min  # Return a default old date if parsing fails
-
-
-def truncate_html(html: str, length: int = 250) -> str:
-    """Truncates HTML content while preserving basic HTML structure.
-
-    Args:
-        html (str): The HTML content to truncate.
-        length (int, optional): The maximum length of the truncated text. Defaults to 250.
-
-    Returns:
-        str: The truncated HTML content.
-    """
-    soup = BeautifulSoup(html, "html.parser")  # use the BEautifulSoup
-    text = soup.get_text()  # use get text command to generate plain text
-    truncated_text = text[:length]  # truncate text to the specified length
-
-    # Re-wrap with <i> tags
-    truncated_html = f"<i>{truncated_text}...</i>"  # wrap truncated text
-
-    return truncated_html
-
-
-def get_project_id(project_id: int, ProjectModel) -> Project:
-    """Queries the database to retrieve a project by ID."""
-    return ProjectModel.query.get(project_id)
-
-
 def is_valid_project_page(
     page_number: int, total_projects: int, projects_per_page: int
 ) -> bool:
@@ -115,14 +40,12 @@ def is_valid_project_page(
         return False
 
 
-def is_valid_project_id(project_id: int, project_query) -> bool:
-    """Checks if a project ID exists using a provided project query."""
+def is_valid_project_id(project_id: int, project_exists) -> bool:
+    """Checks if a project ID exists using a provided lookup (e.g. the project index)."""
     try:
         project_id = int(project_id)
         # Get the project and convert to a string
-        project = project_query(project_id)  # Use provided query
-        # Query from the database to check value
-        return project is not None  # Returns True if project exists
+        return project_exists(project_id)  # Use provided lookup
         # Check if the project exist and give a bool
     except ValueError:
         # Value Error handling
@@ -133,10 +56,13 @@ def is_valid_project_route(
     path: str,
     total_projects: int,
     projects_per_page: int,
-    project_query,
+    project_exists,
 ) -> bool:
     """
     Checks if the given path is a valid project route.
+
+    `project_exists` is a callable that takes a project ID and returns whether
+    it exists, such as `project_index.contains`.
     """
 
     # Regex for /projects or /projects/page/N (where N is a number)
@@ -163,7 +89,7 @@ def is_valid_project_route(
         project_id = id_match.group(1)
         # use a grouping
         return is_valid_project_id(
-            project_id, project_query
+            project_id, project_exists
         )  # check if the project is within the scope
 
     return False  # Not a valid project route
@@ -177,28 +103,16 @@ def verify_recaptcha(token: str) -> bool:
     """
     Verifies a reCAPTCHA token using Google's reCAPTCHA verification API.
 
+    Delegates to the shared `RecaptchaVerifier` (see `backend.recaptcha`), which
+    pools connections, enforces timeouts and caches verdicts.
+
     Args:
         token (str): The reCAPTCHA token received from the client-side.
 
     Returns:
         bool: True if the verification is successful, False otherwise.
     """
-    secret_key = current_app.config.get("RECAPTCHA_PRIVATE_KEY")
-    # Getting the secret key for verification
-    url = "https://www.google.com/recaptcha/api/siteverify"
-    # Calling up the URL
-    payload = {"secret": secret_key, "response": token}
-    # Payload to be used to ensure code works
-
-    try:
-        # Trying for a proper response to the service
-        response = requests.post(url, data=payload)
-        # Sending to the browser to give result
-        response.raise_for_status()  # Raise HTTPError for bad responses (4xx or 5xx)
-        result = response.json()
-        return result.get("success", False)
-    except requests.exceptions.RequestException as e:
-        return False
+    return recaptcha.verify(token)
 
 
 # >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
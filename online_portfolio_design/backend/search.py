@@ -0,0 +1,307 @@
+"""
+This module maintains the full-text search index over projects and work experience.
+
+Each searchable kind has its own inverted index table, with one row per
+project / experience holding its searchable text as a `title` and a `body`:
+
+    - SQLite: an FTS5 virtual table (Porter stemming, BM25 ranking with the
+      title weighted above the body).
+    - Postgres: a table with a generated, weighted `tsvector` column and a GIN
+      index on it, ranked with `ts_rank_cd`.
+
+Searches match every word of the query as a prefix, are ranked by the database,
+and come with a highlighted snippet of the matching text.
+
+The index is updated incrementally: the rows that a session flushes are
+recorded, and re-indexed once the transaction commits (on `content_changed`).
+Bulk statements bypass the ORM, so after one the affected kind is rebuilt as
+a whole. `flask init-db` creates the tables and rebuilds everything, and
+`flask reindex-search` does the latter on demand.
+"""
+
+import html
+import re
+from typing import Dict, Iterable, List, Optional
+
+from flask import Flask
+from sqlalchemy import event, inspect, select, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from backend.markup import html_to_text  # Project fields are stored as HTML
+from backend.models import db
+from backend.models.career import Experience, ExperienceSkill
+from backend.models.events import content_changed
+from backend.models.projects import Project
+from logger import logger
+
+# The index table of each searchable kind.
+SEARCH_TABLES = {"project": "project_search", "experience": "experience_search"}
+
+# The content tables each kind is built from.
+SOURCE_TABLES = {
+    "project": frozenset({"project"}),
+    "experience": frozenset({"experience", "experience_skill"}),
+}
+
+# Most words of a query that are searched for.
+MAX_QUERY_TERMS = 8
+
+# Placed around matches by the database, and turned into <mark> once the
+# snippet is escaped (private-use characters never occur in the content).
+_MARK_START, _MARK_END = "\ue000", "\ue001"
+
+_WORD = re.compile(r"\w+")
+
+_SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE {table} USING fts5("
+    "title, body, tokenize='porter unicode61 remove_diacritics 2')",
+    # Rank with BM25, counting title matches ten times as much as body matches.
+    "INSERT INTO {table}({table}, rank) VALUES ('rank', 'bm25(10.0, 1.0)')",
+)
+_SQLITE_QUERY = (
+    "SELECT rowid AS id, title, "
+    "snippet({table}, -1, :start, :end, '…', 16) AS snippet, -rank AS score "
+    "FROM {table} WHERE {table} MATCH :match ORDER BY rank, rowid LIMIT :limit"
+)
+
+_POSTGRES_DDL = (
+    "CREATE TABLE {table} ("
+    "id INTEGER PRIMARY KEY, title TEXT NOT NULL, body TEXT NOT NULL, "
+    "document tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', title), 'A') || "
+    "setweight(to_tsvector('english', body), 'B')) STORED)",
+    "CREATE INDEX {table}_document_idx ON {table} USING GIN (document)",
+)
+# Snippets are only built for the rows that make the cut.
+_POSTGRES_QUERY = (
+    "SELECT id, title, ts_headline('english', body, query, :options) AS snippet, score "
+    "FROM (SELECT id, title, body, query, ts_rank_cd(document, query) AS score "
+    "FROM {table}, to_tsquery('english', :match) AS query "
+    "WHERE document @@ query ORDER BY score DESC, id LIMIT :limit) AS ranked "
+    "ORDER BY score DESC, id"
+)
+_POSTGRES_HEADLINE_OPTIONS = (
+    f'StartSel="{_MARK_START}", StopSel="{_MARK_END}", '
+    'MaxWords=24, MinWords=8, MaxFragments=2, FragmentDelimiter=" … "'
+)
+
+
+def _json_strings(value) -> Iterable[str]:
+    """Yields the keys and scalar values of a JSON document, e.g. technical details."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield str(key)
+            yield from _json_strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _json_strings(item)
+    elif value is not None:
+        yield str(value)
+
+
+def _project_documents(connection, ids: Optional[set] = None):
+    """Yields (id, title, body) for every project, or for the given IDs."""
+    query = select(
+        Project.id,
+        Project.name,
+        Project.description,
+        Project.key_learnings,
+        Project.technical_details,
+    )
+    if ids is not None:
+        query = query.where(Project.id.in_(ids))
+    for row in connection.execute(query):
+        parts = (
+            html_to_text(row.description),
+            html_to_text(row.key_learnings),
+            " ".join(_json_strings(row.technical_details)),
+        )
+        yield row.id, html_to_text(row.name), "\n".join(part for part in parts if part)
+
+
+def _experience_documents(connection, ids: Optional[set] = None):
+    """Yields (id, title, body) for every experience, or for the given IDs."""
+    experiences = select(Experience.id, Experience.title, Experience.company)
+    skills = select(ExperienceSkill.experience_id, ExperienceSkill.name).order_by(
+        ExperienceSkill.experience_id, ExperienceSkill.position
+    )
+    if ids is not None:
+        experiences = experiences.where(Experience.id.in_(ids))
+        skills = skills.where(ExperienceSkill.experience_id.in_(ids))
+    skill_names: Dict[int, List[str]] = {}
+    for experience_id, name in connection.execute(skills):
+        skill_names.setdefault(experience_id, []).append(name)
+    for row in connection.execute(experiences):
+        yield row.id, row.title, "\n".join([row.company, ", ".join(skill_names.get(row.id, []))])
+
+
+_DOCUMENTS = {"project": _project_documents, "experience": _experience_documents}
+
+
+def _highlight(snippet: str) -> str:
+    """Escapes a snippet and turns the database's match markers into <mark> tags."""
+    return (
+        html.escape(snippet)
+        .replace(_MARK_START, "<mark>")
+        .replace(_MARK_END, "</mark>")
+    )
+
+
+class SearchIndex:
+    """Creates, updates and queries the full-text index tables."""
+
+    def __init__(self):
+        self.enabled = True
+        self.max_results = 50
+
+    def init_app(self, app: Flask):
+        """
+        Configures the index and subscribes it to commit notifications.
+
+        Args:
+            app: The Flask application instance.
+        """
+        self.enabled = app.config.get("SEARCH_ENABLED", True)
+        self.max_results = app.config.get("SEARCH_MAX_RESULTS", 50)
+        app.extensions["search_index"] = self
+        if self.enabled:
+            content_changed.connect(self._on_content_changed, weak=False)
+
+    @staticmethod
+    def _is_postgres(connection) -> bool:
+        return connection.dialect.name == "postgresql"
+
+    # ----- Maintenance -----
+    def create_tables(self):
+        """Creates the index tables that do not exist yet. Requires an application context."""
+        with db.engine.begin() as connection:
+            statements = _POSTGRES_DDL if self._is_postgres(connection) else _SQLITE_DDL
+            for table in SEARCH_TABLES.values():
+                if inspect(connection).has_table(table):
+                    continue
+                for statement in statements:
+                    connection.exec_driver_sql(statement.format(table=table))
+                logger.info(f"Created search index table {table}")
+
+    def _write(self, connection, kind: str, ids: Optional[set] = None) -> int:
+        """Replaces the indexed documents of `kind` (all of them, or just `ids`)."""
+        table = SEARCH_TABLES[kind]
+        key = "id" if self._is_postgres(connection) else "rowid"
+        if ids is None:
+            connection.execute(text(f"DELETE FROM {table}"))
+        else:
+            connection.execute(
+                text(f"DELETE FROM {table} WHERE {key} = :id"), [{"id": i} for i in ids]
+            )
+        documents = [
+            {"id": document_id, "title": title or "", "body": body or ""}
+            for document_id, title, body in _DOCUMENTS[kind](connection, ids)
+        ]
+        if documents:  # Rows deleted from the content table simply do not come back
+            connection.execute(
+                text(f"INSERT INTO {table} ({key}, title, body) VALUES (:id, :title, :body)"),
+                documents,
+            )
+        return len(documents)
+
+    def rebuild(self, kinds: Iterable[str] = SEARCH_TABLES) -> int:
+        """
+        Re-indexes every document of the given kinds. Requires an application context.
+
+        Returns:
+            int: The number of documents indexed.
+        """
+        with db.engine.begin() as connection:
+            return sum(self._write(connection, kind) for kind in kinds)
+
+    def update(self, kind: str, ids: set):
+        """Re-indexes the given rows of `kind`. Requires an application context."""
+        with db.engine.begin() as connection:
+            self._write(connection, kind, ids)
+
+    def _on_content_changed(self, sender, tables: frozenset):
+        # `sender` is the session that committed; see `_record_search_rows`.
+        flushed = sender.info.pop("search_rows", {})
+        for kind, sources in SOURCE_TABLES.items():
+            if not tables & sources:
+                continue
+            try:
+                if kind in flushed:
+                    self.update(kind, flushed[kind])
+                else:  # Written with bulk statements: the changed rows are unknown
+                    self.rebuild([kind])
+            except SQLAlchemyError:
+                logger.exception(
+                    f"Could not update the {kind} search index; run `flask reindex-search`"
+                )
+
+    # ----- Queries -----
+    def search(self, kind: str, query: str, limit: int = 10) -> List[dict]:
+        """
+        Searches one kind of document. Every word of the query must match,
+        as a word prefix. Requires an application context.
+
+        Args:
+            kind (str): "project" or "experience".
+            query (str): The visitor's search terms.
+            limit (int): The maximum number of results.
+
+        Returns:
+            list: Dicts with the document's `id`, `title`, highlighted `snippet`
+            (HTML) and relevance `score`, best match first.
+
+        Raises:
+            SQLAlchemyError: If the index tables do not exist (see `flask init-db`).
+        """
+        terms = _WORD.findall(query.lower())[:MAX_QUERY_TERMS]
+        if not terms:
+            return []
+        table = SEARCH_TABLES[kind]
+        if self._is_postgres(db.session.connection()):
+            statement = text(_POSTGRES_QUERY.format(table=table))
+            parameters = {
+                "match": " & ".join(f"{term}:*" for term in terms),
+                "options": _POSTGRES_HEADLINE_OPTIONS,
+            }
+        else:
+            statement = text(_SQLITE_QUERY.format(table=table))
+            parameters = {
+                "match": " ".join(f'"{term}"*' for term in terms),
+                "start": _MARK_START,
+                "end": _MARK_END,
+            }
+        rows = db.session.execute(statement, {**parameters, "limit": limit})
+        return [
+            {
+                "id": row.id,
+                "title": row.title,
+                "snippet": _highlight(row.snippet),
+                "score": float(row.score),
+            }
+            for row in rows
+        ]
+
+
+# Shared search index instance, bound to the app in `init_extensions`.
+search_index = SearchIndex()
+
+
+@event.listens_for(db.session, "after_flush")
+def _record_search_rows(session, flush_context):
+    """Collects the projects and experiences whose searchable text may have changed."""
+    if not search_index.enabled:
+        return
+    rows = session.info.setdefault("search_rows", {})
+    for obj in session.new | session.dirty | session.deleted:
+        if isinstance(obj, Project):
+            rows.setdefault("project", set()).add(obj.id)
+        elif isinstance(obj, Experience):
+            rows.setdefault("experience", set()).add(obj.id)
+        elif isinstance(obj, ExperienceSkill) and obj.experience_id is not None:
+            rows.setdefault("experience", set()).add(obj.experience_id)
+
+
+@event.listens_for(db.session, "after_rollback")
+def _discard_search_rows(session):
+    """Forgets the recorded rows, since a rollback means nothing was written."""
+    session.info.pop("search_rows", None)
@@ -5,6 +5,9 @@ It uses environment variables to configure the application, providing default va
 if the environment variables are not set.  This allows for flexibility in different
 deployment environments.
 
+Settings are `EnvVar` descriptors, resolved when the application is created
+rather than when this module is imported.
+
 Environment variables are used to store sensitive information (like API keys and database passwords)
 separately from the code, which enhances security and makes it easier to manage configurations
 across different environments (development, testing, production).
@@ -19,6 +22,38 @@ def str_to_bool(value: str) -> bool:
     return value.lower() in ("true", "1", "yes", "on")
 
 
+class EnvVar:
+    """
+    A configuration attribute that reads its environment variable when it is
+    accessed, not when this module is imported.
+
+    `app.config.from_object()` reads every attribute inside `create_app()`, after
+    the .env file has been loaded, so values from .env are picked up and a
+    missing variable falls back to its default instead of crashing the import.
+
+    Args:
+        name (str): The environment variable to read.
+        default: The value used when the variable is unset or empty.
+        cast: Optional function converting the raw string (e.g. `int`, `str_to_bool`).
+    """
+
+    def __init__(self, name: str, default=None, cast=None):
+        self.name = name
+        self.default = default
+        self.cast = cast
+
+    def __get__(self, instance, owner):
+        value = os.environ.get(self.name)
+        if value is None or value == "":
+            return self.default
+        if self.cast is None:
+            return value
+        try:
+            return self.cast(value)
+        except ValueError:
+            raise ValueError(f"Invalid value for {self.name}: {value!r}")
+
+
 class Config:
     """
     Base configuration class.  Sets default values and attempts to load
@@ -34,59 +69,223 @@ class Config:
     )  # Define the base directory of the application: sets the base directory to the directory
     # containing this file, which is useful for constructing absolute paths.
 
-    FLASK_ENV = os.environ.get(
+    FLASK_ENV = EnvVar(
         "FLASK_ENV"
     )  # Get the flask environment settings from the environment.
 
     # Enable debug mode
-    DEBUG = os.environ.get(
-        "DEBUG"
+    DEBUG = EnvVar(
+        "DEBUG", False, str_to_bool
     )  # Enable debug mode: Enables or disables debug mode, which provides detailed error messages
     # and other helpful information during development.
 
     # Database configuration
-    SQLALCHEMY_DATABASE_URI = os.environ.get(
+    SQLALCHEMY_DATABASE_URI = EnvVar(
         "DATABASE_URI"
     )  # Get the database URI from the environment.
 
-    SQLALCHEMY_TRACK_MODIFICATIONS = str_to_bool(
-        str(os.environ.get("SQLALCHEMY_TRACK_MODIFICATIONS"))
+    DATABASE_REPLICA_URIS = EnvVar(
+        "DATABASE_REPLICA_URIS", ""
+    )  # Comma-separated read replica URIs; GET requests read from them when set.
+    DATABASE_REPLICA_LAG_WINDOW = EnvVar(
+        "DATABASE_REPLICA_LAG_WINDOW", 5.0, float
+    )  # Seconds after a commit during which reads stay on the primary, while replicas catch up.
+
+    SQLALCHEMY_TRACK_MODIFICATIONS = EnvVar(
+        "SQLALCHEMY_TRACK_MODIFICATIONS", False, str_to_bool
     )  # Disables SQLAlchemy's tracking of database modifications for performance: reduces overhead.
 
+    # Database connection pool configuration (turned into SQLALCHEMY_ENGINE_OPTIONS
+    # by `configure_database`; ignored for SQLite, which doesn't need a pool)
+    DB_POOL_SIZE = EnvVar(
+        "DB_POOL_SIZE", 5, int
+    )  # Connections kept open per worker process.
+    DB_MAX_OVERFLOW = EnvVar(
+        "DB_MAX_OVERFLOW", 10, int
+    )  # Extra connections opened during bursts, closed again once returned.
+    DB_POOL_TIMEOUT = EnvVar(
+        "DB_POOL_TIMEOUT", 30, int
+    )  # Seconds to wait for a free connection before giving up.
+    DB_POOL_RECYCLE = EnvVar(
+        "DB_POOL_RECYCLE", 1800, int
+    )  # Seconds after which a connection is replaced, before the server drops it as idle.
+    DB_POOL_PRE_PING = EnvVar(
+        "DB_POOL_PRE_PING", True, str_to_bool
+    )  # Test each connection on checkout, transparently replacing dropped ones.
+    DB_STATEMENT_TIMEOUT = EnvVar(
+        "DB_STATEMENT_TIMEOUT", 0, int
+    )  # Milliseconds a single statement may run on Postgres (0 disables the limit).
+
     # Mail configuration
-    MAIL_SERVER = os.environ.get(
+    MAIL_SERVER = EnvVar(
         "MAIL_SERVER"
     )  # Get the mail server from the environment.
 
-    MAIL_PORT = int(
-        str(os.environ.get("MAIL_PORT"))
-    )  # Get the mail port from the environment.
+    MAIL_PORT = EnvVar(
+        "MAIL_PORT", 25, int
+    )  # Get the mail port from the environment (Flask-Mail's default when unset).
 
-    MAIL_USE_TLS = str_to_bool(
-        str(os.environ.get("MAIL_USE_TLS"))
+    MAIL_USE_TLS = EnvVar(
+        "MAIL_USE_TLS", False, str_to_bool
     )  # Get the TLS setting from the environment.
 
-    MAIL_USERNAME = os.environ.get(
+    MAIL_USERNAME = EnvVar(
         "MAIL_USERNAME"
     )  # Get the mail username from the environment.
 
-    MAIL_PASSWORD = os.environ.get(
+    MAIL_PASSWORD = EnvVar(
         "MAIL_PASSWORD"
     )  # Get the mail password from the environment
 
+    # Background mail queue configuration
+    MAIL_QUEUE_ENABLED = EnvVar(
+        "MAIL_QUEUE_ENABLED", True, str_to_bool
+    )  # Deliver mail from a background queue instead of inside the request.
+    MAIL_QUEUE_WORKERS = EnvVar(
+        "MAIL_QUEUE_WORKERS", 2, int
+    )  # Number of delivery threads per process, each with its own SMTP connection.
+    MAIL_QUEUE_MAXSIZE = EnvVar(
+        "MAIL_QUEUE_MAXSIZE", 100, int
+    )  # Bound of the in-memory queue; overflow waits in the spool for the next sweep.
+    MAIL_MAX_RETRIES = EnvVar(
+        "MAIL_MAX_RETRIES", 5, int
+    )  # Delivery attempts before a message is marked as failed.
+    MAIL_RETRY_BACKOFF = EnvVar(
+        "MAIL_RETRY_BACKOFF", 2.0, float
+    )  # Base delay in seconds between retries; doubled after every failed attempt.
+    MAIL_SPOOL_PATH = EnvVar(
+        "MAIL_SPOOL_PATH", os.path.join(basedir, "mail_spool.sqlite3")
+    )  # SQLite file that keeps queued messages across restarts.
+
     # reCAPTCHA configuration
-    RECAPTCHA_PUBLIC_KEY = os.environ.get(
+    RECAPTCHA_PUBLIC_KEY = EnvVar(
         "RECAPTCHA_PUBLIC_KEY"
     )  # Get the reCAPTCHA public key from the environment.
-    RECAPTCHA_PRIVATE_KEY = os.environ.get(
+    RECAPTCHA_PRIVATE_KEY = EnvVar(
         "RECAPTCHA_PRIVATE_KEY"
     )  # Get the reCAPTCHA private key from the environment.
+    RECAPTCHA_VERIFY_URL = EnvVar(
+        "RECAPTCHA_VERIFY_URL", "https://www.google.com/recaptcha/api/siteverify"
+    )  # Token verification endpoint; point it at a local fake verifier for testing.
+    RECAPTCHA_CONNECT_TIMEOUT = EnvVar(
+        "RECAPTCHA_CONNECT_TIMEOUT", 2.0, float
+    )  # Seconds allowed to connect to the verification endpoint.
+    RECAPTCHA_READ_TIMEOUT = EnvVar(
+        "RECAPTCHA_READ_TIMEOUT", 3.0, float
+    )  # Seconds allowed to wait for the verification response.
+    RECAPTCHA_FAILURE_THRESHOLD = EnvVar(
+        "RECAPTCHA_FAILURE_THRESHOLD", 5, int
+    )  # Consecutive failures that open the circuit breaker.
+    RECAPTCHA_RESET_TIMEOUT = EnvVar(
+        "RECAPTCHA_RESET_TIMEOUT", 30, int
+    )  # Seconds the circuit stays open before a trial request is let through.
+    RECAPTCHA_VERDICT_TTL = EnvVar(
+        "RECAPTCHA_VERDICT_TTL", 120, int
+    )  # Seconds a rejected or already used token is remembered, so a resubmission is refused without calling Google.
 
     # General security key
-    SECRET_KEY = os.environ.get(
+    SECRET_KEY = EnvVar(
         "SECRET_KEY"
     )  # Get the secret key from the environment.
 
+    # Page cache configuration
+    PAGE_CACHE_ENABLED = EnvVar(
+        "PAGE_CACHE_ENABLED", True, str_to_bool
+    )  # Serve rendered pages from memory until their data changes.
+    PAGE_CACHE_TIMEOUT = EnvVar(
+        "PAGE_CACHE_TIMEOUT", 300, int
+    )  # Seconds before a cached page expires, bounding staleness across worker processes.
+    PAGE_CACHE_MAX_ENTRIES = EnvVar(
+        "PAGE_CACHE_MAX_ENTRIES", 256, int
+    )  # Maximum number of rendered pages kept in memory per worker.
+
+    # Conditional GET configuration
+    CONTENT_VERSION_TIMEOUT = EnvVar(
+        "CONTENT_VERSION_TIMEOUT", 5, int
+    )  # Seconds a table's content version is memoized before it is re-read from the database.
+
+    # Bulk API configuration
+    BULK_MAX_RECORDS = EnvVar(
+        "BULK_MAX_RECORDS", 1000, int
+    )  # Maximum number of records accepted in a single batch request.
+
+    # Search configuration
+    SEARCH_ENABLED = EnvVar(
+        "SEARCH_ENABLED", True, str_to_bool
+    )  # Keep the full-text index up to date on writes and serve the search APIs.
+    SEARCH_MAX_RESULTS = EnvVar(
+        "SEARCH_MAX_RESULTS", 50, int
+    )  # Maximum number of results a search request may ask for with `limit`.
+
+    # Facet configuration
+    FACET_CACHE_MAX_ENTRIES = EnvVar(
+        "FACET_CACHE_MAX_ENTRIES", 256, int
+    )  # Maximum number of filter combinations whose project facet counts are kept in memory per worker.
+
+    # Instrumentation configuration
+    INSTRUMENTATION_ENABLED = EnvVar(
+        "INSTRUMENTATION_ENABLED", True, str_to_bool
+    )  # Record wall, SQL and template time per request and aggregate them per endpoint.
+    SERVER_TIMING_ENABLED = EnvVar(
+        "SERVER_TIMING_ENABLED", False, str_to_bool
+    )  # Report the request's timings to the client in a Server-Timing header (visible to every visitor).
+    INSTRUMENTATION_STATS_URL = EnvVar(
+        "INSTRUMENTATION_STATS_URL"
+    )  # URL serving the per-endpoint histograms as JSON (disabled when unset).
+
+    # Prometheus metrics configuration
+    METRICS_ENABLED = EnvVar(
+        "METRICS_ENABLED", False, str_to_bool
+    )  # Record Prometheus metrics and serve them at METRICS_URL (opt-in).
+    METRICS_URL = EnvVar(
+        "METRICS_URL", "/metrics"
+    )  # URL of the Prometheus scrape endpoint.
+    METRICS_TOKEN = EnvVar(
+        "METRICS_TOKEN"
+    )  # Bearer token scrapers must send; the endpoint is not served when unset.
+
+    # Static asset configuration
+    ASSETS_ENABLED = EnvVar(
+        "ASSETS_ENABLED", True, str_to_bool
+    )  # Serve the fingerprinted, precompressed files built by `flask build-assets`.
+    ASSETS_OUTPUT_DIR = EnvVar(
+        "ASSETS_OUTPUT_DIR", "dist"
+    )  # Directory, inside the static folder, that the built assets are written to.
+
+    # Response compression configuration
+    COMPRESSION_ENABLED = EnvVar(
+        "COMPRESSION_ENABLED", True, str_to_bool
+    )  # Compress HTML, JSON and other text responses with Brotli or gzip.
+    COMPRESSION_MIN_SIZE = EnvVar(
+        "COMPRESSION_MIN_SIZE", 500, int
+    )  # Bodies smaller than this many bytes are sent uncompressed.
+    COMPRESSION_GZIP_LEVEL = EnvVar(
+        "COMPRESSION_GZIP_LEVEL", 6, int
+    )  # gzip level (1-9).
+    COMPRESSION_BROTLI_QUALITY = EnvVar(
+        "COMPRESSION_BROTLI_QUALITY", 5, int
+    )  # Brotli quality (0-11); above ~6 it gets slow for per-request use.
+
+    # Responsive image configuration
+    IMAGES_ENABLED = EnvVar(
+        "IMAGES_ENABLED", True, str_to_bool
+    )  # Offer resized WebP/AVIF copies of static images through <picture> markup.
+    IMAGE_WIDTHS = EnvVar(
+        "IMAGE_WIDTHS", "160,320,640,960,1280,1920"
+    )  # Comma-separated widths (in pixels) that derivatives are made at.
+    IMAGE_FORMATS = EnvVar(
+        "IMAGE_FORMATS", "avif,webp"
+    )  # Derivative formats, in order of preference (skipped when Pillow cannot encode them).
+    IMAGE_QUALITY = EnvVar(
+        "IMAGE_QUALITY", 70, int
+    )  # Encoder quality (0-100) of the WebP derivatives.
+    IMAGE_AVIF_QUALITY = EnvVar(
+        "IMAGE_AVIF_QUALITY", 45, int
+    )  # Encoder quality (0-100) of the AVIF derivatives; AVIF's scale is steeper, so it is lower.
+    IMAGE_CACHE_DIR = EnvVar(
+        "IMAGE_CACHE_DIR"
+    )  # Where derivatives are stored (defaults to an "images" folder in ASSETS_OUTPUT_DIR).
+
 
 class DevelopmentConfig(Config):
     """
@@ -99,6 +298,13 @@ class DevelopmentConfig(Config):
 
     DEBUG = True  # Enable debug mode
 
+    # A small pool is plenty for the development server.
+    DB_POOL_SIZE = EnvVar("DB_POOL_SIZE", 2, int)
+    DB_MAX_OVERFLOW = EnvVar("DB_MAX_OVERFLOW", 2, int)
+
+    # Show the request timings in the browser's network panel.
+    SERVER_TIMING_ENABLED = EnvVar("SERVER_TIMING_ENABLED", True, str_to_bool)
+
 
 class ProductionConfig(Config):
     """
@@ -111,6 +317,11 @@ class ProductionConfig(Config):
     # Disable debug mode in production for security reasons.
     DEBUG = False
 
+    # Hosted Postgres drops idle connections after a few minutes, so recycle
+    # them sooner, and stop runaway queries from holding a worker.
+    DB_POOL_RECYCLE = EnvVar("DB_POOL_RECYCLE", 300, int)
+    DB_STATEMENT_TIMEOUT = EnvVar("DB_STATEMENT_TIMEOUT", 15000, int)
+
 
 # You can add a function to choose the correct config based on an environment variable
 def get_config(config_name: str) -> type[Config]:
@@ -0,0 +1,31 @@
+"""
+Gunicorn settings for the portfolio application.
+
+Gunicorn loads this file automatically when it is started from this directory
+(see the Procfile). It prepares the shared directory that `prometheus_client`
+uses to aggregate metrics across the worker processes (see `backend/metrics.py`).
+"""
+
+import os
+import shutil
+import tempfile
+
+from prometheus_client import multiprocess
+
+# Must be set before the application (and prometheus_client's metric values) is imported.
+os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR",
+    os.path.join(tempfile.gettempdir(), "portfolio-prometheus"),
+)
+
+
+def on_starting(server):
+    """Starts every deployment with an empty metrics directory."""
+    directory = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory, exist_ok=True)
+
+
+def child_exit(server, worker):
+    """Drops the live gauges of a worker that exited, so they stop being summed."""
+    multiprocess.mark_process_dead(worker.pid)
@@ -1,35 +1,238 @@
 """
 This module configures and provides a logger instance for the application.
 
-It sets up basic logging to a file, specifying the log level, format, and date format.
-The logger instance can be imported and used in other modules to log messages.
+Logging is kept off the request path: every log call only puts the record on an
+in-memory queue (`QueueHandler`), and a background `QueueListener` thread does
+the formatting and the file and console I/O. A slow disk therefore never blocks
+a worker, and threads no longer contend for the file handler's lock.
+
+Records are written as JSON lines (via `python-json-logger`) to a log file that
+is rotated both at midnight and whenever it grows past `LOG_MAX_BYTES`. Request
+logs can be sampled with `LOG_REQUEST_SAMPLE_RATE` to keep busy sites quiet.
+
+Every gunicorn worker appends to the same log file, so rotation is coordinated
+between processes rather than left to each one: a rollover happens under an
+exclusive lock on `<LOG_FILE>.lock`, and a worker whose file has already been
+rotated by another one reopens the new file instead of rotating it again (as
+`WatchedFileHandler` does). Only one process therefore rotates each file, and
+no worker keeps writing to a renamed one. The lock needs `fcntl` (POSIX); on
+other platforms only a single process should write to the file.
 
-Logging is essential for tracking application behavior, debugging issues, and monitoring
-performance in production environments.
+`configure_logging()` starts the pipeline (it is called by `create_app()`, before
+the Flask configuration is loaded), reading these environment variables:
+
+    LOG_LEVEL                 Minimum level recorded (default INFO).
+    LOG_FORMAT                "json" (default) or "text".
+    LOG_FILE                  Log file path (default app.log).
+    LOG_MAX_BYTES             Size that triggers a rotation (default 10 MB).
+    LOG_BACKUP_COUNT          Rotated files kept (default 7).
+    LOG_REQUEST_SAMPLE_RATE   Fraction of request logs kept (default 1.0).
+
+The logger instance can be imported and used in other modules to log messages.
 """
 
+import atexit  # Flush queued records when the process exits
+import contextlib
 import logging  # Import the logging module for creating and managing log messages
+import logging.handlers  # Queue and rotating file handlers
+import os
+import queue
+import random
+import time
+
+from pythonjsonlogger import jsonlogger  # JSON log formatter
+
+try:
+    import fcntl
+except ImportError:  # Windows: no inter-process lock (see the module docstring)
+    fcntl = None
+
+
+@contextlib.contextmanager
+def _file_lock(path: str):
+    """Holds an exclusive lock on `path` (created if missing) shared by every process."""
+    if fcntl is None:
+        yield
+        return
+    with open(path, "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class SizedTimedRotatingFileHandler(logging.handlers.TimedRotatingFileHandler):
+    """
+    Rotates the log file on a schedule (`when`) and also whenever it reaches
+    `max_bytes`. Files rotated twice within one period get a numeric suffix
+    (app.log.2025-01-31, app.log.2025-01-31.1, ...) so neither is overwritten.
+
+    Several processes may share the file: rollovers are serialized with a lock
+    file, and a handler whose file was rotated by another process switches to
+    the new file instead of rotating again.
+    """
+
+    def __init__(self, filename, max_bytes: int = 0, **kwargs):
+        super().__init__(filename, **kwargs)
+        self.max_bytes = max_bytes
+        self.lock_filename = self.baseFilename + ".lock"
+        # (device, inode) of the file this handler last saw at `baseFilename`.
+        self._file_id = self._current_file_id()
+
+    def _current_file_id(self):
+        try:
+            stat = os.stat(self.baseFilename)
+        except FileNotFoundError:
+            return None
+        return stat.st_dev, stat.st_ino
+
+    def _open(self):
+        stream = super()._open()
+        stat = os.fstat(stream.fileno())
+        self._file_id = (stat.st_dev, stat.st_ino)
+        return stream
+
+    def _rotated_elsewhere(self) -> bool:
+        """Whether another process has replaced the file since this handler last saw it."""
+        return self._current_file_id() != self._file_id
+
+    def _switch_to_current_file(self):
+        """Reopens the file another process rotated to, whose period has just started."""
+        if self.stream is not None:
+            self.stream.close()
+        self.stream = self._open()
+        self.rolloverAt = self.computeRollover(int(time.time()))
+
+    def _size_exceeded(self) -> bool:
+        # Sizes come from the file itself, which every process appends to.
+        if self.stream is None:  # The file is opened lazily (delay=True)
+            self.stream = self._open()
+        return os.fstat(self.stream.fileno()).st_size >= self.max_bytes
+
+    def emit(self, record):
+        if self.stream is not None and self._rotated_elsewhere():
+            self._switch_to_current_file()
+        super().emit(record)
+
+    def shouldRollover(self, record) -> bool:
+        if super().shouldRollover(record):
+            return True
+        return self.max_bytes > 0 and self._size_exceeded()
 
-# Configure logging
-logging.basicConfig(
-    filename="app.log",  # Log file name: where log messages will be stored.  All logs for the application will be written to this file.
-    level=logging.INFO,  # Log level: INFO, WARNING, ERROR, CRITICAL (and DEBUG, if needed). Controls which messages are recorded.  Only messages with a level of INFO or higher will be logged.
-    format="%(asctime)s - %(levelname)s - %(module)s - %(funcName)s - %(message)s",
-    # Log format: Includes timestamp, level, message, module, and function name.
-    # Defines the structure of each log message, including the timestamp, log level, module name, function name, and the actual log message.
-    datefmt="%Y-%m-%d %H:%M:%S",
-    # Date format: Defines the format of the timestamp in the log messages.
-    # Specifies the format for the date and time in the log messages (Year-Month-Day Hour:Minute:Second).
-)
+    def doRollover(self):
+        with _file_lock(self.lock_filename):
+            # Another process may have rotated the file while this one waited
+            # for the lock; then only the new file's size can still be due.
+            if self._rotated_elsewhere():
+                self._switch_to_current_file()
+                if not (self.max_bytes > 0 and self._size_exceeded()):
+                    return
+            super().doRollover()
+            self._file_id = self._current_file_id()
+
+    def rotation_filename(self, default_name: str) -> str:
+        name, counter = default_name, 0
+        while os.path.exists(name):
+            counter += 1
+            name = f"{default_name}.{counter}"
+        return super().rotation_filename(name)
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a random `rate` fraction of records below WARNING; warnings and errors always pass."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return (
+            self.rate >= 1.0
+            or record.levelno >= logging.WARNING
+            or random.random() < self.rate
+        )
+
+
+def _build_formatter(log_format: str) -> logging.Formatter:
+    if log_format == "text":
+        return logging.Formatter(
+            "%(asctime)s - %(levelname)s - %(module)s - %(funcName)s - %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S",
+        )
+    # Any `extra={...}` fields passed to a log call become keys of the JSON object.
+    return jsonlogger.JsonFormatter(
+        "%(asctime)s %(levelname)s %(name)s %(module)s %(funcName)s %(message)s",
+        rename_fields={"asctime": "time", "levelname": "level"},
+    )
+
+
+def _build_listener(log_queue) -> logging.handlers.QueueListener:
+    """Creates the background listener that owns the actual (blocking) handlers."""
+    formatter = _build_formatter(os.environ.get("LOG_FORMAT", "json").lower())
+
+    file_handler = SizedTimedRotatingFileHandler(
+        os.environ.get("LOG_FILE", "app.log"),
+        max_bytes=int(os.environ.get("LOG_MAX_BYTES", 10 * 1024 * 1024)),
+        when="midnight",
+        backupCount=int(os.environ.get("LOG_BACKUP_COUNT", 7)),
+        encoding="utf-8",
+        delay=True,
+    )
+    file_handler.setFormatter(formatter)
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(formatter)
+
+    return logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+
+
+# Log calls only enqueue the record; an unbounded SimpleQueue never blocks the caller.
+queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+listener = None  # Started by configure_logging()
 
 # Create a logger instance for this module
 logger = logging.getLogger(
     __name__
 )  # Use this in other files to log messages.  Creates a logger specific to the current module, which is best practice.
 
+# Per-request access logs are the highest-volume records, so they get their own
+# child logger that can be sampled without losing anything else.
+request_logger = logger.getChild("requests")
+request_sampler = SamplingFilter(1.0)
+request_logger.addFilter(request_sampler)
+
+
+def _start_listener():
+    global listener
+    listener = _build_listener(queue_handler.queue)
+    listener.start()
+    atexit.register(listener.stop)
+
+
+def _restart_listener_after_fork():
+    """A forked child (e.g. a gunicorn worker with --preload) has no listener thread; start its own."""
+    if listener is not None:
+        queue_handler.queue = queue.SimpleQueue()
+        _start_listener()
+
+
+def configure_logging():
+    """
+    Starts the logging pipeline from the LOG_* environment variables.
+
+    Called by `create_app()` once the .env file has been loaded; calling it
+    again is a no-op.
+    """
+    if listener is not None:
+        return
+    _start_listener()
+    os.register_at_fork(after_in_child=_restart_listener_after_fork)
 
-console_handler = logging.StreamHandler()
-console_handler.setLevel(logging.INFO)
-formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-console_handler.setFormatter(formatter)
-logger.addHandler(console_handler)
+    # Every logger (the app's, Flask's, Werkzeug's, ...) propagates to the root logger.
+    root_logger = logging.getLogger()
+    root_logger.setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
+    root_logger.addHandler(queue_handler)
+    request_sampler.rate = float(os.environ.get("LOG_REQUEST_SAMPLE_RATE", 1.0))
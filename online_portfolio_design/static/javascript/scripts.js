@@ -38,8 +38,10 @@ window.addEventListener("pageshow", function (event) {
 });
 
 async function fetchProjectsData() {
-  const cacheKey = "projectDataCache";
-  const expiryKey = "projectDataCacheExpiry";
+  // Renamed when the cached object gained page_count, so entries stored by
+  // older versions of this script are never read back.
+  const cacheKey = "projectMetaCache";
+  const expiryKey = "projectMetaCacheExpiry";
   const expiryDuration = 10 * 60 * 1000; // 10 minutes
 
   // Check if data is in sessionStorage and not expired
@@ -47,23 +49,24 @@ async function fetchProjectsData() {
   const expiryTime = sessionStorage.getItem(expiryKey);
 
   if (cachedData && expiryTime && Date.now() < expiryTime) {
-    return JSON.parse(cachedData); // Use cached data
+    const parsedData = JSON.parse(cachedData);
+    if (parsedData && parsedData.page_count !== undefined) {
+      return parsedData; // Use cached data
+    }
+    // Otherwise the entry has an outdated shape: fetch it again
   }
 
   try {
-    // Fetch fresh data if it's missing or expired
-    const total_projects_data = await fetch("/projects/api/total_count").then(
-      (res) => res.json()
-    );
-
-    const last_row_data = await fetch("/projects/last_id").then((res) =>
-      res.json()
-    );
+    // Fetch fresh data if it's missing or expired: one request returns the
+    // count, the last ID and the page count together
+    const meta = await fetch("/projects/api/meta").then((res) => res.json());
 
     // Store the fetched data together in one object
     const fetchedData = {
-      total_projects: total_projects_data.total_projects,
-      last_row_id: last_row_data.id,
+      total_projects: meta.total_projects,
+      last_row_id: meta.last_id,
+      page_count: meta.page_count,
+      version: meta.version,
     };
 
     // Store in sessionStorage with an expiry time
@@ -640,15 +643,8 @@ async function isValidProjectPage(pageNumber) {
   }
 
   const projectData = await fetchProjectsData();
-  let total_projects = projectData.total_projects;
-  // let total projects to data length
-  let PROJECTS_PER_PAGE = 12;
-  // projects = 12
-
-  let maxPage =
-    (parseInt(total_projects, 10) + parseInt(PROJECTS_PER_PAGE, 10) - 1) /
-    parseInt(PROJECTS_PER_PAGE, 10);
-  // math to find max pages
+  let maxPage = projectData.page_count;
+  // the server works out the page count, with the same page size it paginates with
   if (pageNum > maxPage) return false;
   // if num is over the max, then give error
   return pageNum <= maxPage;
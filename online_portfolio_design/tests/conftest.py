@@ -0,0 +1,35 @@
+"""
+Shared fixtures for the test suite.
+
+Run from the `online_portfolio_design` directory with `python -m pytest`. Each
+test gets an application backed by its own SQLite database, with the page
+cache turned off so every request reaches its view.
+"""
+
+import pytest
+
+from app import create_app
+from backend.models import db
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """An application with an empty schema in a temporary database."""
+    monkeypatch.setenv("DATABASE_URI", f"sqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setenv("MAIL_SPOOL_PATH", str(tmp_path / "mail_spool.sqlite3"))
+    monkeypatch.setenv("LOG_FILE", str(tmp_path / "app.log"))
+    monkeypatch.setenv("SECRET_KEY", "test")
+    monkeypatch.setenv("PAGE_CACHE_ENABLED", "false")
+    app = create_app("default")
+    app.config["TESTING"] = True
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    """A test client for the application."""
+    return app.test_client()
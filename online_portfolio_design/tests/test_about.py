@@ -0,0 +1,41 @@
+"""Tests for the about page."""
+
+import pytest
+
+from backend.models import db
+from backend.models.about import TechnicalSkill, TechnicalSkillCategory
+from backend.models.query_counter import assert_max_queries
+
+# One lookup of the tables' content versions (for the ETag) and one SELECT
+# loading the categories together with their skills.
+ABOUT_QUERIES = 2
+
+
+def add_skills(categories: int, skills_per_category: int):
+    """Adds `categories` categories holding `skills_per_category` skills each."""
+    for i in range(categories):
+        category = TechnicalSkillCategory(name=f"Category {i}")
+        category.skills = [
+            TechnicalSkill(name=f"Skill {i}.{j}", level="Expert", progress=80)
+            for j in range(skills_per_category)
+        ]
+        db.session.add(category)
+    db.session.commit()
+
+
+@pytest.mark.parametrize(
+    "categories, skills_per_category", [(1, 1), (4, 3), (12, 8)]
+)
+def test_about_query_count_does_not_grow_with_skills(
+    client, categories, skills_per_category
+):
+    add_skills(categories, skills_per_category)
+
+    with assert_max_queries(ABOUT_QUERIES) as counter:
+        response = client.get("/about")
+
+    assert response.status_code == 200
+    assert counter.count == ABOUT_QUERIES
+    html = response.get_data(as_text=True)
+    assert f"Category {categories - 1}" in html
+    assert f"Skill {categories - 1}.{skills_per_category - 1}" in html